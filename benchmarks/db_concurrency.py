@@ -0,0 +1,89 @@
+"""
+Concurrency benchmark for utils/db.py.
+
+N threads each run a "login + history write" loop against a scratch database,
+once with the legacy connect-per-call access pattern (rollback journal) and once
+through the pooled WAL connections. Reports ops/s and "database is locked" errors.
+
+Usage: python benchmarks/db_concurrency.py [--threads 8] [--ops 200]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def legacy_login_and_write(path, username):
+    # Mirrors the original db.py: a fresh connection per call, default journal.
+    conn = sqlite3.connect(path, check_same_thread=False)
+    row = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+    conn.close()
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute('INSERT INTO history (user_id, calc_name, result, ts) VALUES (?, ?, ?, ?)',
+                 (row[0], "Bench", "1.0", int(time.time())))
+    conn.commit()
+    conn.close()
+
+def pooled_login_and_write(db, username):
+    with db.connection() as conn:
+        row = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+    db.add_history_item(row[0], "Bench", "1.0")
+
+def run(label, worker, threads, ops):
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def loop(idx):
+        barrier.wait()
+        for _ in range(ops):
+            try:
+                worker(f"bench{idx}")
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    pool = [threading.Thread(target=loop, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done = threads * ops - len(errors)
+    print(f"{label:<10} {done / elapsed:>10.0f} ops/s   {elapsed:6.2f}s   locked errors: {len(errors)}")
+    return done / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="appaty-bench-")
+    legacy_path = os.path.join(tmp, "legacy.db")
+    os.environ["APPATY_DB_PATH"] = os.path.join(tmp, "pooled.db")
+    os.environ.setdefault("APPATY_DB_POOL_SIZE", str(args.threads))
+    from utils import db, db_sqlite
+
+    db.init_db()
+    for i in range(args.threads):
+        db.add_user(f"bench{i}", "x")
+    src, dst = sqlite3.connect(db_sqlite.DB_PATH), sqlite3.connect(legacy_path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+    # The backup inherits WAL mode; put the legacy copy back on the default journal.
+    sqlite3.connect(legacy_path).execute("PRAGMA journal_mode=DELETE").close()
+
+    print(f"{args.threads} threads x {args.ops} login+write ops")
+    base = run("legacy", lambda u: legacy_login_and_write(legacy_path, u), args.threads, args.ops)
+    pooled = run("pooled", lambda u: pooled_login_and_write(db, u), args.threads, args.ops)
+    print(f"speedup: {pooled / base:.1f}x")
+    db.close_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Storage backend conformance checks and load benchmark for utils/db.py.
+
+Runs the same checks and the same mixed workload (login lookup that misses the
+user cache, history write, history page read) against SQLite and, if available,
+Postgres, for each pool size given, so the Postgres pool can be sized.
+
+Usage:
+  python benchmarks/db_load.py                              # SQLite only
+  python benchmarks/db_load.py --pg-url postgresql://...    # plus an existing Postgres
+  python benchmarks/db_load.py --start-postgres             # plus a throwaway local Postgres
+                                                            # (initdb/pg_ctl on PATH, run as non-root)
+Options: --threads 16 --seconds 5 --pool-sizes 2,5,10
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db, migrations
+
+def start_postgres():
+    """initdb + pg_ctl into a temp dir, listening on a unix socket only."""
+    tmp = tempfile.mkdtemp(prefix="appaty-pg-")
+    data = os.path.join(tmp, "data")
+    subprocess.run(["initdb", "-D", data, "-U", "postgres", "--auth=trust"], check=True, capture_output=True)
+    subprocess.run(["pg_ctl", "-D", data, "-l", os.path.join(tmp, "pg.log"), "-w",
+                    "-o", f"-k {tmp} -c listen_addresses='' -c max_connections=200", "start"],
+                   check=True, capture_output=True)
+
+    def stop():
+        subprocess.run(["pg_ctl", "-D", data, "-m", "fast", "-w", "stop"], capture_output=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return f"postgresql://postgres@/postgres?host={tmp}", stop
+
+# --- Conformance ---
+
+def check(label, cond):
+    print(f"  {'PASS' if cond else 'FAIL'}  {label}")
+    return bool(cond)
+
+def conformance(url):
+    db.configure(url)
+    db.init_db()
+    db.init_db()
+    run = uuid.uuid4().hex[:8]
+    ok = True
+
+    with db.connection() as conn:
+        ok &= check("schema at latest version", migrations.current_version(conn) == migrations.MIGRATIONS[-1][0])
+
+    name = f"Conf_{run}"
+    ok &= check("add_user", db.add_user(name, "hash")[0])
+    ok &= check("duplicate username rejected", not db.add_user(name.lower(), "hash")[0])
+    user = db.get_user(name.upper())
+    ok &= check("get_user is case-insensitive and returns a dict", user and user["username"] == name.lower())
+    ok &= check("unknown user is None", db.get_user(f"missing_{run}") is None)
+
+    uid = user["id"]
+    ok &= check("toggle_premium on", db.toggle_premium(uid) and db.get_user_by_id(uid)["is_premium"] == 1)
+    ok &= check("toggle_premium off", not db.toggle_premium(uid) and db.get_user_by_id(uid)["is_premium"] == 0)
+
+    db.add_history_item(uid, "Solve", "x=2", kind="linear_1var", inputs={"a": "1", "b": "-2"}, solution=[2])
+    page, _ = db.get_history_page(uid, limit=1)
+    item = db.get_history_item(uid, page[0]["id"])
+    ok &= check("payload round-trips", item["inputs"] == {"a": "1", "b": "-2"} and item["solution"] == [2])
+
+    base = int(time.time()) - 1000
+    db.add_history_items([(uid, f"Len {i % 3}", f"{i} m", base + i // 2, "length", float(i), "m", None)
+                          for i in range(95)])
+    seen, cursor = [], None
+    while True:
+        rows, cursor = db.get_history_page(uid, limit=10, cursor=cursor, calc_name="Len")
+        seen += rows
+        if cursor is None:
+            break
+    keys = [(r["ts"], r["id"]) for r in seen]
+    ok &= check("keyset pages cover every row once, newest first",
+                len(seen) == 95 and keys == sorted(keys, reverse=True) and len(set(keys)) == 95)
+    rows, _ = db.get_history_page(uid, limit=100, calc_name="Len 1", since=base + 10, until=base + 20)
+    ok &= check("prefix + date range filter",
+                rows and all(r["calc_name"] == "Len 1" and base + 10 <= r["ts"] < base + 20 for r in rows))
+    stats = {(s["kind"], s["unit"]): s for s in db.get_result_stats(uid)}
+    ok &= check("AVG in SQL", abs(stats[("length", "m")]["avg"] - 47.0) < 1e-9)
+    return ok
+
+# --- Load ---
+
+def percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * pct / 100))]
+
+def load(url, pool_size, threads, seconds):
+    db.configure(url, pool_size=pool_size)
+    db.init_db()
+    run = uuid.uuid4().hex[:8]
+    users = []
+    for i in range(threads):
+        db.add_user(f"load_{run}_{i}", "hash")
+        users.append(db.get_user(f"load_{run}_{i}"))
+
+    latencies = [[] for _ in range(threads)]
+    errors = []
+    stop = threading.Event()
+
+    def worker(idx):
+        user = users[idx]
+        lat = latencies[idx]
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                db.invalidate_user(user["id"])  # force the login lookup to hit the database
+                db.get_user(user["username"])
+                db.add_history_item(user["id"], "Load", "1.0", kind="load", value=1.0, unit="u")
+                db.get_history_page(user["id"], limit=25)
+            except Exception as e:
+                errors.append(type(e).__name__)
+                continue
+            lat.append((time.perf_counter() - start) * 1000)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in pool:
+        t.join()
+
+    all_lat = sorted(v for lat in latencies for v in lat)
+    stats = db.pool_stats()
+    print(f"  {db.backend_name():<8} pool={pool_size:<3} {len(all_lat) / seconds:>8.0f} journeys/s   "
+          f"p50 {percentile(all_lat, 50):6.2f}ms  p95 {percentile(all_lat, 95):6.2f}ms  "
+          f"p99 {percentile(all_lat, 99):6.2f}ms   pool waits {stats['waits']:<6} errors {len(errors)}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pg-url")
+    parser.add_argument("--start-postgres", action="store_true")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--pool-sizes", default="2,5,10")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="appaty-bench-")
+    targets = [f"sqlite:///{os.path.join(tmp, 'bench.db')}"]
+    stop_pg = None
+    if args.start_postgres:
+        pg_url, stop_pg = start_postgres()
+        targets.append(pg_url)
+    elif args.pg_url:
+        targets.append(args.pg_url)
+
+    ok = True
+    try:
+        for url in targets:
+            print(f"Conformance: {url.split(':')[0]}")
+            ok &= conformance(url)
+        print(f"\nLoad: {args.threads} threads x {args.seconds}s (login miss + history write + page read)")
+        for url in targets:
+            for size in [int(s) for s in args.pool_sizes.split(",")]:
+                load(url, size, args.threads, args.seconds)
+    finally:
+        db.close_pool()
+        if stop_pg:
+            stop_pg()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Peak memory of history exports as the history grows.
+
+Fills a throwaway SQLite database with one user's history, then measures with
+tracemalloc the peak Python allocation of:
+  streaming   reporting.export_report(reporting.iter_db_history(...))  (chunked DB reads,
+              rows written one at a time to a spooled temp file;
+              the peak includes the finished report, returned as bytes)
+  in-memory   the old path: load every row into a list, then generate_csv_report /
+              a "+=" TXT report (skipped above --legacy-max rows)
+
+The streaming peak should stay well below the in-memory one: it grows only by the
+size of the report itself, not by the rows' Python objects.
+
+Usage:
+  python benchmarks/export_memory.py                       # 10k, 100k, 1M rows
+  python benchmarks/export_memory.py --sizes 10000,200000 --legacy-max 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db, reporting
+
+def fill(user_id, target, have):
+    base = int(time.time()) - target
+    batch = []
+    for i in range(have, target):
+        batch.append((user_id, f"Length Conversion {i % 7}", f"{i * 0.3048:.4f} m", base + i,
+                      "length", i * 0.3048, "m", None))
+        if len(batch) == 50_000:
+            db.add_history_items(batch)
+            batch = []
+    if batch:
+        db.add_history_items(batch)
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+def streaming(user_id, fmt):
+    def run():
+        reporting.export_report(reporting.iter_db_history(user_id), fmt)
+    return run
+
+def legacy(user_id, fmt):
+    def run():
+        history = list(reporting.iter_db_history(user_id))
+        if fmt == "csv":
+            import pandas as pd
+            pd.DataFrame(history).to_csv(index=False)
+        else:
+            report = "APPATY Session Report\n=====================\n\n"
+            for item in history:
+                report += f"[{item['timestamp']}] {item['calculation']} = {item['result']}\n"
+    return run
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--legacy-max", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="appaty-bench-")
+    db.configure(f"sqlite:///{os.path.join(tmp, 'export.db')}")
+    db.init_db()
+    db.add_user("export_bench", "hash")
+    user_id = db.get_user("export_bench")["id"]
+
+    print(f"{'rows':>10}  {'format':<6} {'streaming peak':>15} {'time':>8}   {'in-memory peak':>15} {'time':>8}")
+    have = 0
+    for size in [int(s) for s in args.sizes.split(",")]:
+        fill(user_id, size, have)
+        have = size
+        for fmt in ("csv", "txt"):
+            s_peak, s_time = measure(streaming(user_id, fmt))
+            line = f"{size:>10,}  {fmt:<6} {s_peak:>12.1f} MB {s_time:>7.2f}s"
+            if size <= args.legacy_max:
+                l_peak, l_time = measure(legacy(user_id, fmt))
+                line += f"   {l_peak:>12.1f} MB {l_time:>7.2f}s"
+            print(line)
+    db.close_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Login throughput for each password KDF setting (utils/passwords.py).
+
+For every setting, hashes one password and then verifies it from --clients
+concurrent threads for --seconds, through the bounded hashing pool, reporting
+logins/s, per-login latency and how many attempts were refused as Busy.
+
+Usage: python benchmarks/kdf_bench.py [--clients 16] [--workers 2] [--seconds 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import passwords
+
+SETTINGS = [
+    ("pbkdf2", {"pbkdf2_iterations": 100_000}),
+    ("pbkdf2", {"pbkdf2_iterations": 310_000}),
+    ("pbkdf2", {"pbkdf2_iterations": 600_000}),
+    ("scrypt", {"scrypt_n": 2 ** 14}),
+    ("scrypt", {"scrypt_n": 2 ** 15}),
+    ("scrypt", {"scrypt_n": 2 ** 16}),
+]
+
+def bench(kdf, params, clients, workers, seconds):
+    passwords.configure(kdf=kdf, workers=workers, **params)
+    stored = passwords.hash_password("correct horse")
+    done, busy = [], [0]
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def client():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                ok, _ = passwords.verify_password("correct horse", stored)
+            except passwords.Busy:
+                with lock:
+                    busy[0] += 1
+                time.sleep(0.005)
+                continue
+            assert ok
+            with lock:
+                done.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    done.sort()
+    p50 = done[len(done) // 2] * 1000 if done else 0.0
+    p95 = done[int(len(done) * 0.95)] * 1000 if done else 0.0
+    label = f"{kdf} " + ", ".join(f"{k}={v}" for k, v in params.items())
+    print(f"{label:<34} {len(done) / seconds:>8.1f} logins/s   p50 {p50:7.1f}ms  p95 {p95:7.1f}ms   busy {busy[0]}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=passwords.WORKERS)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    print(f"{args.clients} clients, {args.workers} hashing workers, {args.seconds}s per setting")
+    for kdf, params in SETTINGS:
+        bench(kdf, params, args.clients, args.workers, args.seconds)
+
+if __name__ == "__main__":
+    main()
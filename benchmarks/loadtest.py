@@ -0,0 +1,390 @@
+"""
+Concurrent-session load test of the app, driving app.py through streamlit.testing
+(AppTest) the way the server does: one script thread per session, all in one process.
+
+Each simulated user signs up and logs in once, then repeats scripted journeys until
+the level's time is up:
+  conversions  Dimensions: save a length conversion; Power: save a kW/HP conversion
+  quadratic    Equation Solver: solve ax^2 + bx + c = 0 with random coefficients
+  universal    Universal Solver (text mode): submit a 2x2 system, poll until solved
+  history      open the History page
+
+Concurrency is ramped over --levels, each level in a fresh process (so memory numbers
+are per level) against one shared database. For every level it reports journeys/s,
+reruns/s, rerun latency percentiles, per-journey p50/p95, errors (page exceptions and
+harness failures), DB lock errors ("database is locked", deadlocks, lock timeouts,
+also counted when the history writer fails a flush), Busy refusals, and memory per
+session (RSS growth over the level after a warm-up, divided by the sessions; and the
+RSS slope across levels, which is less noisy).
+
+--save-baseline writes the results to --baseline (JSON); a later run compares against
+it and exits 1 when a level regressed by more than --tolerance (p95 latency, journeys/s,
+RSS) or has more lock errors than the baseline. Timings depend on the machine: save
+the baseline on the machine (or CI runner class) that runs the comparison.
+
+  python benchmarks/loadtest.py --levels 1,2,4,8 --seconds 30
+  python benchmarks/loadtest.py --save-baseline
+  APPATY_DB_URL=postgresql://... python benchmarks/loadtest.py --levels 8,16
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "loadtest_baseline.json")
+NAV_LABEL = "🛠️ Select Module"
+DEFAULT_MIX = "conversions=4,quadratic=2,universal=1,history=2"
+LOCK_MARKERS = ("database is locked", "database table is locked", "deadlock detected", "lock timeout",
+                "could not obtain lock")
+PASSWORD = "load-test-password"
+
+def rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, where /proc is missing
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+# --- Simulated User ---
+
+class Session:
+    def __init__(self, name, stats):
+        from streamlit.testing.v1 import AppTest
+
+        self.name, self.stats = name, stats
+        self.rng = random.Random(name)
+        self.at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+
+    def run(self, element=None):
+        """One rerun (optionally triggered by a widget), timed and checked for page exceptions."""
+        start = time.perf_counter()
+        (element or self.at).run()
+        self.stats.rerun((time.perf_counter() - start) * 1000)
+        for exc in self.at.exception:
+            self.stats.error(exc.message)
+
+    def nav(self, page):
+        nav = next(s for s in self.at.selectbox if s.label == NAV_LABEL)
+        if nav.value != page:
+            self.run(nav.set_value(page))
+
+    def login(self):
+        self.run()
+        auth = self.at.sidebar.selectbox[0]
+        self.run(auth.set_value("Sign Up"))
+        fields = self.at.sidebar.text_input
+        fields[0].input(self.name)
+        fields[1].input(PASSWORD)
+        fields[2].input(PASSWORD)
+        self.run(self.at.sidebar.button[0].click())
+        self.run(self.at.sidebar.selectbox[0].set_value("Login"))
+        self.at.sidebar.text_input[0].input(self.name)
+        self.at.sidebar.text_input[1].input(PASSWORD)
+        self.run(self.at.sidebar.button[0].click())
+        if not self.at.session_state.user:
+            raise RuntimeError("login failed")
+
+    def _save_conversion(self, key, quantity):
+        from utils import calculators as calc
+
+        from_unit, to_unit = self.rng.sample(list(calc.CONVERSIONS[quantity]), 2)
+        value = round(self.rng.uniform(1, 1000), 2)
+        # What the converter component sends on Save (see utils/converter.py).
+        self.at.session_state[key] = {"value": value, "from": from_unit, "to": to_unit, "result": None,
+                                      "save": f"{self.name}-{time.perf_counter()}"}
+        self.run()
+
+    def conversions(self):
+        self.nav("📐 Dimensions")
+        self._save_conversion("length_conv", "length")
+        self.nav("⚡ Power")
+        self._save_conversion("power_conv", "power")
+
+    def quadratic(self):
+        self.nav("🧮 Equation Solver")
+        kind = next(s for s in self.at.selectbox if s.label == "Equation Type")
+        if kind.value != "2nd Degree (1 Variable)":
+            self.run(kind.set_value("2nd Degree (1 Variable)"))
+        for label in ("a", "b", "c"):
+            value = self.rng.randint(1 if label == "a" else -20, 20)
+            next(t for t in self.at.text_input if t.label == label).input(str(value))
+        self.run(self.at.button(key="solve_quad").click())
+
+    def universal(self):
+        self.nav("🌌 Universal Solver")
+        mode = self.at.radio(key="univ_mode")
+        if mode.value != "Text":
+            self.run(mode.set_value("Text"))
+        a, b = self.rng.randint(1, 30), self.rng.randint(1, 30)
+        self.at.text_area(key="univ_text").set_value(f"x*y = {a * b}\nx + y = {a + b}")
+        self.run(next(b for b in self.at.button if b.label == "Calculate System").click())
+        if any("busy" in w.value.lower() or "running already" in w.value for w in self.at.warning):
+            self.stats.count("busy")
+            return
+        # The page polls the job; the solve query parameter is cleared once the result is shown.
+        deadline = time.monotonic() + 120
+        while "solve" in self.at.query_params and time.monotonic() < deadline:
+            time.sleep(0.2)
+            self.run()
+        if "solve" in self.at.query_params:
+            self.stats.error("universal solve did not finish in 120s")
+
+    def history(self):
+        self.nav("🗂️ History")
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reruns, self.journeys = [], {}
+        self.counts = Counter()
+        self.messages = Counter()
+        self.recording = False
+
+    def rerun(self, ms):
+        if self.recording:
+            with self.lock:
+                self.reruns.append(ms)
+
+    def journey(self, name, ms):
+        if self.recording:
+            with self.lock:
+                self.journeys.setdefault(name, []).append(ms)
+
+    def count(self, key, n=1):
+        if self.recording:
+            with self.lock:
+                self.counts[key] += n
+
+    def error(self, message):
+        message = str(message)
+        locked = any(marker in message.lower() for marker in LOCK_MARKERS)
+        self.count("lock_errors" if locked else "errors")
+        if self.recording:
+            with self.lock:
+                self.messages[message.splitlines()[0][:160] if message else "?"] += 1
+
+# --- One Level (child process) ---
+
+def _kept_runtime():
+    from streamlit.runtime import Runtime
+
+    class Slot(type):
+        # Setting None (AppTest's cleanup) is ignored; the latest runtime stays installed.
+        _instance = property(lambda cls: Runtime._instance,
+                             lambda cls, value: value is not None and setattr(Runtime, "_instance", value))
+
+    return Slot("Runtime", (Runtime,), {})
+
+
+def run_level(sessions, seconds, mix, level_id):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit import config
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    # AppTest compiles the script on every run; the server caches the bytecode per process.
+    shared_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared_cache
+    # AppTest is written for one app at a time: each run installs a mock Runtime and sets
+    # global.appTest, and clears both when done, pulling them from under the other
+    # sessions. Keep the option on for the process and never clear the runtime.
+    config.set_option("global.appTest", True)
+    app_test.Runtime = _kept_runtime()
+
+    from utils import history_writer
+
+    stats = Stats()
+    names, weights = zip(*mix.items())
+
+    # Warm-up (not recorded): imports, migrations, first solves.
+    warm = Session(f"warm{level_id}_{os.getpid()}", stats)
+    warm.login()
+    for name in names:
+        getattr(warm, name)()
+    del warm
+    gc.collect()
+    rss_start = rss_mb()
+    failures_start = history_writer.stats()["failures"]
+
+    stats.recording = True
+    deadline = time.monotonic() + seconds
+    live = []
+
+    def login(name):
+        session = Session(name, stats)
+        start = time.perf_counter()
+        session.login()
+        stats.journey("login", (time.perf_counter() - start) * 1000)
+        return session
+
+    def user(n):
+        try:
+            session = login(f"u{level_id}_{os.getpid()}_{n}")
+        except Exception as e:
+            stats.error(f"login: {type(e).__name__}: {e}")
+            return
+        live.append(session)
+        while time.monotonic() < deadline:
+            name = session.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                getattr(session, name)()
+            except Exception as e:
+                stats.error(f"{name}: {type(e).__name__}: {e}")
+                # The page is in an unknown state; continue as a new user in a new session.
+                try:
+                    index = live.index(session)
+                    session = live[index] = login(f"{session.name}r")
+                except Exception as e:
+                    stats.error(f"login: {type(e).__name__}: {e}")
+                    return
+                continue
+            stats.journey(name, (time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=user, args=(n,), name=f"user-{n}") for n in range(sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    history_writer.flush()
+    rss_end = rss_mb()
+    stats.recording = False
+    stats.counts["lock_errors"] += history_writer.stats()["failures"] - failures_start
+
+    done = sum(len(v) for k, v in stats.journeys.items() if k != "login")
+    return {
+        "sessions": sessions,
+        "seconds": round(elapsed, 2),
+        "journeys": done,
+        "journeys_per_s": round(done / elapsed, 2),
+        "reruns_per_s": round(len(stats.reruns) / elapsed, 2),
+        "latency_ms": {"p50": round(percentile(stats.reruns, 0.50), 1), "p95": round(percentile(stats.reruns, 0.95), 1),
+                       "p99": round(percentile(stats.reruns, 0.99), 1), "max": round(max(stats.reruns, default=0), 1)},
+        "journey_ms": {name: {"count": len(v), "p50": round(statistics.median(v), 1), "p95": round(percentile(v, 0.95), 1)}
+                       for name, v in sorted(stats.journeys.items())},
+        "errors": stats.counts["errors"],
+        "lock_errors": stats.counts["lock_errors"],
+        "busy": stats.counts["busy"],
+        "rss_mb": round(rss_end, 1),
+        "rss_per_session_mb": round(max(0.0, rss_end - rss_start) / max(1, len(live)), 2),
+        "top_errors": stats.messages.most_common(5),
+    }
+
+def measure(sessions, seconds, mix, level_id, env):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(sessions), str(seconds),
+                          json.dumps(mix), str(level_id)], capture_output=True, text=True, env=env)
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{sessions} sessions: {out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+# --- Report and Baseline ---
+
+def report(results):
+    print(f"\n{'sessions':>8} {'journeys/s':>11} {'reruns/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'errors':>7} {'locks':>6} {'busy':>5} {'MB/session':>11}")
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['sessions']:>8} {r['journeys_per_s']:>11.2f} {r['reruns_per_s']:>9.1f} {lat['p50']:>6.0f}ms "
+              f"{lat['p95']:>6.0f}ms {lat['p99']:>6.0f}ms {r['errors']:>7} {r['lock_errors']:>6} {r['busy']:>5} "
+              f"{r['rss_per_session_mb']:>11.2f}")
+    if len(results) > 1 and results[-1]["sessions"] > results[0]["sessions"]:
+        first, last = results[0], results[-1]
+        slope = (last["rss_mb"] - first["rss_mb"]) / (last["sessions"] - first["sessions"])
+        print(f"\nMemory: {slope:.2f} MB per additional session (RSS {first['rss_mb']:.0f} MB at {first['sessions']}, "
+              f"{last['rss_mb']:.0f} MB at {last['sessions']})")
+    for r in results:
+        journeys = ", ".join(f"{k} {v['p50']:.0f}/{v['p95']:.0f}ms" for k, v in r["journey_ms"].items())
+        print(f"  {r['sessions']} sessions, journey p50/p95: {journeys}")
+        for message, n in r["top_errors"]:
+            print(f"    {n} x {message}")
+
+def compare(results, baseline, tolerance):
+    """Regressions against a baseline, as lines of text (empty when none)."""
+    by_sessions = {r["sessions"]: r for r in baseline["levels"]}
+    problems = []
+    for r in results:
+        base = by_sessions.get(r["sessions"])
+        if base is None:
+            continue
+        label = f"{r['sessions']} sessions:"
+        if r["latency_ms"]["p95"] > base["latency_ms"]["p95"] * (1 + tolerance):
+            problems.append(f"{label} p95 {r['latency_ms']['p95']:.0f}ms vs baseline {base['latency_ms']['p95']:.0f}ms")
+        if r["journeys_per_s"] < base["journeys_per_s"] * (1 - tolerance):
+            problems.append(f"{label} {r['journeys_per_s']:.2f} journeys/s vs baseline {base['journeys_per_s']:.2f}")
+        if r["rss_mb"] > base["rss_mb"] * (1 + tolerance):
+            problems.append(f"{label} RSS {r['rss_mb']:.0f} MB vs baseline {base['rss_mb']:.0f} MB")
+        if r["lock_errors"] > base["lock_errors"]:
+            problems.append(f"{label} {r['lock_errors']} lock errors vs baseline {base['lock_errors']}")
+    return problems
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        result = run_level(int(sys.argv[2]), float(sys.argv[3]), json.loads(sys.argv[4]), sys.argv[5])
+        print(json.dumps(result))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--levels", default="1,2,4,8", help="concurrent sessions per level")
+    parser.add_argument("--seconds", type=float, default=30, help="duration of each level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="journey weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression vs the baseline")
+    args = parser.parse_args()
+    mix = {name: float(weight) for name, weight in (part.split("=") for part in args.mix.split(","))}
+
+    env = dict(os.environ)
+    if not env.get("APPATY_DB_URL"):
+        env["APPATY_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="appaty-load-"), "load.db")
+    backend = "postgres" if env.get("APPATY_DB_URL", "").startswith("postgres") else "sqlite"
+    print(f"{backend}, {args.seconds:.0f}s per level, mix {args.mix}")
+
+    results = []
+    for level_id, sessions in enumerate(int(n) for n in args.levels.split(",")):
+        results.append(measure(sessions, args.seconds, mix, level_id, env))
+        print(f"  {sessions} sessions done: {results[-1]['journeys_per_s']:.2f} journeys/s")
+    report(results)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d"), "backend": backend, "seconds": args.seconds,
+                       "mix": args.mix, "python": platform.python_version(), "cpus": os.cpu_count(),
+                       "levels": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved to {os.path.relpath(args.baseline)}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance)
+        print(f"\nAgainst baseline {os.path.relpath(args.baseline)} ({baseline['created']}, {baseline['backend']}, "
+              f"{baseline['cpus']} CPUs): " + ("no regressions" if not problems else "REGRESSIONS"))
+        for line in problems:
+            print(f"  {line}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
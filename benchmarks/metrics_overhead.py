@@ -0,0 +1,62 @@
+"""
+Cost of the hot-path instrumentation (utils/metrics.py) per call, with metrics off
+(the default) and on.
+
+A trivial function is called --calls times bare, through @metrics.timed, inside
+`with metrics.timer(...)` and via metrics.cache_lookup; the bare loop is subtracted,
+so the figures are the added nanoseconds per call. Each mode runs in a fresh
+interpreter, since ENABLED is read from the environment at import.
+
+Usage: python benchmarks/metrics_overhead.py [--calls 1000000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from utils import metrics
+
+calls = int(sys.argv[2])
+
+def work(x):
+    return x
+
+timed = metrics.timed("bench_seconds", fn="work")(work)
+
+def with_timer(x):
+    with metrics.timer("bench_seconds", fn="block"):
+        return x
+
+def with_lookup(x):
+    metrics.cache_lookup("bench", True)
+    return x
+
+def loop(fn):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return time.perf_counter() - start
+
+bare = min(loop(work) for _ in range(3))
+for name, fn in (("@timed", timed), ("timer()", with_timer), ("cache_lookup", with_lookup)):
+    cost = min(loop(fn) for _ in range(3))
+    print(f"  {name:<13} {(cost - bare) / calls * 1e9:>8.0f} ns/call")
+"""
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+    for label, env in (("metrics off", {"APPATY_METRICS": "0", "APPATY_METRICS_PORT": "0"}),
+                       ("metrics on", {"APPATY_METRICS": "1", "APPATY_METRICS_PORT": "0"})):
+        print(label)
+        subprocess.run([sys.executable, "-c", CHILD, ROOT, str(args.calls)],
+                       env=dict(os.environ, **env), check=True)
+
+if __name__ == "__main__":
+    main()
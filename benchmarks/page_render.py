@@ -0,0 +1,113 @@
+"""
+Per-page rerun latency of the Streamlit app, measured with streamlit.testing (AppTest).
+
+For every page, in a fresh process:
+  cold     first script run that opens the page (process start excluded; includes imports
+           and compiling app.py)
+  warm     median / p95 of --reruns further reruns of the same page (bytecode cached, as
+           on a real server)
+  modules  whether sympy / pandas were imported by the time the page was shown
+
+--rev runs the same measurements against another git revision of the app (checked out
+into a temp dir with `git archive`), e.g. the commit before the views/ split:
+
+  python benchmarks/page_render.py
+  python benchmarks/page_render.py --rev HEAD~1 --pages "📐 Dimensions,⚡ Power"
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAV_LABEL = "🛠️ Select Module"
+DEFAULT_PAGES = ["📐 Dimensions", "⚡ Power", "🌡️ Temperature", "🎈 Pressure", "💡 Electricity",
+                 "💰 Energy Cost", "🔥 Thermodynamics", "🧮 Equation Solver", "🌌 Universal Solver", "🗂️ History"]
+
+def child(app_dir, page, reruns):
+    """Runs in a subprocess: measure one page of the app in app_dir and print JSON."""
+    os.chdir(app_dir)
+    sys.path.insert(0, app_dir)
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    # AppTest compiles the script afresh on every run; the real server caches the bytecode
+    # per process. Share one cache so reruns measure what a server does.
+    shared_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared_cache
+
+    at = AppTest.from_file(os.path.join(app_dir, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    nav = next(s for s in at.selectbox if s.label == NAV_LABEL)
+    if nav.value != page:
+        nav.set_value(page).run()
+    cold = (time.perf_counter() - start) * 1000
+    modules = {name: name in sys.modules for name in ("sympy", "pandas")}
+
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    print(json.dumps({"cold": cold, "warm": warm, "modules": modules, "error": bool(at.exception)}))
+
+def measure(app_dir, page, reruns):
+    env = dict(os.environ, APPATY_DB_PATH=os.path.join(tempfile.mkdtemp(prefix="appaty-bench-"), "bench.db"))
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app_dir, page, str(reruns)],
+                         capture_output=True, text=True, env=env)
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{page}: {out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def checkout(rev):
+    tmp = tempfile.mkdtemp(prefix="appaty-rev-")
+    archive = subprocess.run(["git", "-C", ROOT, "archive", rev], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", tmp], input=archive, check=True)
+    return tmp
+
+def report(title, app_dir, pages, reruns):
+    print(f"\n{title}")
+    print(f"  {'page':<22} {'cold':>9} {'warm p50':>10} {'warm p95':>10}   sympy  pandas")
+    results = {}
+    for page in pages:
+        r = measure(app_dir, page, reruns)
+        warm = sorted(r["warm"])
+        p95 = warm[min(len(warm) - 1, int(len(warm) * 0.95))]
+        results[page] = statistics.median(warm)
+        flag = "  (exception)" if r["error"] else ""
+        print(f"  {page:<22} {r['cold']:>7.0f}ms {results[page]:>8.1f}ms {p95:>8.1f}ms   "
+              f"{'yes' if r['modules']['sympy'] else 'no':<6} {'yes' if r['modules']['pandas'] else 'no'}{flag}")
+    return results
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rev", help="also measure this git revision, e.g. HEAD~1")
+    parser.add_argument("--pages", default=",".join(DEFAULT_PAGES))
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    pages = args.pages.split(",")
+
+    current = report("Working tree", ROOT, pages, args.reruns)
+    if args.rev:
+        tmp = checkout(args.rev)
+        try:
+            before = report(f"Revision {args.rev}", tmp, pages, args.reruns)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print("\nWarm rerun p50, working tree vs revision")
+        for page in pages:
+            print(f"  {page:<22} {current[page]:>8.1f}ms vs {before[page]:>8.1f}ms  ({current[page] / before[page] - 1:+.0%})")
+
+if __name__ == "__main__":
+    main()
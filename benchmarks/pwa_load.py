@@ -0,0 +1,149 @@
+"""
+First-paint and repeat-load times of the app in headless Chromium under a throttled
+network/CPU profile, for the working tree and (optionally) another git revision.
+
+For each target a server is started on a free port, then --runs times:
+  cold    fresh browser profile: first-contentful-paint, and "ready" (sidebar rendered)
+  repeat  reload in the same profile (HTTP cache warm; service worker installed if the
+          target registers one)
+Median values are printed. Third-party requests (fonts, icons) are included, so the
+profile's latency applies to them as well.
+
+The working tree is served with `uvicorn server:app` (service worker enabled); a --rev
+without server.py is served with `streamlit run app.py`.
+
+  pip install playwright && playwright install chromium
+  python benchmarks/pwa_load.py --rev HEAD~1
+  python benchmarks/pwa_load.py --profile fast3g --runs 3
+  python benchmarks/pwa_load.py --executable /path/to/chrome   # an existing Chrome/Chromium build
+"""
+import argparse
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Chrome DevTools presets: (latency ms, download kbit/s, upload kbit/s, CPU slowdown)
+PROFILES = {
+    "slow4g": (150, 1600, 750, 4),
+    "fast3g": (560, 1440, 675, 4),
+    "none": (0, 0, 0, 1),
+}
+READY_SELECTOR = '[data-testid="stSidebar"] h1'
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(app_dir):
+    port = free_port()
+    env = dict(os.environ, APPATY_DB_PATH=os.path.join(tempfile.mkdtemp(prefix="appaty-pwa-"), "bench.db"))
+    if os.path.exists(os.path.join(app_dir, "server.py")):
+        cmd = [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+               "--server.port", str(port), "--browser.gatherUsageStats", "false"]
+    proc = subprocess.Popen(cmd, cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/"
+    for _ in range(120):
+        try:
+            urllib.request.urlopen(url + "_stcore/health", timeout=1)
+            return proc, url
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError(f"server in {app_dir} did not start")
+
+def checkout(rev):
+    tmp = tempfile.mkdtemp(prefix="appaty-rev-")
+    archive = subprocess.run(["git", "-C", ROOT, "archive", rev], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", tmp], input=archive, check=True)
+    return tmp
+
+def load(page, url):
+    """Navigate and return (first-contentful-paint ms, ready ms)."""
+    start = time.perf_counter()
+    page.goto(url, wait_until="commit")
+    page.wait_for_selector(READY_SELECTOR, timeout=120000)
+    ready = (time.perf_counter() - start) * 1000
+    fcp = page.evaluate(
+        "() => (performance.getEntriesByName('first-contentful-paint')[0] || {startTime: NaN}).startTime")
+    return fcp, ready
+
+def throttle(page, profile):
+    latency, down, up, cpu = PROFILES[profile]
+    cdp = page.context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    if latency or down:
+        cdp.send("Network.emulateNetworkConditions", {
+            "offline": False, "latency": latency,
+            "downloadThroughput": down * 1000 / 8, "uploadThroughput": up * 1000 / 8,
+        })
+    cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu})
+
+def measure(url, profile, runs, executable=None):
+    from playwright.sync_api import sync_playwright
+
+    cold, repeat = [], []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(executable_path=executable)
+        for _ in range(runs):
+            # A fresh context is a fresh profile: empty HTTP cache, no service worker.
+            context = browser.new_context()
+            page = context.new_page()
+            throttle(page, profile)
+            cold.append(load(page, url))
+            page.evaluate("() => navigator.serviceWorker && navigator.serviceWorker.getRegistration()"
+                          ".then(r => r && navigator.serviceWorker.ready)")
+            page.wait_for_timeout(1000)  # let the worker finish precaching
+            page = context.new_page()
+            throttle(page, profile)
+            repeat.append(load(page, url))
+            context.close()
+        browser.close()
+    return cold, repeat
+
+def report(title, app_dir, profile, runs, executable=None):
+    proc, url = start_server(app_dir)
+    try:
+        cold, repeat = measure(url, profile, runs, executable)
+    finally:
+        proc.terminate()
+        proc.wait()
+    med = lambda values, i: statistics.median(v[i] for v in values)
+    result = {"cold_fcp": med(cold, 0), "cold_ready": med(cold, 1),
+              "repeat_fcp": med(repeat, 0), "repeat_ready": med(repeat, 1)}
+    print(f"\n{title} ({profile}, median of {runs})")
+    print(f"  cold    FCP {result['cold_fcp']:>7.0f}ms   ready {result['cold_ready']:>7.0f}ms")
+    print(f"  repeat  FCP {result['repeat_fcp']:>7.0f}ms   ready {result['repeat_ready']:>7.0f}ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rev", help="also measure this git revision, e.g. HEAD~1")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="slow4g")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--executable", help="Chrome/Chromium binary (default: Playwright's own build)")
+    args = parser.parse_args()
+
+    current = report("Working tree", ROOT, args.profile, args.runs, args.executable)
+    if args.rev:
+        tmp = checkout(args.rev)
+        try:
+            before = report(f"Revision {args.rev}", tmp, args.profile, args.runs, args.executable)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print("\nWorking tree vs revision")
+        for key in current:
+            print(f"  {key:<13} {current[key]:>7.0f}ms vs {before[key]:>7.0f}ms  ({current[key] / before[key] - 1:+.0%})")
+
+if __name__ == "__main__":
+    main()
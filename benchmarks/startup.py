@@ -0,0 +1,146 @@
+"""
+Cold-start budget of the app, measured in fresh interpreters (median of --runs):
+
+  import       importing the modules app.py imports (utils.*, views), on top of
+               `import streamlit`: ms and RSS MB added
+  first run    first script run of app.py through AppTest (default page, logged out):
+               ms, and process RSS after it
+  heavy        heavy libraries loaded by then; none of HEAVY may be (pyarrow is not
+               listed: Streamlit's custom components, e.g. the unit converter, import it)
+
+Exits 1 when a budget is exceeded or a heavy library is loaded, so it can gate CI;
+tests/test_startup.py runs the same checks (one run each) with the pytest suite.
+Timings depend on the machine; pass budgets that fit the runner.
+
+  python benchmarks/startup.py
+  python benchmarks/startup.py --import-ms 200 --render-ms 1500 --rss-mb 250 --runs 5
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "sympy", "matplotlib", "openpyxl", "scipy", "psycopg")
+IMPORT_MS = 100   # default budgets
+RENDER_MS = 1500
+RSS_MB = 150
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def app_imports():
+    """Modules imported by app.py itself (at any depth, e.g. inside try)."""
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return [name for name in dict.fromkeys(names) if name.split(".")[0] != "streamlit"]
+
+def heavy_loaded():
+    return [name for name in HEAVY if name in sys.modules]
+
+# --- Children (fresh processes) ---
+
+def child_import():
+    import importlib
+
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    streamlit_ms = (time.perf_counter() - start) * 1000
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    for name in app_imports():
+        importlib.import_module(name)
+    return {"streamlit_ms": streamlit_ms, "ms": (time.perf_counter() - start) * 1000,
+            "rss_mb": rss_mb() - rss_before, "heavy": heavy_loaded()}
+
+def child_render():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    return {"ms": (time.perf_counter() - start) * 1000, "rss_mb": rss_mb(), "heavy": heavy_loaded(),
+            "error": bool(at.exception)}
+
+def run_child(mode):
+    env = dict(os.environ, APPATY_DB_PATH=os.path.join(tempfile.mkdtemp(prefix="appaty-startup-"), "startup.db"))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode],
+                         capture_output=True, text=True, env=env, cwd=ROOT)
+    wall = (time.perf_counter() - start) * 1000
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{mode}: {out.stderr[-2000:]}")
+    return dict(json.loads(lines[-1]), process_ms=wall)
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        sys.path.insert(0, ROOT)
+        print(json.dumps(child_import() if sys.argv[2] == "import" else child_render()))
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--import-ms", type=float, default=IMPORT_MS, help="budget: app.py's imports on top of streamlit")
+    parser.add_argument("--render-ms", type=float, default=RENDER_MS, help="budget: first script run")
+    parser.add_argument("--rss-mb", type=float, default=RSS_MB, help="budget: process RSS after the first run")
+    args = parser.parse_args()
+
+    imports = [run_child("import") for _ in range(args.runs)]
+    renders = [run_child("render") for _ in range(args.runs)]
+    med = lambda runs, key: statistics.median(r[key] for r in runs)
+    result = {
+        "streamlit_ms": med(imports, "streamlit_ms"),
+        "import_ms": med(imports, "ms"),
+        "import_rss_mb": med(imports, "rss_mb"),
+        "render_ms": med(renders, "ms"),
+        "render_process_ms": med(renders, "process_ms"),
+        "rss_mb": med(renders, "rss_mb"),
+    }
+    heavy = sorted({name for r in imports + renders for name in r["heavy"]})
+
+    print(f"app.py imports ({', '.join(app_imports())})")
+    print(f"  import streamlit        {result['streamlit_ms']:>7.0f}ms")
+    print(f"  + app.py's imports      {result['import_ms']:>7.0f}ms  {result['import_rss_mb']:>6.1f} MB   "
+          f"(budget {args.import_ms:.0f}ms)")
+    print(f"  first run (AppTest)     {result['render_ms']:>7.0f}ms            (budget {args.render_ms:.0f}ms)")
+    print(f"  process start to done   {result['render_process_ms']:>7.0f}ms")
+    print(f"  RSS after first run     {result['rss_mb']:>7.0f} MB            (budget {args.rss_mb:.0f} MB)")
+    print(f"  heavy libraries loaded  {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if result["import_ms"] > args.import_ms:
+        failures.append(f"imports took {result['import_ms']:.0f}ms > {args.import_ms:.0f}ms")
+    if result["render_ms"] > args.render_ms:
+        failures.append(f"first run took {result['render_ms']:.0f}ms > {args.render_ms:.0f}ms")
+    if result["rss_mb"] > args.rss_mb:
+        failures.append(f"RSS {result['rss_mb']:.0f} MB > {args.rss_mb:.0f} MB")
+    if heavy:
+        failures.append(f"heavy libraries loaded at startup: {', '.join(heavy)}")
+    if any(r["error"] for r in renders):
+        failures.append("the first run raised an exception")
+    for line in failures:
+        print(f"OVER BUDGET: {line}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+ASGI entry point: the Streamlit app plus two routes Streamlit cannot provide:
+
+  /sw.js         the service worker. It only controls pages under the path it is
+                 served from, and Streamlit serves app files under /app/static/ only.
+  /auth/session  sets or clears the HttpOnly session cookie for a one-time nonce
+                 handed to the page (see utils/sessions.py).
+
+`streamlit run app.py` keeps working; it just runs without the worker, and logins
+last for the browser session only.
+
+    uvicorn server:app --host 0.0.0.0 --port 8501
+"""
+import json
+import os
+
+os.environ["APPATY_SERVICE_WORKER"] = "1"
+os.environ["APPATY_SESSION_COOKIE"] = "1"
+
+import streamlit as st
+from starlette.responses import Response
+from starlette.routing import Route
+from utils import sessions, ux
+
+def _service_worker(request):
+    with open(os.path.join(ux.STATIC_DIR, ux.SW_FILE), encoding="utf-8") as fh:
+        script = fh.read()
+    script = (script.replace("__APPATY_VERSION__", ux.asset_version())
+                    .replace("__APPATY_PRECACHE__", json.dumps(ux.precache_urls())))
+    # The browser checks the worker for updates itself; never let a proxy hold it.
+    return Response(script, media_type="text/javascript", headers={"Cache-Control": "no-cache"})
+
+async def _session_cookie(request):
+    handed = sessions.redeem((await request.body()).decode("utf-8", "replace").strip())
+    if handed is None:
+        return Response(status_code=400)
+    token, max_age = handed
+    response = Response(status_code=204, headers={"Cache-Control": "no-store"})
+    secure = request.url.scheme == "https" or request.headers.get("x-forwarded-proto") == "https"
+    if token is None:
+        response.delete_cookie(sessions.COOKIE_NAME, path="/", secure=secure, httponly=True, samesite="strict")
+    else:
+        response.set_cookie(sessions.COOKIE_NAME, token, max_age=max_age, path="/",
+                            secure=secure, httponly=True, samesite="strict")
+    return response
+
+app = st.App(os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"),
+             routes=[Route("/sw.js", _service_worker),
+                     Route("/auth/session", _session_cookie, methods=["POST"])])
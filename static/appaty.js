@@ -0,0 +1,26 @@
+// APPATY client helpers: loaded once per browser session by utils/ux.py.
+//
+// Streamlit replaces widgets on every rerun, so nothing here binds to individual
+// elements: one delegated listener per event lives on the document and matches the
+// target when the event fires. Loading the script twice is a no-op.
+(function () {
+  if (window.__appatyUx) {
+    return;
+  }
+  window.__appatyUx = true;
+
+  // Haptic feedback on button presses (where the device supports it).
+  document.addEventListener("click", function (event) {
+    if (navigator.vibrate && event.target.closest && event.target.closest("button")) {
+      navigator.vibrate(50);
+    }
+  }, { passive: true });
+
+  // Select the contents of number inputs on focus, so typing replaces the value.
+  document.addEventListener("focusin", function (event) {
+    var target = event.target;
+    if (target && target.tagName === "INPUT" && target.type === "number") {
+      target.select();
+    }
+  });
+})();
@@ -0,0 +1,58 @@
+// APPATY service worker. Served at /sw.js by server.py, which fills in VERSION (a hash
+// of the precached files) and PRECACHE; a changed asset means a new VERSION, so the new
+// worker installs a fresh shell cache and drops the old one on activation.
+//
+//   navigations                    network first, cached app shell when offline
+//   static/, app/static/ assets    stale-while-revalidate
+//   everything else                network only (_stcore websocket/health, media, uploads)
+const VERSION = "__APPATY_VERSION__";
+const PRECACHE = __APPATY_PRECACHE__;
+const SHELL_CACHE = "appaty-shell-" + VERSION;
+const RUNTIME_CACHE = "appaty-runtime";
+const RUNTIME_MAX_ENTRIES = 80;
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches.open(SHELL_CACHE)
+      .then((cache) => cache.addAll(["./"].concat(PRECACHE)))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(keys
+        .filter((key) => key.startsWith("appaty-shell-") && key !== SHELL_CACHE)
+        .map((key) => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+const trim = (cache) => cache.keys().then((keys) =>
+  Promise.all(keys.slice(0, Math.max(0, keys.length - RUNTIME_MAX_ENTRIES)).map((key) => cache.delete(key))));
+
+const staleWhileRevalidate = (event) => {
+  const refresh = fetch(event.request).then((response) => {
+    if (response.ok) {
+      const copy = response.clone();
+      caches.open(RUNTIME_CACHE).then((cache) => cache.put(event.request, copy).then(() => trim(cache)));
+    }
+    return response;
+  });
+  event.waitUntil(refresh.catch(() => undefined));
+  return caches.match(event.request).then((cached) => cached || refresh);
+};
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  if (request.method !== "GET" || !request.url.startsWith(self.registration.scope)) {
+    return;
+  }
+  const path = request.url.slice(self.registration.scope.length);
+  if (request.mode === "navigate") {
+    event.respondWith(fetch(request).catch(() => caches.match(self.registration.scope)));
+  } else if (path.startsWith("static/") || path.startsWith("app/static/")) {
+    event.respondWith(staleWhileRevalidate(event));
+  }
+});
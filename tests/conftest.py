@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db, retention
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh SQLite database (and archive directory) for one test."""
+    monkeypatch.setattr(retention, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    db.configure(f"sqlite:///{tmp_path / 'test.db'}")
+    db.init_db()
+    yield db
+    db.close_pool()
+
+@pytest.fixture
+def user_id(database):
+    database.add_user("tester", "hash")
+    return database.get_user("tester")["id"]
@@ -0,0 +1,56 @@
+import time
+import uuid
+
+import pytest
+
+from utils import algebra_solver as algebra
+from utils import numeric_solver
+
+@pytest.mark.parametrize("text, message", [
+    ("exp(exp(exp(100)))=x", "nested"),
+    ("((x^50)^50)^50 = 1", "total degree"),
+])
+def test_parse_system_rejects_expensive_input(text, message):
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match=message):
+        algebra.parse_system(text)
+    assert time.perf_counter() - start < 2
+
+def test_system_sreprs_does_not_evaluate_numbers():
+    equations, variables = algebra.parse_system("exp(exp(100)) = x")
+    start = time.perf_counter()
+    equation_sreprs, var_sreprs = algebra.system_sreprs(equations, variables)
+    assert time.perf_counter() - start < 2
+    assert "exp(exp(Integer(100)))" in equation_sreprs[0]
+    assert var_sreprs == ("Symbol('x')",)
+
+def test_parse_system_accepts_ordinary_nesting():
+    equations, variables = algebra.parse_system("sin(x^2)^2 + 1/sqrt(x^2 + 1) = y\nexp(-x^2/2) = y")
+    assert [v.name for v in variables] == ["x", "y"]
+    assert len(equations) == 2
+
+def _race(equations):
+    equations, variables = algebra.parse_system(equations)
+    equation_sreprs, var_sreprs = algebra.system_sreprs(equations, variables)
+    key = "test_symbolic:" + uuid.uuid4().hex
+    return algebra.solve_system_race_job(lambda *a, **k: None, key, equation_sreprs, var_sreprs)
+
+def test_race_returns_as_soon_as_the_symbolic_solver_has_solutions(database, monkeypatch):
+    def numeric_until_stopped(progress, equation_sreprs, var_sreprs, deadline=None, stop=None):
+        while not stop():
+            assert time.monotonic() < deadline, "numeric solver was never stopped"
+            time.sleep(0.01)
+        return {"solutions": [], "residuals": [], "engine": "numeric"}
+    monkeypatch.setattr(algebra, "RACE_BUDGET_S", 30)
+    monkeypatch.setattr(numeric_solver, "solve_system_job", numeric_until_stopped)
+    start = time.monotonic()
+    result = _race("x + y = 5\nx - y = 1")
+    assert time.monotonic() - start < 10
+    assert result["engine"] == "symbolic" and len(result["solutions"]) == 1
+
+def test_race_survives_a_failing_numeric_solver(database, monkeypatch):
+    def broken(*args, **kwargs):
+        raise FloatingPointError("overflow")
+    monkeypatch.setattr(numeric_solver, "solve_system_job", broken)
+    result = _race("x^2 = 4")
+    assert result["engine"] == "symbolic" and len(result["solutions"]) == 2
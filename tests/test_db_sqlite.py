@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+from utils import db_sqlite
+
+def test_exhausted_pool_raises_operational_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_sqlite, "BUSY_TIMEOUT_MS", 50)
+    db_sqlite.configure(str(tmp_path / "pool.db"), pool_size=1)
+    try:
+        with db_sqlite.connection():
+            with pytest.raises(sqlite3.OperationalError, match="connection pool exhausted"):
+                db_sqlite._acquire()
+    finally:
+        db_sqlite.close_pool()
+
+def test_connection_borrowed_across_configure_is_closed(tmp_path):
+    db_sqlite.configure(str(tmp_path / "old.db"))
+    with db_sqlite.connection() as old:
+        db_sqlite.configure(str(tmp_path / "new.db"))
+        assert db_sqlite.pool_stats()["in_use"] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        old.execute("SELECT 1")
+    with db_sqlite.connection() as conn:
+        assert conn is not old
+        assert conn.execute("PRAGMA database_list").fetchone()[2].endswith("new.db")
+    assert db_sqlite.pool_stats()["in_use"] == 0
+    db_sqlite.close_pool()
+
+def test_calc_name_filter_is_a_literal_case_sensitive_prefix(database, user_id):
+    names = ["Ohm's Law", "ohm's law", "Ohm_s Law", "50% Duty", "500 Duty", "Ohm"]
+    database.add_history_items([(user_id, name, "1", 1000 + i, None, None, None, None) for i, name in enumerate(names)])
+
+    def matching(prefix):
+        rows, _ = database.get_history_page(user_id, calc_name=prefix)
+        return sorted(row["calc_name"] for row in rows)
+
+    assert matching("Ohm") == ["Ohm", "Ohm's Law", "Ohm_s Law"]
+    assert matching("Ohm_") == ["Ohm_s Law"]
+    assert matching("50%") == ["50% Duty"]
+    assert database.get_history_extent(user_id, calc_name="Ohm'")[0] == 1
@@ -0,0 +1,80 @@
+import pytest
+
+from utils import history_writer
+
+@pytest.fixture(autouse=True)
+def writer(monkeypatch):
+    """A private queue, coalescing map and counters, drained only by explicit flushes."""
+    monkeypatch.setattr(history_writer, "_queue", history_writer.deque())
+    monkeypatch.setattr(history_writer, "_last_by_user", history_writer.OrderedDict())
+    monkeypatch.setattr(history_writer, "_usage", {})
+    monkeypatch.setattr(history_writer, "_attempts", {})
+    monkeypatch.setattr(history_writer, "_stats", dict.fromkeys(history_writer._stats, 0))
+    monkeypatch.setattr(history_writer, "_ensure_worker", lambda: None)
+
+def test_repeat_is_coalesced_only_within_the_window(database, user_id, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(history_writer.time, "monotonic", lambda: clock[0])
+    assert history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    assert not history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    clock[0] += history_writer.COALESCE_WINDOW_S + 1
+    assert history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    history_writer.flush()
+    assert [r["result"] for r in database.get_history_page(user_id)[0]] == ["2 A", "2 A"]
+
+def test_last_entries_are_bounded(monkeypatch):
+    monkeypatch.setattr(history_writer, "COALESCE_USERS", 3)
+    for uid in range(10):
+        history_writer.enqueue(uid, "Ohm's Law", "2 A")
+    assert list(history_writer._last_by_user) == [7, 8, 9]
+
+def test_flush_user_writes_only_that_users_rows(database, user_id):
+    database.add_user("other", "hash")
+    other_id = database.get_user("other")["id"]
+    history_writer.enqueue(other_id, "Ohm's Law", "1 A")
+    history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    history_writer.enqueue(other_id, "Ohm's Law", "3 A")
+    assert history_writer.flush_user(user_id) == 1
+    assert [r["result"] for r in database.get_history_page(user_id)[0]] == ["2 A"]
+    assert database.get_history_page(other_id)[0] == []
+    assert [e[2] for e in history_writer._queue] == ["1 A", "3 A"]
+
+def test_flush_usage_leaves_history_rows_queued(database, user_id):
+    history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    history_writer.record_usage("ohms_law", 1.5)
+    history_writer.flush_usage()
+    assert not history_writer._usage
+    assert len(history_writer._queue) == 1
+    assert database.get_history_page(user_id)[0] == []
+
+def _reject(monkeypatch, database, error, result="bad"):
+    """Make the database reject any batch that contains a row with this result."""
+    real = database.add_history_items
+    def add_history_items(items):
+        if any(item[2] == result for item in items):
+            raise error
+        return real(items)
+    monkeypatch.setattr(database, "add_history_items", add_history_items)
+
+def test_rejected_row_does_not_block_the_queue(database, user_id, monkeypatch):
+    _reject(monkeypatch, database, database._backend.IntegrityError("rejected"))
+    history_writer.enqueue(user_id, "Ohm's Law", "bad")
+    history_writer.enqueue(user_id, "Ohm's Law", "1 A")
+    history_writer.enqueue(user_id, "Ohm's Law", "2 A")
+    assert history_writer.flush() == 2
+    assert [r["result"] for r in database.get_history_page(user_id)[0]] == ["2 A", "1 A"]
+    assert [e[2] for e in history_writer._queue] == ["bad"]
+    for _ in range(history_writer.MAX_ATTEMPTS - 1):
+        history_writer.flush()
+    assert not history_writer._queue and not history_writer._attempts
+    assert history_writer.stats()["dropped"] == 1
+
+def test_unavailable_database_keeps_every_row_queued(database, user_id, monkeypatch):
+    _reject(monkeypatch, database, database._backend.OperationalError("database is locked"))
+    history_writer.enqueue(user_id, "Ohm's Law", "bad")
+    history_writer.enqueue(user_id, "Ohm's Law", "1 A")
+    for _ in range(history_writer.MAX_ATTEMPTS + 1):
+        with pytest.raises(database._backend.OperationalError):
+            history_writer.flush()
+    assert [e[2] for e in history_writer._queue] == ["bad", "1 A"]
+    assert not history_writer._attempts
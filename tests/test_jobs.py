@@ -0,0 +1,30 @@
+import time
+import uuid
+
+from utils import history_codec, jobs
+
+def _wait(job_id):
+    for _ in range(200):
+        job = jobs.get(job_id)
+        if job["status"] in (jobs.DONE, jobs.FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+def _solve(result):
+    return lambda progress: result
+
+def test_only_solution_lists_are_persisted(database):
+    solved, failed = "test:" + uuid.uuid4().hex, "test:" + uuid.uuid4().hex
+    _wait(jobs.submit(solved, _solve({"solutions": [1, 2]}), persist="test"))
+    _wait(jobs.submit(failed, _solve({"solutions": "System is too complex for symbolic solution."}), persist="test"))
+    assert database.get_job_result(solved) is not None
+    assert database.get_job_result(failed) is None
+
+def test_stored_error_result_is_not_served(database):
+    key = "test:" + uuid.uuid4().hex
+    database.put_job_result(key, "test", history_codec.encode_payload(solution={"solutions": "timed out"}))
+    assert jobs.find(key, persisted=True) is None
+    job = _wait(jobs.submit(key, _solve({"solutions": [3]}), persist="test"))
+    assert job["result"] == {"solutions": [3]}
+    assert jobs.find(key, persisted=True)["result"] == {"solutions": [3]}
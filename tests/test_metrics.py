@@ -0,0 +1,25 @@
+import http.server
+import socket
+
+import pytest
+
+from utils import metrics
+
+@pytest.fixture
+def taken_port(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "_server", None)
+    monkeypatch.setattr(metrics, "_bind_failed", False)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        yield sock.getsockname()[1]
+
+def test_taken_port_does_not_raise_and_is_not_retried(taken_port, monkeypatch, caplog):
+    assert metrics.start_server(taken_port, "127.0.0.1") is None
+    assert "Metrics endpoint disabled" in caplog.text
+
+    binds = []
+    monkeypatch.setattr(http.server, "ThreadingHTTPServer", lambda *args: binds.append(args))
+    assert metrics.start_server(taken_port, "127.0.0.1") is None
+    assert binds == []
@@ -0,0 +1,21 @@
+import time
+
+import pytest
+
+from utils import passwords
+
+@pytest.mark.parametrize("stored", [
+    "scrypt$16384$8",
+    "bcrypt$12$YWFh$YmJi",
+    "scrypt$x$8$1$YWFh$YmJi",
+    "scrypt$3$8$1$YWFh$YmJi",
+    "pbkdf2_sha256$YWFh$YmJi",
+    "scrypt$16384$8$1$!!$YmJi",
+])
+def test_malformed_hash_is_a_failed_login(stored):
+    assert passwords.verify_password("secret", stored) == (False, None)
+
+def test_slow_hash_raises_busy(monkeypatch):
+    monkeypatch.setattr(passwords, "TIMEOUT_S", 0.01)
+    with pytest.raises(passwords.Busy):
+        passwords._run(time.sleep, 0.2)
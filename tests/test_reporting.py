@@ -0,0 +1,34 @@
+import functools
+import time
+
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from utils import reporting, retention
+
+def _add(db, user_id, calc_name, result, ts):
+    db.add_history_items([(user_id, calc_name, result, ts, None, None, None, None)])
+
+def _download(*args, **kwargs):
+    """What st.download_button does with a deferred callable: call it and convert the result."""
+    data = functools.partial(reporting.history_download, *args, **kwargs)()
+    return convert_data_to_bytes_and_infer_mime(data, unsupported_error=TypeError("unsupported"))[0]
+
+def test_history_downloads_convert_for_streamlit(database, user_id):
+    _add(database, user_id, "Ohm's Law", "2 A", int(time.time()))
+    csv = _download(user_id, "csv").decode("utf-8")
+    txt = _download(user_id, "txt").decode("utf-8")
+    assert csv.splitlines()[0] == "timestamp,calculation,result"
+    assert "Ohm's Law,2 A" in csv
+    assert txt.startswith("APPATY History Report") and "Ohm's Law = 2 A" in txt
+
+def test_filtered_export_includes_only_matching_archived_rows(database, user_id):
+    old = int(time.time()) - 400 * 86400
+    _add(database, user_id, "Ohm's Law", "1 A", old)
+    _add(database, user_id, "Pressure Conversion", "1 bar", old + 1)
+    _add(database, user_id, "Ohm's Law", "3 A", int(time.time()))
+    assert retention.archive_history(max_age_days=90) == 2
+
+    rows = list(reporting.iter_db_history(user_id, calc_name="Ohm", include_archive=True))
+    assert [r["result"] for r in rows] == ["3 A", "1 A"]
+    csv = _download(user_id, "csv", calc_name="Ohm", include_archive=True).decode("utf-8")
+    assert "Pressure" not in csv and "1 A" in csv
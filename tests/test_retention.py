@@ -0,0 +1,59 @@
+import gzip
+import json
+import os
+import time
+
+from utils import retention
+
+OLD = int(time.time()) - 400 * 86400
+
+def _add(db, user_id, result, ts=OLD):
+    db.add_history_items([(user_id, "Ohm's Law", result, ts, None, None, None, None)])
+
+def _other_user(db):
+    db.add_user("other", "hash")
+    return db.get_user("other")["id"]
+
+def _index(db, user_id):
+    with db.connection() as conn:
+        return conn.execute("SELECT rows, min_ts, max_ts FROM history_archive WHERE user_id = ?",
+                            (user_id,)).fetchall()
+
+def test_reading_one_users_archive_opens_only_their_partitions(database, user_id, monkeypatch):
+    other_id = _other_user(database)
+    _add(database, user_id, "1 A")
+    _add(database, other_id, "2 A")
+    assert retention.archive_history(max_age_days=90) == 2
+
+    opened = []
+    read = retention._read_partition
+    monkeypatch.setattr(retention, "_read_partition", lambda path: opened.append(path) or read(path))
+    assert [r["result"] for r in retention.iter_archive(user_id)] == ["1 A"]
+    assert not any(p.endswith(f"{other_id}.jsonl.gz") for p in opened)
+
+def test_rearchiving_after_a_crash_adds_nothing_twice(database, user_id):
+    _add(database, user_id, "1 A")
+    _add(database, user_id, "2 A", OLD + 1)
+    with database.connection() as conn:
+        rows = conn.execute(f"SELECT {', '.join(retention.ARCHIVE_COLUMNS)} FROM history").fetchall()
+    # A run that wrote the partition and crashed before deleting the rows.
+    retention._merge_partition(retention._day_of(OLD), user_id, rows)
+
+    assert retention.archive_history(max_age_days=90) == 2
+    path = retention.partition_path(retention._day_of(OLD), user_id)
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        assert [json.loads(line)["result"] for line in fh] == ["1 A", "2 A"]
+    assert [tuple(r) for r in _index(database, user_id)] == [(2, OLD, OLD + 1)]
+
+def test_shared_day_files_are_still_read(database, user_id):
+    other_id = _other_user(database)
+    day = retention._day_of(OLD)
+    path = retention._shared_partition_path(day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        for id_, uid in ((1, user_id), (2, other_id)):
+            fh.write(json.dumps({"id": id_, "user_id": uid, "calc_name": "Ohm's Law", "result": f"{id_} A", "ts": OLD}) + "\n")
+    with database.connection() as conn, conn:
+        conn.execute("INSERT INTO history_archive (user_id, day, rows, min_ts, max_ts) VALUES (?, ?, 1, ?, ?)",
+                     (user_id, day, OLD, OLD))
+    assert [r["result"] for r in retention.iter_archive(user_id)] == ["1 A"]
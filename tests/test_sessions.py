@@ -0,0 +1,18 @@
+from utils import sessions
+
+def test_handoff_is_redeemed_once(database, user_id):
+    token = sessions.create(user_id, remember=True)
+    nonce = sessions.handoff(token, sessions.REMEMBER_TTL_S)
+    assert token not in nonce
+    assert sessions.redeem(nonce) == (token, sessions.REMEMBER_TTL_S)
+    assert sessions.redeem(nonce) is None
+    assert sessions.restore(token)["id"] == user_id
+
+def test_handoff_expires(monkeypatch):
+    monkeypatch.setattr(sessions, "HANDOFF_TTL_S", -1)
+    assert sessions.redeem(sessions.handoff(None)) is None
+
+def test_clearing_handoff_and_unknown_nonces():
+    assert sessions.redeem(sessions.handoff(None)) == (None, None)
+    assert sessions.redeem("not-a-nonce") is None
+    assert sessions.redeem("") is None
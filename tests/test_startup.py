@@ -0,0 +1,28 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location("startup", os.path.join(ROOT, "benchmarks", "startup.py"))
+startup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(startup)
+
+@pytest.fixture(scope="module")
+def imported():
+    """app.py's imports, in a fresh interpreter."""
+    return startup.run_child("import")
+
+def test_app_imports_load_no_heavy_library(imported):
+    assert "pandas" in startup.HEAVY and "sympy" in startup.HEAVY
+    assert imported["heavy"] == []
+
+def test_app_imports_within_budget(imported):
+    assert imported["ms"] <= startup.IMPORT_MS
+
+def test_first_run_within_budget():
+    rendered = startup.run_child("render")
+    assert not rendered["error"]
+    assert rendered["heavy"] == []
+    assert rendered["ms"] <= startup.RENDER_MS
+    assert rendered["rss_mb"] <= startup.RSS_MB
@@ -1,8 +1,16 @@
+import functools
+import io
+import os
+import time
+import tokenize
 import streamlit as st
+from utils import metrics, profiling
 
 # Note: Lazy imports used inside functions for performance
 # import sympy as sp
 
+@metrics.timed("appaty_solver_seconds", fn="solve_linear_1var")
+@profiling.profiled
 def solve_linear_1var(a, b):
     import sympy as sp
     """ Solve ax + b = 0 """
@@ -16,6 +24,8 @@ def solve_linear_1var(a, b):
     except Exception as e:
         return f"Error: {str(e)}"
 
+@metrics.timed("appaty_solver_seconds", fn="solve_linear_2vars")
+@profiling.profiled
 def solve_linear_2vars(eq1_coeffs, eq2_coeffs):
     import sympy as sp
     """ Solve linear system of 2 vars """
@@ -30,6 +40,8 @@ def solve_linear_2vars(eq1_coeffs, eq2_coeffs):
     except Exception as e:
         return f"Error: {str(e)}"
 
+@metrics.timed("appaty_solver_seconds", fn="solve_quadratic_1var")
+@profiling.profiled
 def solve_quadratic_1var(a, b, c):
     import sympy as sp
     """ Solve ax^2 + bx + c = 0 """
@@ -43,6 +55,8 @@ def solve_quadratic_1var(a, b, c):
     except Exception as e:
         return f"Error: {str(e)}"
 
+@metrics.timed("appaty_solver_seconds", fn="solve_quadratic_system")
+@profiling.profiled
 def solve_quadratic_system(eq1_type, eq1_coeffs, eq2_type, eq2_coeffs):
     import sympy as sp
     """ Curve intersection solver """
@@ -67,6 +81,8 @@ def solve_quadratic_system(eq1_type, eq1_coeffs, eq2_type, eq2_coeffs):
     except Exception as e:
         return f"Error: {str(e)}"
 
+@metrics.timed("appaty_solver_seconds", fn="solve_poly_high_deg")
+@profiling.profiled
 def solve_poly_high_deg(coeffs_dict):
     import sympy as sp
     """ Solve general polynomial """
@@ -81,37 +97,265 @@ def solve_poly_high_deg(coeffs_dict):
     except Exception as e:
         return f"Error: {str(e)}"
 
-@st.cache_data(show_spinner=False)
+@metrics.timed("appaty_solver_seconds", fn="solve_general_system")
+@profiling.profiled
 def solve_general_system(equations, vars_list):
-    import sympy as sp
-    """ 
+    """
     Solve symbolic system using pure SymPy.
     equations: list of SymPy expressions (implied = 0)
     vars_list: list of SymPy symbols
     """
+    # st.cache_data cannot hash SymPy objects; key the cache on their canonical srepr text.
+    return _solve_general_system(*system_sreprs(equations, vars_list))
+
+def system_sreprs(equations, vars_list):
+    """Canonical text form of a system: (equation sreprs, variable sreprs), hashable and picklable."""
+    import sympy as sp
+    # order="none": args as stored (SymPy keeps them in canonical order already); the default
+    # printer sorts terms, which evaluates numbers such as exp(exp(100)) to arbitrary precision.
+    return (tuple(sp.srepr(sp.sympify(eq), order="none") for eq in equations),
+            tuple(sp.srepr(v, order="none") for v in vars_list))
+
+@st.cache_data(show_spinner=False, max_entries=1000)
+def _solve_general_system(equation_sreprs, var_sreprs):
+    return _solve_system(equation_sreprs, var_sreprs)
+
+def solve_system_job(progress, equation_sreprs, var_sreprs):
+    """
+    solve_general_system as a background job (utils/jobs.py), reporting its stages.
+    Returns {"variables": names, "equations": [...], "solutions": list or error str}.
+    """
+    import sympy as sp
+    solutions = _solve_system(equation_sreprs, var_sreprs, progress)
+    return {"variables": [sp.sympify(v).name for v in var_sreprs],
+            "equations": [sp.sympify(e) for e in equation_sreprs],
+            "solutions": solutions}
+
+@metrics.timed("appaty_solver_seconds", fn="solve_system_uncached")
+@profiling.profiled
+def _solve_system(equation_sreprs, var_sreprs, progress=None):
+    import sympy as sp
+    progress = progress or (lambda done, total=None, stage=None: None)
+    equations = [sp.sympify(e) for e in equation_sreprs]
+    vars_list = [sp.sympify(v) for v in var_sreprs]
     try:
         # User requested specifically: sympy.solve(equations, variables, dict=True)
         # This is more robust for general consistency than nonlinsolve
+        progress(0, 1, "Solving")
         sols = sp.solve(equations, vars_list, dict=True)
-        
+        if isinstance(sols, dict):
+            # Single solution case
+            sols = [sols]
+        if not isinstance(sols, list):
+            return []
+
         # Parse results to ensure they are JSON/UI friendly
         results = []
-        if isinstance(sols, list):
-            for s in sols:
-                # s is already a dictionary {x: val, y: val}
-                res_dict = {}
-                for v, val in s.items():
-                    res_dict[v] = sp.simplify(val)
-                results.append(res_dict)
-            return results
-        elif isinstance(sols, dict):
-            # Single solution case
-            res_dict = {}
-            for v, val in sols.items():
-                res_dict[v] = sp.simplify(val)
-            return [res_dict]
-        
-        return []
+        for n, s in enumerate(sols):
+            progress(n, len(sols), f"Simplifying solution {n + 1} of {len(sols)}")
+            # s is already a dictionary {x: val, y: val}
+            results.append({v: sp.simplify(val) for v, val in s.items()})
+        progress(len(sols), len(sols), "Done")
+        return results
 
     except Exception as e:
         return f"System is too complex for symbolic solution. Please simplify terms. ({str(e)})"
+
+# --- Engine Race ---
+# "Auto" engine of the Universal Solver: the symbolic solve runs as its own persisted
+# job on the "race" pool (so a system solved before is served from job_results, and a
+# slow solve that finishes after the budget is there next time) while this job runs
+# the numeric solver (utils/numeric_solver.py). The numeric solver checks the symbolic
+# job between Newton iterations and stops as soon as it has solutions, so the exact
+# answer is returned the moment it arrives within APPATY_SOLVER_BUDGET_S seconds;
+# otherwise the numeric one is used. A numeric solver that fails only loses the race.
+# A symbolic solve that misses the budget cannot be stopped; it finishes on its pool
+# in the background.
+
+RACE_BUDGET_S = float(os.environ.get("APPATY_SOLVER_BUDGET_S", "3"))
+
+def solve_system_race_job(progress, symbolic_key, equation_sreprs, var_sreprs):
+    """
+    Race the symbolic and numeric engines as a background job. symbolic_key: the job key
+    of the symbolic solve. Returns a solve_system_job-shaped result with "engine" set, and
+    "fallback" (why the numeric result was used) when it is numeric.
+    """
+    from utils import jobs, numeric_solver
+    deadline = time.monotonic() + RACE_BUDGET_S
+    try:
+        jobs.submit(symbolic_key, solve_system_job, equation_sreprs, var_sreprs,
+                    pool="race", persist="universal_system")
+    except jobs.Busy:
+        pass
+
+    def symbolic_won():
+        job = jobs.find(symbolic_key)
+        return bool(job and job["status"] == jobs.DONE and isinstance(job["result"]["solutions"], list)
+                     and job["result"]["solutions"])
+
+    numeric = numeric_error = None
+    if not symbolic_won():
+        try:
+            numeric = numeric_solver.solve_system_job(progress, equation_sreprs, var_sreprs, deadline,
+                                                      stop=symbolic_won)
+        except Exception as e:
+            numeric_error = e
+
+    progress(0, None, "Waiting for the symbolic solver")
+    symbolic = jobs.find(symbolic_key)
+    while symbolic and symbolic["status"] in (jobs.QUEUED, jobs.RUNNING) and time.monotonic() < deadline:
+        time.sleep(0.05)
+        symbolic = jobs.find(symbolic_key)
+
+    if symbolic is None:
+        reason = "The solver pool was busy, so only the numeric solver ran."
+    elif symbolic["status"] in (jobs.QUEUED, jobs.RUNNING):
+        reason = f"The symbolic solver did not finish within {RACE_BUDGET_S:g}s."
+    elif symbolic["status"] == jobs.FAILED:
+        reason = "The symbolic solver failed."
+    else:
+        solutions = symbolic["result"]["solutions"]
+        if numeric is None or (isinstance(solutions, list) and (solutions or not numeric["solutions"])):
+            return dict(symbolic["result"], engine="symbolic")
+        reason = ("The symbolic solver found no solution." if isinstance(solutions, list)
+                  else "The symbolic solver could not solve the system.")
+    if numeric is None:
+        raise RuntimeError(f"{reason} The numeric solver failed too ({numeric_error}).")
+    return dict(numeric, fallback=reason)
+
+# --- Text Equation Parser ---
+# Equations typed as text ("x*y + z^2 = 3") for the Universal Solver. Input is checked
+# token by token before SymPy sees it: only numbers, arithmetic operators, parentheses,
+# the functions/constants below and short variable names (x, y, k2, ...) are allowed, so
+# nothing but plain arithmetic reaches parse_expr (which evals). Parsing is unevaluated
+# first, so huge powers (9^9^9), deep nesting (exp(exp(exp(100))), ((x^50)^50)^50) and
+# high total degrees are rejected before anything is computed. Parsed systems are
+# cached.
+
+MAX_EQUATIONS = 5
+MAX_UNKNOWNS = 5
+MAX_EQUATION_CHARS = 300
+MAX_NUMBER_CHARS = 20
+MAX_EXPONENT = 50
+MAX_DEGREE = 50            # total polynomial degree of a side
+MAX_NESTING = 4            # functions and powers inside each other (x/y does not count)
+MAX_FUNCTION_NESTING = 2   # functions inside functions: sin(cos(x)), not exp(exp(exp(x)))
+
+TEXT_FUNCTIONS = ("sin", "cos", "tan", "asin", "acos", "atan", "sinh", "cosh", "tanh",
+                  "exp", "log", "ln", "sqrt", "Abs")
+TEXT_CONSTANTS = ("pi", "E")
+TEXT_OPERATORS = {"+", "-", "*", "/", "^", "**", "(", ")", ","}
+VARIABLE_ORDER = ["x", "y", "z", "w", "v"]  # listed first, as in the coefficient form
+
+def _is_variable(name):
+    """One letter, optionally followed by up to two digits (x, y, k2, x_1)."""
+    if not name.isascii() or not name[0].isalpha() or name in ("E", "I"):
+        return False
+    rest = name[1:].lstrip("_")
+    return len(name) <= 3 and (rest == "" or rest.isdigit()) and len(name[1:]) - len(rest) <= 1
+
+def _variables(side):
+    """Variable names in one side of an equation; raises ValueError on anything not allowed."""
+    names = set()
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(side).readline))
+    except (tokenize.TokenError, SyntaxError):
+        raise ValueError("unbalanced parentheses or invalid characters")
+    for tok in tokens:
+        if tok.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER):
+            continue
+        if tok.type == tokenize.NUMBER:
+            if len(tok.string) > MAX_NUMBER_CHARS or not all(c.isdigit() or c in ".eE+-_" for c in tok.string):
+                raise ValueError(f"unsupported number '{tok.string}'")
+        elif tok.type == tokenize.NAME:
+            if _is_variable(tok.string):
+                names.add(tok.string)
+            elif tok.string not in TEXT_FUNCTIONS and tok.string not in TEXT_CONSTANTS:
+                raise ValueError(f"unknown name '{tok.string}' (write products as x*y)")
+        elif tok.type != tokenize.OP or tok.string not in TEXT_OPERATORS:
+            raise ValueError(f"unsupported symbol '{tok.string}'")
+    return names
+
+def _parse_side(side):
+    import sympy as sp
+    from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication, convert_xor
+
+    # Only what the transformed code calls (Integer(2), Mul(x, y, evaluate=False), ...) plus the allowed names.
+    namespace = {"Integer": sp.Integer, "Float": sp.Float, "Rational": sp.Rational, "Symbol": sp.Symbol,
+                 "Add": sp.Add, "Mul": sp.Mul, "Pow": sp.Pow,
+                 "pi": sp.pi, "E": sp.E, "ln": sp.log, "__builtins__": {}}
+    namespace.update({f: getattr(sp, f) for f in TEXT_FUNCTIONS if f != "ln"})
+    local = {name: sp.Symbol(name) for name in _variables(side)}
+    expr = parse_expr(side, local_dict=local, global_dict=namespace, evaluate=False,
+                      transformations=standard_transformations + (implicit_multiplication, convert_xor))
+    for node in sp.preorder_traversal(expr):
+        if isinstance(node, sp.Pow) and node.exp.is_number and abs(node.exp) > MAX_EXPONENT:
+            raise ValueError(f"exponents are limited to ±{MAX_EXPONENT}")
+    nesting, functions, degree = _complexity(expr)
+    if nesting > MAX_NESTING or functions > MAX_FUNCTION_NESTING:
+        raise ValueError(f"functions and powers can be nested at most {MAX_NESTING} deep "
+                         f"(functions inside functions at most {MAX_FUNCTION_NESTING})")
+    if degree > MAX_DEGREE:
+        raise ValueError(f"the total degree is limited to {MAX_DEGREE}")
+    return sp.sympify(expr)
+
+def _complexity(node):
+    """(nesting of functions and powers, nesting of functions, total degree) of an unevaluated expression."""
+    import sympy as sp
+    if not node.args:
+        return 0, 0, int(node.is_Symbol)
+    parts = [_complexity(arg) for arg in node.args]
+    nesting = max(p[0] for p in parts)
+    functions = max(p[1] for p in parts)
+    if isinstance(node, sp.Pow):
+        (nesting, functions, base_degree), exp = parts[0], node.exp
+        if exp.is_Integer:
+            degree = base_degree * abs(int(exp))
+        else:  # x^(1/2), 2^x: like a new unknown
+            degree = int(base_degree > 0 or parts[1][2] > 0)
+        return max(nesting + (exp != -1), parts[1][0] + 1), max(functions, parts[1][1]), degree
+    if isinstance(node, sp.Function):
+        return nesting + 1, functions + 1, int(any(p[2] for p in parts))
+    if isinstance(node, sp.Mul):
+        return nesting, functions, sum(p[2] for p in parts)
+    return nesting, functions, max(p[2] for p in parts)
+
+@functools.lru_cache(maxsize=1024)
+def parse_system(text):
+    """
+    Parse one equation per line (or ;-separated): "lhs = rhs", or an expression meaning "= 0".
+    Returns (equations, variables) as tuples of SymPy expressions (implied = 0) and symbols.
+    Raises ValueError with a message for the user when the text is not accepted.
+    """
+    lines = [line.strip() for line in text.replace(";", "\n").splitlines() if line.strip()]
+    if not lines:
+        raise ValueError("Enter at least one equation.")
+    if len(lines) > MAX_EQUATIONS:
+        raise ValueError(f"At most {MAX_EQUATIONS} equations.")
+    equations = []
+    for n, line in enumerate(lines, 1):
+        sides = line.split("=")
+        if len(line) > MAX_EQUATION_CHARS:
+            raise ValueError(f"Equation {n} is longer than {MAX_EQUATION_CHARS} characters.")
+        if len(sides) > 2 or not all(side.strip() for side in sides):
+            raise ValueError(f"Equation {n}: write it as 'left = right'.")
+        try:
+            parts = [_parse_side(side.strip()) for side in sides]
+        except ValueError as e:
+            raise ValueError(f"Equation {n}: {e}.")
+        except Exception:
+            raise ValueError(f"Equation {n}: could not parse '{line}'.")
+        equations.append(parts[0] - parts[1] if len(parts) == 2 else parts[0])
+    symbols = set().union(*(eq.free_symbols for eq in equations))
+    if not symbols:
+        raise ValueError("No unknowns found.")
+    if len(symbols) > MAX_UNKNOWNS:
+        raise ValueError(f"At most {MAX_UNKNOWNS} unknowns.")
+    order = lambda sym: (VARIABLE_ORDER.index(sym.name) if sym.name in VARIABLE_ORDER else len(VARIABLE_ORDER), sym.name)
+    return tuple(equations), tuple(sorted(symbols, key=order))
+
+@metrics.register_collector
+def _parse_cache_stats():
+    info = parse_system.cache_info()
+    yield "appaty_cache_requests_total", {"cache": "parse_system", "result": "hit"}, info.hits, "counter"
+    yield "appaty_cache_requests_total", {"cache": "parse_system", "result": "miss"}, info.misses, "counter"
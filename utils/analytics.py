@@ -0,0 +1,93 @@
+import argparse
+import time
+from contextlib import contextmanager
+from utils import db, history_writer, metrics
+
+# --- Usage Analytics ---
+# Calls, errors and latency per calculator are kept in two roll-up tables,
+# usage_hourly and usage_daily (one row per bucket and kind), so dashboard queries
+# read O(buckets x kinds) rows however large history grows. Runs are counted in
+# memory and merged into the roll-ups by the history writer thread on its next
+# flush (see history_writer.record_usage / db.add_usage).
+#
+# Kinds are the calculator ids used in history (e.g. "length"); module renders are
+# counted as "module:<name>".
+
+HOUR = 3600
+DAY = 86400
+
+class _Run:
+    def __init__(self):
+        self.failed = False
+
+    def error(self):
+        """Count this run as an error (for failures the page handles itself)."""
+        self.failed = True
+
+@contextmanager
+def track(kind):
+    """Time a calculator run; exceptions and run.error() count as errors."""
+    run = _Run()
+    start = time.perf_counter()
+    try:
+        yield run
+    except Exception:
+        run.failed = True
+        raise
+    finally:
+        record(kind, (time.perf_counter() - start) * 1000, error=run.failed)
+
+def record(kind, latency_ms, error=False):
+    """Count one run of kind."""
+    history_writer.record_usage(kind, latency_ms, error=error)
+    if metrics.ENABLED and not kind.startswith("module:"):  # pages are timed in views.render
+        metrics.observe("appaty_calc_seconds", latency_ms / 1000, kind=kind)
+        if error:
+            metrics.count("appaty_calc_errors_total", kind=kind)
+
+# --- Dashboard Queries ---
+
+def summary(since, until=None):
+    """Per-kind totals over [since, until) from the daily roll-up, busiest first."""
+    totals = db.get_usage_totals("day", since=since // DAY * DAY, until=until)
+    for row in totals:
+        row["error_rate"] = row["errors"] / row["calls"] if row["calls"] else 0.0
+        row["avg_ms"] = row["latency_ms_sum"] / row["calls"] if row["calls"] else 0.0
+    return sorted(totals, key=lambda r: r["calls"], reverse=True)
+
+def series(since, until=None):
+    """Calls per bucket and kind, hourly for ranges up to two days, daily beyond."""
+    span = (until or time.time()) - since
+    granularity, size = ("hour", HOUR) if span <= 2 * DAY else ("day", DAY)
+    return granularity, db.get_usage(granularity, since=since // size * size, until=until)
+
+# --- Backfill ---
+
+def backfill_from_history():
+    """
+    One-off roll-up of history written before usage tracking existed (calls only;
+    latency and errors were never recorded). Only buckets older than the first
+    tracked hour are filled, and it runs once per database. Returns rows rolled up.
+    """
+    with db.connection() as conn, conn:
+        # Claim the run first: a second replica racing us stops here.
+        claimed = conn.execute("INSERT INTO app_settings (key, value) VALUES (?, ?) ON CONFLICT (key) DO NOTHING",
+                               ("usage_backfilled", str(int(time.time())))).rowcount
+        if not claimed:
+            return 0
+        first = conn.execute("SELECT MIN(bucket) FROM usage_hourly").fetchone()[0]
+        until = first if first is not None else int(time.time()) // HOUR * HOUR
+        rows = conn.execute(
+            "SELECT ts / 3600 * 3600, COALESCE(kind, 'unknown'), COUNT(*) FROM history WHERE ts < ? "
+            "GROUP BY ts / 3600 * 3600, COALESCE(kind, 'unknown')", (until,)
+        ).fetchall()
+        db.add_usage([(bucket, kind, calls, 0, 0.0, 0.0) for bucket, kind, calls in rows], conn=conn)
+    return sum(r[2] for r in rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Usage roll-up maintenance.")
+    parser.add_argument("--backfill", action="store_true", help="roll up history written before tracking began")
+    args = parser.parse_args()
+    db.init_db()
+    if args.backfill:
+        print(f"Rolled up {backfill_from_history()} history rows.")
@@ -1,57 +1,122 @@
+import json
+import os
 import streamlit as st
-import hashlib
-from utils import db
+import streamlit.components.v1 as components
+from utils import db, passwords, ratelimit, sessions
+
+# Usernames allowed on admin pages, e.g. APPATY_ADMINS="alice,bob".
+ADMINS = {name.strip().lower() for name in os.environ.get("APPATY_ADMINS", "").split(",") if name.strip()}
+
+_HANDOFF_SCRIPT = """
+<script>
+const page = window.parent;
+page.fetch(new URL("auth/session", page.document.baseURI).href,
+           {method: "POST", body: %s, credentials: "same-origin"}).catch(() => {});
+</script>
+"""
 
 def init_session():
     """Initialize session state variables (Required by app.py)."""
     if 'user' not in st.session_state:
         st.session_state.user = None
+        st.session_state.session_token = None
+        # Old links and bookmarks may still carry a token as ?sid=; drop it unused.
+        if "sid" in st.query_params:
+            del st.query_params["sid"]
+        # Reload: the session cookie restores the login without a password check.
+        token = st.context.cookies.get(sessions.COOKIE_NAME)
+        if isinstance(token, str) and token:  # AppTest has no real request (a mock, not a str)
+            user = sessions.restore(token)
+            if user:
+                st.session_state.user = user
+                st.session_state.session_token = token
+            else:
+                _set_cookie(None)
     if 'history' not in st.session_state:
         st.session_state.history = []
 
+def _set_cookie(token, max_age=None):
+    """Have the browser set (or, with None, clear) the session cookie on the next render."""
+    if sessions.COOKIE_ROUTE:
+        st.session_state._cookie_handoff = sessions.handoff(token, max_age)
+
+def _send_cookie_handoff():
+    # Rendered on the run after login/logout, since those end with st.rerun().
+    nonce = st.session_state.pop("_cookie_handoff", None)
+    if nonce:
+        components.html(_HANDOFF_SCRIPT % json.dumps(nonce), height=0, width=0)
+
+def is_admin(user):
+    return bool(user) and user['username'] in ADMINS
+
 def make_hashes(password):
-    return hashlib.sha256(str.encode(password)).hexdigest()
+    return passwords.hash_password(password)
 
 def check_hashes(password, hashed_text):
-    return make_hashes(password) == hashed_text
+    return passwords.verify_password(password, hashed_text)[0]
+
+def _client_ip():
+    return getattr(st.context, "ip_address", None)
+
+def _attempt_login(username, password):
+    """Rate-limited credential check. Returns (user, error message)."""
+    wait = ratelimit.acquire(f"user:{username}", f"ip:{_client_ip()}" if _client_ip() else None)
+    if wait:
+        return None, f"Too many login attempts. Try again in {wait:.0f}s."
+
+    user_data = db.get_user(username)
+    if not user_data:
+        return None, "User not found"
+
+    try:
+        with st.spinner("Checking credentials..."):
+            ok, upgraded = passwords.verify_password(password, user_data['password'])
+    except passwords.Busy:
+        return None, "Login service is busy, please try again in a moment."
+    if not ok:
+        return None, "Invalid password"
+
+    # Stored hash used older KDF settings (or legacy SHA-256): replace it now.
+    if upgraded:
+        db.update_password(user_data['id'], upgraded)
+        user_data['password'] = upgraded
+    return user_data, None
+
+def _logout():
+    token = st.session_state.get('session_token')
+    if token:
+        sessions.revoke(token)
+    _set_cookie(None)
+    st.session_state.user = None
+    st.session_state.session_token = None
 
 def render_auth_sidebar():
-    db.init_db()
     if 'user' not in st.session_state:
         st.session_state.user = None
+    _send_cookie_handoff()
 
     if st.session_state.user is None:
         menu = ["Login", "Sign Up"]
         choice = st.sidebar.selectbox("Account Access", menu)
 
         if choice == "Login":
-            # Retrieve saved user
-            saved_user = st.query_params.get("remembered_user", "")
-            
-            username = st.sidebar.text_input("Username", value=saved_user).lower().strip()
+            username = st.sidebar.text_input("Username").lower().strip()
             password = st.sidebar.text_input("Password", type='password')
             
             remember_me = st.sidebar.checkbox("Remember Me")
             
             if st.sidebar.button("Login"):
-                user_data = db.get_user(username)
-                if not user_data.empty:
-                    stored_pw = user_data.iloc[0]['password']
-                    if check_hashes(password, stored_pw):
-                        # Handle Remember Me Logic
-                        if remember_me:
-                            st.query_params["remembered_user"] = username
-                        else:
-                            st.query_params.clear()
-                            
-                        # Convert DataFrame row to dict for session state
-                        st.session_state.user = user_data.iloc[0].to_dict()
-                        st.sidebar.success(f"Welcome {username}")
-                        st.rerun()
-                    else:
-                        st.sidebar.error("Invalid password")
+                user_data, error = _attempt_login(username, password)
+                if user_data:
+                    # Remember Me only changes how long the session token stays valid.
+                    token = sessions.create(user_data['id'], remember=remember_me)
+                    _set_cookie(token, sessions.REMEMBER_TTL_S if remember_me else None)
+                    st.session_state.session_token = token
+                    st.session_state.user = user_data
+                    st.sidebar.success(f"Welcome {username}")
+                    st.rerun()
                 else:
-                    st.sidebar.error("User not found")
+                    st.sidebar.error(error)
 
         else: # Sign Up
             new_user = st.sidebar.text_input("Username").lower().strip()
@@ -62,14 +127,20 @@ def render_auth_sidebar():
                 if new_user and new_pw:
                     if new_pw != confirm_pw:
                         st.sidebar.error("Passwords do not match!")
+                    elif ratelimit.acquire(f"signup:{_client_ip()}" if _client_ip() else None):
+                        st.sidebar.error("Too many sign-ups from this address. Please wait a minute.")
                     else:
-                        hashed_pw = make_hashes(new_pw)
-                        success, msg = db.add_user(new_user, hashed_pw)
-                        if success:
-                            st.sidebar.success(msg)
-                            st.sidebar.info("Success! Please switch to the 'Login' tab to enter.")
+                        try:
+                            hashed_pw = make_hashes(new_pw)
+                        except passwords.Busy:
+                            st.sidebar.error("Sign-up service is busy, please try again in a moment.")
                         else:
-                            st.sidebar.error(msg)
+                            success, msg = db.add_user(new_user, hashed_pw)
+                            if success:
+                                st.sidebar.success(msg)
+                                st.sidebar.info("Success! Please switch to the 'Login' tab to enter.")
+                            else:
+                                st.sidebar.error(msg)
                 else:
                    st.sidebar.warning("Please fill all fields.")
 
@@ -87,6 +158,14 @@ def render_auth_sidebar():
              st.sidebar.info("Social Login integration is coming soon in the production version!")
 
     else:
+        # Re-check the session (LRU hit on most reruns) so revoked or expired sessions end here,
+        # and refresh the user from the user cache so premium changes show up.
+        token = st.session_state.get('session_token')
+        user = sessions.restore(token) if token else db.get_user_by_id(st.session_state.user['id'])
+        if user is None:
+            _logout()
+            st.rerun()
+        st.session_state.user = user
         st.sidebar.write(f"Logged in as: **{st.session_state.user['username']}**")
         
         # Premium Badge
@@ -94,5 +173,5 @@ def render_auth_sidebar():
              st.sidebar.success("🌟 Premium Logic Active")
         
         if st.sidebar.button("Logout"):
-            st.session_state.user = None
+            _logout()
             st.rerun()
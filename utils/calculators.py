@@ -1,3 +1,60 @@
+from utils import metrics
+
+# --- Conversion Tables ---
+# Factors to a base unit per quantity. The same tables drive the server-side convert_*
+# functions and the in-browser converter (utils/converter.py), so both agree.
+
+HP_PER_KW = 1.34102
+LBS_PER_KG = 2.20462
+
+LENGTH_TO_M = {
+    "m": 1.0, "cm": 0.01, "mm": 0.001,
+    "in": 0.0254, "ft": 0.3048, "km": 1000.0, "mi": 1609.344
+}
+AREA_TO_M2 = {
+    "m²": 1.0, "mm²": 0.000001,
+    "ft²": 0.09290304,
+    "cm²": 0.0001,
+    "in²": 0.00064516,
+    "acre": 4046.856
+}
+VOLUME_TO_M3 = {
+    "m³": 1.0,
+    "L": 0.001,
+    "Gal": 0.00378541,
+    "ft³": 0.0283168,
+    "in³": 0.000016387
+}
+FORCE_TO_N = {"N": 1.0, "kN": 1000.0, "lbf": 4.44822}
+PRESSURE_TO_PA = {"Pa": 1.0, "Bar": 100000.0, "Psi": 6894.76}
+# Units per bar, as used by the Pressure page converter.
+PRESSURE_PER_BAR = {"Bar": 1.0, "PSI": 14.5038, "kPa": 100.0, "MPa": 0.1, "atm": 0.9869}
+# (scale, offset) to °C: T_C = T * scale + offset
+TEMPERATURE_TO_C = {
+    "Celsius (°C)": (1.0, 0.0),
+    "Kelvin (K)": (1.0, -273.15),
+    "Fahrenheit (°F)": (5 / 9, -32 * 5 / 9),
+}
+
+# Quantity -> {unit: (scale, offset)} with base = value * scale + offset.
+CONVERSIONS = {
+    "length": {u: (f, 0.0) for u, f in LENGTH_TO_M.items()},
+    "area": {u: (f, 0.0) for u, f in AREA_TO_M2.items()},
+    "volume": {u: (f, 0.0) for u, f in VOLUME_TO_M3.items()},
+    "power": {"kW": (1.0, 0.0), "HP": (1 / HP_PER_KW, 0.0)},
+    "pressure": {u: (1 / f, 0.0) for u, f in PRESSURE_PER_BAR.items()},
+    "temperature": TEMPERATURE_TO_C,
+}
+
+@metrics.timed("appaty_convert_seconds")
+def convert(quantity, value, from_unit, to_unit):
+    """Convert value between two units of a quantity in CONVERSIONS."""
+    table = CONVERSIONS[quantity]
+    if from_unit not in table or to_unit not in table: return None
+    if from_unit == to_unit: return value
+    scale, offset = table[from_unit]
+    to_scale, to_offset = table[to_unit]
+    return (value * scale + offset - to_offset) / to_scale
 
 def convert_power(value, conversion_type):
     """
@@ -5,67 +62,47 @@ def convert_power(value, conversion_type):
     conversion_type: 'kW to HP' or 'HP to kW'
     """
     if conversion_type == 'kW to HP':
-        return value * 1.34102
+        return value * HP_PER_KW
     elif conversion_type == 'HP to kW':
-        return value / 1.34102
+        return value / HP_PER_KW
     return None
 
 def convert_length(value, from_unit, to_unit):
     """Convert length between metric and imperial units."""
     # Base unit: meters
-    to_meters = {
-        "m": 1.0, "cm": 0.01, "mm": 0.001, 
-        "in": 0.0254, "ft": 0.3048, "km": 1000.0, "mi": 1609.344
-    }
-    if from_unit not in to_meters or to_unit not in to_meters: return None
-    meters = value * to_meters[from_unit]
-    return meters / to_meters[to_unit]
+    if from_unit not in LENGTH_TO_M or to_unit not in LENGTH_TO_M: return None
+    meters = value * LENGTH_TO_M[from_unit]
+    return meters / LENGTH_TO_M[to_unit]
 
 def convert_area(value, from_unit, to_unit):
     """Convert area (m^2, ft^2, etc). Base: m^2"""
-    to_sq_m = {
-        "m²": 1.0, "mm²": 0.000001, 
-        "ft²": 0.09290304,
-        "cm²": 0.0001,
-        "in²": 0.00064516,
-        "acre": 4046.856
-    }
-    if from_unit not in to_sq_m or to_unit not in to_sq_m: return None
-    sq_m = value * to_sq_m[from_unit]
-    return sq_m / to_sq_m[to_unit]
+    if from_unit not in AREA_TO_M2 or to_unit not in AREA_TO_M2: return None
+    sq_m = value * AREA_TO_M2[from_unit]
+    return sq_m / AREA_TO_M2[to_unit]
 
 def convert_volume(value, from_unit, to_unit):
     """Convert volume (m^3, L, Gal). Base: m^3"""
-    to_cu_m = {
-        "m³": 1.0,
-        "L": 0.001,
-        "Gal": 0.00378541,
-        "ft³": 0.0283168,
-        "in³": 0.000016387
-    }
-    if from_unit not in to_cu_m or to_unit not in to_cu_m: return None
-    cu_m = value * to_cu_m[from_unit]
-    return cu_m / to_cu_m[to_unit]
+    if from_unit not in VOLUME_TO_M3 or to_unit not in VOLUME_TO_M3: return None
+    cu_m = value * VOLUME_TO_M3[from_unit]
+    return cu_m / VOLUME_TO_M3[to_unit]
 
 def convert_mass(value, from_unit, to_unit):
     """Convert mass between kg and lbs."""
-    if from_unit == "kg" and to_unit == "lbs": return value * 2.20462
-    elif from_unit == "lbs" and to_unit == "kg": return value / 2.20462
+    if from_unit == "kg" and to_unit == "lbs": return value * LBS_PER_KG
+    elif from_unit == "lbs" and to_unit == "kg": return value / LBS_PER_KG
     return value if from_unit == to_unit else None
 
 def convert_force(value, from_unit, to_unit):
     """Convert Force (N, kN, lbf)"""
-    to_newton = { "N": 1.0, "kN": 1000.0, "lbf": 4.44822 }
-    if from_unit not in to_newton or to_unit not in to_newton: return None
-    n_val = value * to_newton[from_unit]
-    return n_val / to_newton[to_unit]
+    if from_unit not in FORCE_TO_N or to_unit not in FORCE_TO_N: return None
+    n_val = value * FORCE_TO_N[from_unit]
+    return n_val / FORCE_TO_N[to_unit]
 
 def convert_pressure(value, from_unit, to_unit):
     """Convert Pressure (Pa, Bar, Psi)"""
-    to_pa = { "Pa": 1.0, "Bar": 100000.0, "Psi": 6894.76 }
-    if from_unit not in to_pa or to_unit not in to_pa: return None
-    p_val = value * to_pa[from_unit]
-    return p_val / to_pa[to_unit]
+    if from_unit not in PRESSURE_TO_PA or to_unit not in PRESSURE_TO_PA: return None
+    p_val = value * PRESSURE_TO_PA[from_unit]
+    return p_val / PRESSURE_TO_PA[to_unit]
 
 def convert_temperature(value, from_unit, to_unit):
     """
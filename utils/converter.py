@@ -0,0 +1,46 @@
+import json
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+from utils import calculators as calc
+
+# --- In-Browser Unit Converter ---
+# A custom component (static/converter/index.html) that receives the factor table of one
+# quantity from utils/calculators.py and converts as the user types, without a rerun.
+# Only the Save button sends a value back, so typing costs the server nothing. The
+# saved result is recomputed here from the same table rather than taken from the
+# browser.
+
+_component = components.declare_component(
+    "unit_converter",
+    path=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "converter"),
+)
+
+def unit_converter(quantity, key, from_unit=None, to_unit=None, value=0.0, formulas=None):
+    """
+    Render the converter for a quantity in calculators.CONVERSIONS.
+    formulas: optional {(from_unit, to_unit): text} shown under the result.
+    Returns {"value", "from", "to", "result"} on the rerun caused by a Save, else None.
+    """
+    table = calc.CONVERSIONS[quantity]
+    # Dicts are sent as JSON text: Streamlit checks dict arguments for dataframes, which
+    # imports pandas (hundreds of ms on a cold replica) on the first page a user opens.
+    saved = _component(
+        table=json.dumps({unit: list(factors) for unit, factors in table.items()}),
+        from_unit=from_unit, to_unit=to_unit, value=value,
+        formulas=json.dumps({f"{a}|{b}": text for (a, b), text in (formulas or {}).items()}),
+        key=key, default=None,
+    )
+    # The component keeps returning its last value on later reruns; act on each save once.
+    seen_key = f"_{key}_saved"
+    if not saved or saved.get("save") == st.session_state.get(seen_key):
+        return None
+    st.session_state[seen_key] = saved.get("save")
+    try:
+        val = float(saved["value"])
+        result = calc.convert(quantity, val, saved["from"], saved["to"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if result is None:
+        return None
+    return {"value": val, "from": saved["from"], "to": saved["to"], "result": result}
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from utils import migrations
+
+# Postgres storage backend, for running several replicas against one database.
+# Optional dependency: pip install "psycopg[binary]" psycopg_pool
+try:
+    import psycopg
+    from psycopg_pool import ConnectionPool
+    IntegrityError = psycopg.IntegrityError
+    OperationalError = psycopg.OperationalError  # includes psycopg_pool.PoolTimeout
+except ImportError:
+    psycopg = None
+
+    class IntegrityError(Exception):
+        pass
+
+    class OperationalError(Exception):
+        pass
+
+NAME = "postgres"
+POOL_TIMEOUT_S = 5.0
+
+_pool = None
+_pool_size = 0
+
+def _sql(query):
+    # The shared query layer in utils/db.py is written with sqlite's "?" placeholders.
+    return query.replace("?", "%s")
+
+class _Connection:
+    """Adapts a pooled psycopg connection to the sqlite3-style calls used by utils/db.py."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def execute(self, query, params=()):
+        return self.raw.execute(_sql(query), params or None)
+
+    def executemany(self, query, seq):
+        with self.raw.cursor() as cur:
+            cur.executemany(_sql(query), seq)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    @property
+    def in_transaction(self):
+        return self.raw.info.transaction_status != psycopg.pq.TransactionStatus.IDLE
+
+    # `with conn:` commits or rolls back, like sqlite3.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+def configure(url, pool_size=5):
+    global _pool, _pool_size
+    if psycopg is None:
+        raise ImportError('The Postgres backend needs: pip install "psycopg[binary]" psycopg_pool')
+    close_pool()
+    _pool_size = pool_size
+    _pool = ConnectionPool(url, min_size=1, max_size=pool_size, timeout=POOL_TIMEOUT_S, open=True)
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for the duration of a `with` block."""
+    with _pool.connection() as raw:
+        yield _Connection(raw)
+
+def pool_stats():
+    stats = _pool.get_stats()
+    opened = stats.get("pool_size", 0)
+    return {
+        "created": opened,
+        "in_use": opened - stats.get("pool_available", 0),
+        "waits": stats.get("requests_queued", 0),
+        "size": _pool_size,
+    }
+
+def close_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def migrate():
+    with connection() as conn:
+        return migrations.migrate_postgres(conn)
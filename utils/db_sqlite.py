@@ -0,0 +1,137 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from utils import migrations
+
+# SQLite storage backend (default). See utils/db.py for the shared query layer.
+
+NAME = "sqlite"
+IntegrityError = sqlite3.IntegrityError
+OperationalError = sqlite3.OperationalError
+
+# --- Connection Pool ---
+# Streamlit runs every rerun in a fresh script thread, so per-thread connections
+# would leak. Instead we keep a small process-wide pool of long-lived connections
+# that any thread can borrow. Long-lived connections also keep sqlite3's
+# per-connection statement cache warm, so repeated queries skip re-preparing.
+# configure() starts a new pool generation: connections still borrowed from the old
+# database are closed when they come back instead of rejoining the pool.
+
+DB_PATH = "appaty.db"
+POOL_SIZE = 5
+BUSY_TIMEOUT_MS = int(os.environ.get("APPATY_DB_BUSY_TIMEOUT_MS", "5000"))
+CACHED_STATEMENTS = 128
+
+_pool = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_pool_stats = {"created": 0, "in_use": 0, "waits": 0}
+_generation = 0
+_borrowed = {}  # borrowed connection -> pool generation it was opened in
+
+def _connect():
+    """Open a connection tuned for concurrent access (WAL + busy timeout)."""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=CACHED_STATEMENTS,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    # Case-sensitive LIKE, as on Postgres; it also lets prefix LIKEs use idx_history_user_calc.
+    conn.execute("PRAGMA case_sensitive_like=ON")
+    return conn
+
+def _acquire():
+    with _pool_lock:
+        pool, generation = _pool, _generation
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            can_open = _pool_stats["created"] < POOL_SIZE
+            if can_open:
+                _pool_stats["created"] += 1
+        if can_open:
+            try:
+                conn = _connect()
+            except Exception:
+                with _pool_lock:
+                    _pool_stats["created"] -= 1
+                raise
+        else:
+            with _pool_lock:
+                _pool_stats["waits"] += 1
+            try:
+                conn = pool.get(timeout=BUSY_TIMEOUT_MS / 1000)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    f"connection pool exhausted: all {POOL_SIZE} connections stayed in use for {BUSY_TIMEOUT_MS} ms"
+                ) from None
+    with _pool_lock:
+        _pool_stats["in_use"] += 1
+        _borrowed[conn] = generation
+    return conn
+
+def _release(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    with _pool_lock:
+        stale = _borrowed.pop(conn) != _generation
+        if not stale:
+            _pool_stats["in_use"] -= 1
+            _pool.put(conn)
+    if stale:
+        # Borrowed before configure(): it belongs to the old database, so close it instead.
+        conn.close()
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for the duration of a `with` block."""
+    conn = _acquire()
+    try:
+        yield conn
+    finally:
+        _release(conn)
+
+def pool_stats():
+    """Snapshot of pool usage (opened connections, borrowed, waits for a free one)."""
+    with _pool_lock:
+        return dict(_pool_stats, size=POOL_SIZE)
+
+def close_pool():
+    """Close every idle pooled connection (used at shutdown and by benchmarks)."""
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+        with _pool_lock:
+            _pool_stats["created"] -= 1
+
+def configure(path, pool_size=None):
+    """
+    Point the backend at a database file. Idle pooled connections are closed now,
+    borrowed ones when they are released.
+    """
+    global DB_PATH, POOL_SIZE, _pool, _generation
+    with _pool_lock:
+        idle, _pool = _pool, queue.LifoQueue()
+        _generation += 1
+        _pool_stats.update(created=0, in_use=0, waits=0)
+        DB_PATH = path
+        if pool_size:
+            POOL_SIZE = pool_size
+    while True:
+        try:
+            idle.get_nowait().close()
+        except queue.Empty:
+            break
+
+def migrate():
+    with connection() as conn:
+        return migrations.migrate(conn, lock_path=DB_PATH + ".migrate.lock")
@@ -0,0 +1,238 @@
+import hashlib
+import importlib.util
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from utils import db, formulas, jobs
+
+# --- Rich History Exports ---
+# Parquet (analytics), XLSX (clients) and a PDF calculation report, rendered on the
+# job pool (utils/jobs.py) from chunked history reads, so a rerun only submits and polls.
+# Finished files are cached under EXPORT_DIR by (user, filters, format, history extent):
+# the extent (row count, highest id) changes when rows are added or archived, so an
+# unchanged range is served from disk and a changed one gets a fresh file.
+#
+# Optional dependencies, one per format:
+#   pip install pyarrow      (parquet)
+#   pip install openpyxl     (xlsx)
+#   pip install matplotlib   (pdf; formulas are typeset with its mathtext engine)
+
+EXPORT_DIR = os.environ.get("APPATY_EXPORT_DIR", "exports")
+EXPORT_TTL_S = int(os.environ.get("APPATY_EXPORT_TTL_H", "24")) * 3600
+CHUNK_ROWS = 5000
+PDF_MAX_ROWS = 2000
+PDF_ROWS_PER_PAGE = 45
+PURGE_EVERY_S = 3600
+
+FORMATS = {
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet", "pyarrow"),
+    "xlsx": ("Excel (XLSX)", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "openpyxl"),
+    "pdf": ("PDF report", ".pdf", "application/pdf", "matplotlib"),
+}
+
+# Calculator kind -> reference formula from utils/formulas.py, shown in the PDF report.
+KIND_FORMULAS = {
+    "heat_transfer": ("Heat Transfer", formulas.MECHANICAL_FORMULAS["Heat Transfer"]),
+    "pressure": ("Pressure", formulas.CIVIL_FORMULAS["Pressure"]),
+    "ohm": ("Ohm's Law", formulas.ELECTRICAL_FORMULAS["Ohm's Law"]),
+    "appliance_cost": ("Power (DC)", formulas.ELECTRICAL_FORMULAS["Power (DC)"]),
+}
+
+COLUMNS = ["id", "time", "calc_name", "result", "kind", "value", "unit"]
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+def available_formats():
+    """Formats whose optional dependency is installed."""
+    return [fmt for fmt, spec in FORMATS.items() if importlib.util.find_spec(spec[3]) is not None]
+
+def label(fmt):
+    return FORMATS[fmt][0]
+
+def mime(fmt):
+    return FORMATS[fmt][2]
+
+def _artifact(user_id, fmt, calc_name, since, until):
+    extent = db.get_history_extent(user_id, calc_name=calc_name, since=since, until=until)
+    key = ("export", user_id, fmt, calc_name, since, until) + extent
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:24]
+    return key, os.path.join(EXPORT_DIR, str(user_id), digest + FORMATS[fmt][1]), extent[0]
+
+def start_export(user_id, fmt, calc_name=None, since=None, until=None):
+    """Submit (or reuse) the export job for this range and format. Returns the job id."""
+    _maybe_purge()
+    key, path, total = _artifact(user_id, fmt, calc_name, since, until)
+    job = jobs.find(key)
+    if job and job["status"] == jobs.DONE and not os.path.exists(path):
+        jobs.forget(key)  # cached file was purged; render it again
+    filters = dict(calc_name=calc_name, since=since, until=until)
+    return jobs.submit(key, _render, fmt, user_id, filters, path, total, owner=user_id)
+
+def read_artifact(path):
+    """Bytes of a finished export (deferred download callback)."""
+    with open(path, "rb") as fh:
+        return fh.read()
+
+def _render(progress, fmt, user_id, filters, path, total):
+    progress(0, total)
+    if os.path.exists(path):  # rendered by an earlier process
+        progress(total, total)
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.part"
+    rows = db.iter_history(user_id, chunk_size=CHUNK_ROWS, **filters)
+    try:
+        _WRITERS[fmt](rows, tmp, progress, total, user_id, filters)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    progress(total, total)
+    return path
+
+def _chunks(rows, progress, total):
+    chunk, done = [], 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_ROWS:
+            yield chunk
+            done += len(chunk)
+            progress(done, total)
+            chunk = []
+    if chunk:
+        yield chunk
+
+# --- Writers ---
+
+def _write_parquet(rows, path, progress, total, user_id, filters):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("time", pa.timestamp("s", tz="UTC")), ("calc_name", pa.string()),
+        ("result", pa.string()), ("kind", pa.string()), ("value", pa.float64()), ("unit", pa.string()),
+    ])
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in _chunks(rows, progress, total):
+            batch = {
+                "id": [r["id"] for r in chunk],
+                "time": [r["ts"] for r in chunk],
+                "calc_name": [r["calc_name"] for r in chunk],
+                "result": [r["result"] for r in chunk],
+                "kind": [r["kind"] for r in chunk],
+                "value": [r["value"] for r in chunk],
+                "unit": [r["unit"] for r in chunk],
+            }
+            writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+
+def _write_xlsx(rows, path, progress, total, user_id, filters):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    # write_only streams rows to disk instead of building the sheet in memory.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("History")
+    ws.freeze_panes = "A2"
+    header = []
+    for name in COLUMNS:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+    for chunk in _chunks(rows, progress, total):
+        for r in chunk:
+            ws.append([r["id"], datetime.fromtimestamp(r["ts"]), r["calc_name"], r["result"],
+                       r["kind"], r["value"], r["unit"]])
+    wb.save(path)
+
+def _write_pdf(rows, path, progress, total, user_id, filters):
+    # Plain Figure objects, not pyplot: its global figure registry is not thread-safe.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    def new_page():
+        fig = Figure(figsize=(8.27, 11.69))  # A4 portrait
+        fig.text(0.08, 0.96, "APPATY Calculation Report", fontsize=9, color="#666")
+        return fig
+
+    kinds = set()
+    shown = 0
+    with PdfPages(path) as pdf:
+        fig = new_page()
+        fig.text(0.08, 0.85, "APPATY Calculation Report", fontsize=22, weight="bold")
+        user = db.get_user_by_id(user_id)
+        lines = [
+            f"User: {user['username'] if user else user_id}",
+            f"Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}",
+            f"Calculations: {total:,}",
+        ]
+        if filters.get("calc_name"):
+            lines.append(f"Calculation filter: {filters['calc_name']}*")
+        if filters.get("since") is not None or filters.get("until") is not None:
+            lo = datetime.fromtimestamp(filters["since"]).strftime("%Y-%m-%d") if filters.get("since") else "start"
+            hi = datetime.fromtimestamp(filters["until"] - 1).strftime("%Y-%m-%d") if filters.get("until") else "now"
+            lines.append(f"Range: {lo} to {hi}")
+        if total > PDF_MAX_ROWS:
+            lines.append(f"Showing the newest {PDF_MAX_ROWS:,}; use XLSX or Parquet for the full range.")
+        for i, line in enumerate(lines):
+            fig.text(0.08, 0.78 - i * 0.03, line, fontsize=11)
+        pdf.savefig(fig)
+
+        for chunk in _chunks(rows, progress, min(total, PDF_MAX_ROWS)):
+            chunk = chunk[:PDF_MAX_ROWS - shown]
+            kinds.update(r["kind"] for r in chunk if r["kind"])
+            for start in range(0, len(chunk), PDF_ROWS_PER_PAGE):
+                page = chunk[start:start + PDF_ROWS_PER_PAGE]
+                fig = new_page()
+                for i, r in enumerate(page):
+                    y = 0.92 - i * 0.019
+                    fig.text(0.06, y, datetime.fromtimestamp(r["ts"]).strftime("%Y-%m-%d %H:%M"),
+                             fontsize=7.5, family="monospace")
+                    fig.text(0.25, y, r["calc_name"][:34], fontsize=7.5)
+                    fig.text(0.55, y, str(r["result"])[:60], fontsize=7.5, family="monospace")
+                pdf.savefig(fig)
+                shown += len(page)
+            if shown >= PDF_MAX_ROWS:
+                break
+
+        used = [KIND_FORMULAS[k] for k in sorted(kinds) if k in KIND_FORMULAS]
+        if used:
+            fig = new_page()
+            fig.text(0.08, 0.9, "Formulas used", fontsize=16, weight="bold")
+            for i, (name, tex) in enumerate(used):
+                fig.text(0.08, 0.82 - i * 0.08, name, fontsize=11)
+                fig.text(0.4, 0.82 - i * 0.08, f"${tex}$", fontsize=15)
+            pdf.savefig(fig)
+
+_WRITERS = {"parquet": _write_parquet, "xlsx": _write_xlsx, "pdf": _write_pdf}
+
+# --- Cache Cleanup ---
+
+def purge_stale(max_age_s=None, now=None):
+    """Delete cached exports older than max_age_s (default EXPORT_TTL_S). Returns the number removed."""
+    max_age_s = EXPORT_TTL_S if max_age_s is None else max_age_s
+    cutoff = (now or time.time()) - max_age_s
+    removed = 0
+    if not os.path.isdir(EXPORT_DIR):
+        return 0
+    for user_dir in os.scandir(EXPORT_DIR):
+        if not user_dir.is_dir():
+            continue
+        for entry in os.scandir(user_dir.path):
+            if entry.name.endswith(".part"):
+                continue
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+def _maybe_purge():
+    global _last_purge
+    with _purge_lock:
+        if time.time() - _last_purge < PURGE_EVERY_S:
+            return
+        _last_purge = time.time()
+    purge_stale()
@@ -0,0 +1,51 @@
+# --- History Payload Codec ---
+# Compact JSON for the inputs and solution set of a calculation, so a history row
+# can be re-rendered (or re-run) without parsing display strings or re-solving.
+#
+#   None / bool / int / float / str  -> as-is
+#   list / tuple                     -> JSON array
+#   dict with str keys               -> JSON object
+#   dict with other keys             -> {"d": [[key, value], ...]}   (e.g. {x: 2})
+#   SymPy expression                 -> {"e": "sqrt(2)*I"}           (sympify round-trips it)
+#
+# SymPy is only imported when decoding an expression.
+
+import json
+
+def _encode(obj):
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj):
+            return {k: _encode(v) for k, v in obj.items()}
+        return {"d": [[_encode(k), _encode(v)] for k, v in obj.items()]}
+    if hasattr(obj, "free_symbols"):  # SymPy Basic, without importing SymPy here
+        return {"e": str(obj)}
+    return str(obj)
+
+def _decode(obj):
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    if isinstance(obj, dict):
+        if set(obj) == {"e"}:
+            import sympy as sp
+            return sp.sympify(obj["e"])
+        if set(obj) == {"d"}:
+            return {_decode(k): _decode(v) for k, v in obj["d"]}
+        return {k: _decode(v) for k, v in obj.items()}
+    return obj
+
+def encode_payload(inputs=None, solution=None):
+    """Serialize a calculation's inputs and solution set. Returns None when both are empty."""
+    if inputs is None and solution is None:
+        return None
+    return json.dumps({"inputs": _encode(inputs), "solution": _encode(solution)}, separators=(",", ":"))
+
+def decode_payload(payload):
+    """Inverse of encode_payload: returns (inputs, solution) with SymPy objects restored."""
+    if not payload:
+        return None, None
+    data = json.loads(payload)
+    return _decode(data.get("inputs")), _decode(data.get("solution"))
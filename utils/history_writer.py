@@ -0,0 +1,252 @@
+import atexit
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from utils import db, history_codec
+
+# --- Write-Behind History Queue ---
+# save_log() only appends to an in-memory queue; a background thread drains it in
+# batched transactions every FLUSH_INTERVAL_MS or as soon as FLUSH_BATCH_SIZE items
+# are waiting. Items leave the queue only after their transaction commits, so a
+# failed flush is retried (at-least-once), and the queue is drained at exit.
+# A batch the database rejects (bad data rather than a busy or unreachable database)
+# is retried one row at a time so the other rows still go in; a row that is rejected
+# MAX_ATTEMPTS times is dropped and logged instead of blocking the queue for good.
+# A repeat of a user's previous entry within COALESCE_WINDOW_S (a double-click or a
+# rerun) is dropped; the last entries are kept for at most COALESCE_USERS users.
+
+FLUSH_INTERVAL_MS = int(os.environ.get("APPATY_HISTORY_FLUSH_MS", "250"))
+FLUSH_BATCH_SIZE = int(os.environ.get("APPATY_HISTORY_BATCH_SIZE", "100"))
+COALESCE_WINDOW_S = float(os.environ.get("APPATY_HISTORY_COALESCE_S", "5"))
+COALESCE_USERS = 4096
+MAX_ATTEMPTS = 5
+
+log = logging.getLogger(__name__)
+
+_queue = deque()
+_cond = threading.Condition()
+_flush_lock = threading.Lock()  # one flusher at a time so a batch is never written twice
+_last_by_user = OrderedDict()  # user_id -> ((calc_name, result), monotonic time) of the most recent entry
+_attempts = {}  # id(queued entry) -> times it was rejected on its own
+_usage = {}  # (hour bucket, kind) -> [calls, errors, latency_ms_sum, latency_ms_max]; see utils/analytics.py
+_worker = None
+_stopping = False
+
+_stats = {
+    "enqueued": 0,
+    "coalesced": 0,
+    "flushed": 0,
+    "batches": 0,
+    "failures": 0,
+    "dropped": 0,
+    "last_flush_ms": 0.0,
+    "max_flush_ms": 0.0,
+    "total_flush_ms": 0.0,
+}
+
+def enqueue(user_id, calc_name, result, kind=None, value=None, unit=None, inputs=None, solution=None):
+    """
+    Queue a history entry. A repeat of the user's previous entry within COALESCE_WINDOW_S is dropped.
+    inputs / solution are encoded on the writer thread, not in the caller's rerun.
+    """
+    key = (calc_name, str(result))
+    now = time.monotonic()
+    with _cond:
+        last = _last_by_user.get(user_id)
+        if last is not None and last[0] == key and now - last[1] <= COALESCE_WINDOW_S:
+            _stats["coalesced"] += 1
+            return False
+        _last_by_user[user_id] = (key, now)
+        _last_by_user.move_to_end(user_id)
+        while len(_last_by_user) > COALESCE_USERS:
+            _last_by_user.popitem(last=False)
+        _queue.append((user_id, calc_name, key[1], int(time.time()), kind, value, unit, inputs, solution))
+        _stats["enqueued"] += 1
+        if len(_queue) >= FLUSH_BATCH_SIZE:
+            _cond.notify()
+    _ensure_worker()
+    return True
+
+def record_usage(kind, latency_ms, error=False):
+    """Count one calculator run; merged into the usage roll-ups on the next flush."""
+    bucket = int(time.time()) // 3600 * 3600
+    with _cond:
+        agg = _usage.setdefault((bucket, kind), [0, 0, 0.0, 0.0])
+        agg[0] += 1
+        agg[1] += 1 if error else 0
+        agg[2] += latency_ms
+        agg[3] = max(agg[3], latency_ms)
+    _ensure_worker()
+
+def flush():
+    """Write everything queued so far. Returns the number of history rows committed."""
+    with _flush_lock:
+        written = _drain()
+        _drain_usage()
+        return written
+
+def flush_user(user_id):
+    """Write only this user's queued history rows (for pages that read them back). Returns the number committed."""
+    with _flush_lock:
+        with _cond:
+            batch = [e for e in _queue if e[0] == user_id]
+        return _commit(batch)[0] if batch else 0
+
+def flush_usage():
+    """Merge the pending usage counters into the roll-ups, without touching queued history rows."""
+    with _flush_lock:
+        _drain_usage()
+
+def _drain_usage():
+    global _usage
+    with _cond:
+        pending, _usage = _usage, {}
+    if not pending:
+        return
+    try:
+        db.add_usage([key + tuple(agg) for key, agg in pending.items()])
+    except Exception:
+        # Put the deltas back so the next flush retries them.
+        with _cond:
+            for key, agg in pending.items():
+                cur = _usage.setdefault(key, [0, 0, 0.0, 0.0])
+                cur[0] += agg[0]
+                cur[1] += agg[1]
+                cur[2] += agg[2]
+                cur[3] = max(cur[3], agg[3])
+            _stats["failures"] += 1
+        raise
+
+def _drain():
+    written, rejected = 0, set()
+    while True:
+        with _cond:
+            pending = (e for e in _queue if id(e) not in rejected)
+            batch = list(itertools.islice(pending, FLUSH_BATCH_SIZE))
+        if not batch:
+            return written
+        done, kept = _commit(batch)
+        written += done
+        rejected.update(map(id, kept))  # retried on the next flush, not again in this one
+
+def _commit(batch):
+    """
+    Write batch and take it off the queue. Returns (rows written, rows left queued).
+    A busy or unreachable database raises with the unwritten rows still queued; a
+    rejected batch is retried row by row, and rows rejected MAX_ATTEMPTS times are dropped.
+    """
+    try:
+        _write(batch)
+    except Exception as e:
+        if db.transient_error(e):
+            raise
+    else:
+        _dequeue(batch)
+        return len(batch), []
+
+    done, kept, dropped = [], [], []
+    try:
+        for entry in batch:
+            try:
+                _write([entry])
+                done.append(entry)
+            except Exception as e:
+                if db.transient_error(e):
+                    raise
+                with _cond:
+                    attempts = _attempts[id(entry)] = _attempts.get(id(entry), 0) + 1
+                if attempts < MAX_ATTEMPTS:
+                    kept.append(entry)
+                else:
+                    dropped.append(entry)
+                    log.error("Dropping history row of user %s (%s) after %d failed writes: %s",
+                              entry[0], entry[1], attempts, e)
+    finally:
+        _dequeue(done + dropped)
+        with _cond:
+            _stats["dropped"] += len(dropped)
+    return len(done), kept
+
+def _dequeue(entries):
+    """Remove written or dropped entries from the queue."""
+    with _cond:
+        for entry in entries:
+            _attempts.pop(id(entry), None)
+        if len(entries) <= len(_queue) and all(a is b for a, b in zip(_queue, entries)):
+            for _ in entries:  # the usual case: the batch was the head of the queue
+                _queue.popleft()
+            return
+        gone = {id(e) for e in entries}
+        remaining = [e for e in _queue if id(e) not in gone]
+        _queue.clear()
+        _queue.extend(remaining)
+
+def _write(batch):
+    """Commit one batch of queued entries (the caller removes them from the queue)."""
+    start = time.perf_counter()
+    try:
+        db.add_history_items([e[:7] + (history_codec.encode_payload(e[7], e[8]),) for e in batch])
+    except Exception:
+        with _cond:
+            _stats["failures"] += 1
+        raise
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _cond:
+        _stats["flushed"] += len(batch)
+        _stats["batches"] += 1
+        _stats["last_flush_ms"] = elapsed_ms
+        _stats["total_flush_ms"] += elapsed_ms
+        _stats["max_flush_ms"] = max(_stats["max_flush_ms"], elapsed_ms)
+
+def stats():
+    """Queue depth and flush latency metrics."""
+    with _cond:
+        snapshot = dict(_stats, queue_depth=len(_queue))
+    batches = snapshot["batches"]
+    snapshot["avg_flush_ms"] = snapshot["total_flush_ms"] / batches if batches else 0.0
+    return snapshot
+
+def _run():
+    while True:
+        with _cond:
+            if not _stopping and len(_queue) < FLUSH_BATCH_SIZE:
+                _cond.wait(FLUSH_INTERVAL_MS / 1000)
+            if _stopping:
+                return
+        try:
+            flush()
+        except Exception:
+            # Rows stay queued; back off and retry on the next tick.
+            time.sleep(FLUSH_INTERVAL_MS / 1000)
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _cond:
+        if _stopping or (_worker is not None and _worker.is_alive()):
+            return
+        _worker = threading.Thread(target=_run, name="appaty-history-writer", daemon=True)
+        _worker.start()
+
+def shutdown(retries=3):
+    """Stop the writer thread and drain the queue."""
+    global _stopping
+    with _cond:
+        _stopping = True
+        _cond.notify_all()
+    if _worker is not None:
+        _worker.join()
+    for attempt in range(retries):
+        try:
+            flush()
+            return
+        except Exception:
+            if attempt == retries - 1:
+                raise
+            time.sleep(FLUSH_INTERVAL_MS / 1000)
+
+atexit.register(shutdown)
@@ -0,0 +1,202 @@
+import hashlib
+import itertools
+import os
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils import metrics
+
+# --- Background Jobs ---
+# Slow work (exports, long solves) runs on a small worker pool instead of inside a
+# Streamlit rerun. The page submits a job and then polls get() on later reruns to show
+# progress and fetch the result. Jobs are deduplicated by key: submitting a key whose
+# job is still queued/running, or finished successfully, returns the existing job.
+#
+# The job's function is called as fn(progress, *args), where progress(done, total, stage)
+# reports how far it got (stage names the current step of a multi-step job). Job
+# records are kept in memory (bounded, oldest dropped).
+#
+# Each pool has its own workers, so long solves cannot hold up exports, and an Auto
+# solve (algebra.solve_system_race_job, on "solver") cannot end up waiting for its
+# symbolic half queued behind it on the same workers. Active (queued or running) jobs
+# are limited per owner and in total; submit() raises Busy beyond that. With
+# persist=kind, a successful result is also stored in the job_results table under the
+# key (a string, see digest()), and a later submit of the same key, from any process
+# or after a restart, returns it without rerunning. Only actual answers are stored: a
+# solver result whose "solutions" is an error message (a timeout, a SymPy failure) is
+# not, since the next attempt may succeed.
+
+POOLS = {
+    "default": int(os.environ.get("APPATY_JOB_WORKERS", "2")),
+    "solver": int(os.environ.get("APPATY_SOLVER_WORKERS", "2")),
+    "race": int(os.environ.get("APPATY_RACE_WORKERS", "2")),  # symbolic halves of Auto solves
+}
+WORKERS = POOLS["default"]
+MAX_ACTIVE_PER_OWNER = int(os.environ.get("APPATY_JOBS_PER_USER", "2"))
+MAX_ACTIVE = int(os.environ.get("APPATY_JOBS_MAX_ACTIVE", "32"))
+MAX_JOBS = 1000
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+class Busy(Exception):
+    """Raised by submit() when the owner or the server is at its active job limit."""
+
+_executors = {}  # pool name -> ThreadPoolExecutor, created on first use
+_jobs = OrderedDict()  # job id -> job dict
+_by_key = {}  # key -> job id
+_lock = threading.Lock()
+_ids = itertools.count(1)
+
+def _new_job(key, owner):
+    return {
+        "id": next(_ids),
+        "key": key,
+        "owner": owner,
+        "pool": None,
+        "status": QUEUED,
+        "done": 0,
+        "total": None,
+        "stage": None,
+        "result": None,
+        "error": None,
+        "created": time.time(),
+        "started": None,
+        "finished": None,
+    }
+
+def digest(*parts):
+    """Stable string key for persisted jobs, from canonical inputs (e.g. srepr text)."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+def _executor(pool):
+    with _lock:
+        if pool not in _executors:
+            _executors[pool] = ThreadPoolExecutor(max_workers=POOLS[pool], thread_name_prefix=f"appaty-{pool}")
+        return _executors[pool]
+
+def _persistable(result):
+    """False for solver results that carry an error message instead of a solutions list."""
+    return not (isinstance(result, dict) and isinstance(result.get("solutions"), str))
+
+def _run(job, fn, args, persist):
+    def progress(done, total=None, stage=None):
+        job["done"] = done
+        if total is not None:
+            job["total"] = total
+        if stage is not None:
+            job["stage"] = stage
+
+    job["status"], job["started"] = RUNNING, time.time()
+    try:
+        result = fn(progress, *args)
+        if persist and _persistable(result):
+            from utils import db, history_codec
+            db.put_job_result(job["key"], persist, history_codec.encode_payload(solution=result),
+                              (time.time() - job["started"]) * 1000)
+        job["result"] = result
+        job["status"] = DONE
+    except Exception as e:
+        job["error"] = f"{type(e).__name__}: {e}"
+        job["traceback"] = traceback.format_exc()
+        job["status"] = FAILED
+    finally:
+        job["finished"] = time.time()
+
+def _add(job):
+    # Caller holds _lock.
+    _jobs[job["id"]] = job
+    _by_key[job["key"]] = job["id"]
+    while len(_jobs) > MAX_JOBS:
+        _, old = _jobs.popitem(last=False)
+        if _by_key.get(old["key"]) == old["id"]:
+            del _by_key[old["key"]]
+
+def _stored(key):
+    """A finished job record for a persisted result, or None."""
+    from utils import db, history_codec
+    row = db.get_job_result(key)
+    result = history_codec.decode_payload(row["payload"])[1] if row else None
+    hit = row is not None and _persistable(result)  # error results stored before they were excluded
+    metrics.cache_lookup("job_results", hit)
+    if not hit:
+        return None
+    job = _new_job(key, None)
+    job.update(status=DONE, result=result,
+               started=row["created_at"], finished=row["created_at"], elapsed_ms=row["elapsed_ms"])
+    return job
+
+def submit(key, fn, *args, owner=None, pool="default", persist=None):
+    """
+    Run fn(progress, *args) on a worker pool, or return the existing job for key. Returns the job id.
+    persist: store the result under key (a str) as this kind, and reuse a stored result.
+    Raises Busy when owner already has MAX_ACTIVE_PER_OWNER active jobs or the server MAX_ACTIVE.
+    """
+    with _lock:
+        existing = _jobs.get(_by_key.get(key))
+        if existing and existing["status"] != FAILED:
+            return existing["id"]
+    stored = _stored(key) if persist else None
+    with _lock:
+        existing = _jobs.get(_by_key.get(key))
+        if existing and existing["status"] != FAILED:
+            return existing["id"]
+        if stored:
+            _add(stored)
+            return stored["id"]
+        active = [j for j in _jobs.values() if j["status"] in (QUEUED, RUNNING)]
+        if owner is not None and sum(j["owner"] == owner for j in active) >= MAX_ACTIVE_PER_OWNER:
+            raise Busy(f"You have {MAX_ACTIVE_PER_OWNER} job(s) running already; wait for one to finish.")
+        if len(active) >= MAX_ACTIVE:
+            raise Busy("The server is busy; please try again in a minute.")
+        job = _new_job(key, owner)
+        job["pool"] = pool
+        _add(job)
+    _executor(pool).submit(_run, job, fn, args, persist)
+    return job["id"]
+
+def get(job_id):
+    """Return a snapshot of a job, or None if unknown (or already evicted)."""
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+def find(key, persisted=False):
+    """Return a snapshot of the latest job submitted for key, or None. persisted: also look in job_results."""
+    with _lock:
+        job = _jobs.get(_by_key.get(key))
+        if job or not persisted:
+            return dict(job) if job else None
+    stored = _stored(key)
+    if stored is None:
+        return None
+    with _lock:
+        if _by_key.get(key) is None:
+            _add(stored)
+        return dict(_jobs[_by_key[key]])
+
+def forget(key):
+    """Drop the job for key so the next submit() runs it again (e.g. its artifact was deleted)."""
+    with _lock:
+        job_id = _by_key.pop(key, None)
+        if job_id is not None and _jobs.get(job_id, {}).get("status") in (DONE, FAILED):
+            del _jobs[job_id]
+
+def active_counts():
+    """{(pool, status): n} for queued and running jobs."""
+    counts = {}
+    with _lock:
+        for job in _jobs.values():
+            if job["status"] in (QUEUED, RUNNING):
+                key = (job["pool"], job["status"])
+                counts[key] = counts.get(key, 0) + 1
+    return counts
+
+def fraction(job):
+    """Progress of a job snapshot as 0.0-1.0 (0.0 while the total is unknown)."""
+    if job["status"] == DONE:
+        return 1.0
+    if not job["total"]:
+        return 0.0
+    return min(1.0, job["done"] / job["total"])
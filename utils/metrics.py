@@ -0,0 +1,229 @@
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+
+# --- Process Metrics ---
+# Latency histograms and counters for the hot paths (page renders, calculator runs,
+# solver calls, DB operations, cache lookups), plus gauges read on demand from other
+# modules (history writer queue, DB pool, job pools), exposed in the Prometheus text
+# format on a local HTTP endpoint served from a daemon thread of this process:
+#
+#   APPATY_METRICS_PORT=9108 streamlit run app.py
+#   curl http://127.0.0.1:9108/metrics
+#
+# Everything is off unless APPATY_METRICS=1 or APPATY_METRICS_PORT is set. When off,
+# @timed returns the function itself and timer() returns one shared no-op context
+# manager, so instrumented code pays nothing (decorators) or one function call.
+#
+# Metric names follow Prometheus conventions: *_seconds histograms and *_total counters.
+# If the port cannot be bound (e.g. taken by another Streamlit process), the endpoint is
+# skipped with one logged warning and the app runs on; metrics never take it down.
+
+PORT = int(os.environ.get("APPATY_METRICS_PORT", "0"))
+HOST = os.environ.get("APPATY_METRICS_HOST", "127.0.0.1")
+ENABLED = os.environ.get("APPATY_METRICS") == "1" or PORT > 0
+
+# Upper bounds in seconds; the last bucket is +Inf.
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_bind_failed = False  # set after a failed bind, so later reruns do not retry it
+log = logging.getLogger(__name__)
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count], sum
+_counters = {}  # (name, labels) -> value
+_collectors = []  # fn() -> iterable of (name, labels dict, value, "gauge" | "counter")
+HELP = {
+    "appaty_page_render_seconds": "Page render time (import on first use + render), by page.",
+    "appaty_calc_seconds": "Calculator run time as recorded in usage analytics, by kind.",
+    "appaty_solver_seconds": "algebra_solver call time, by function.",
+    "appaty_convert_seconds": "Server-side unit conversion time.",
+    "appaty_plot_seconds": "Equation plot build time (cache misses only).",
+    "appaty_db_seconds": "Database facade call time, by operation.",
+    "appaty_cache_requests_total": "Cache lookups, by cache and result (hit/miss).",
+}
+_server = None
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def observe(name, seconds, **labels):
+    """Record one latency sample in a histogram."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0]
+        entry[0][index] += 1
+        entry[1] += seconds
+
+def count(name, n=1, **labels):
+    """Add n to a counter."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+def _errors_name(name):
+    return name[:-len("_seconds")] + "_errors_total" if name.endswith("_seconds") else name + "_errors_total"
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            count(_errors_name(self.name), **self.labels)
+        return False
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NO_TIMER = _NoTimer()
+
+def timer(name, **labels):
+    """Context manager: time the block into histogram name; exceptions count in name's *_errors_total."""
+    return _Timer(name, labels) if ENABLED else _NO_TIMER
+
+def timed(name, **labels):
+    """Decorator form of timer(). A no-op (returns the function unchanged) when metrics are off."""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def cache_lookup(cache, hit):
+    """Count a hit or miss of a named cache (for hit ratios)."""
+    if ENABLED:
+        count("appaty_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+def register_collector(fn):
+    """fn() returns (name, labels, value, type) tuples; called on every scrape."""
+    _collectors.append(fn)
+    return fn
+
+# --- Exposition ---
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {k: ([*v[0]], v[1]) for k, v in _histograms.items()}
+        counters = dict(_counters)
+    families = {}  # name -> (type, sample lines); a family's samples must be contiguous
+    def add(name, kind, line):
+        families.setdefault(name, (kind, []))[1].append(line)
+
+    for (name, labels), (buckets, total) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), buckets):
+            cumulative += n
+            add(name, "histogram", f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+        add(name, "histogram", f"{name}_sum{_labels(labels)} {total}")
+        add(name, "histogram", f"{name}_count{_labels(labels)} {cumulative}")
+    for (name, labels), value in sorted(counters.items()):
+        add(name, "counter", f"{name}{_labels(labels)} {value}")
+    for collector in _collectors:
+        try:
+            samples = list(collector())
+        except Exception as e:  # a broken collector must not break the scrape
+            samples = [("appaty_collector_errors", {"collector": collector.__name__, "error": type(e).__name__}, 1, "gauge")]
+        for name, labels, value, kind in samples:
+            add(name, kind, f"{name}{_labels(sorted(labels.items()))} {value}")
+
+    lines = []
+    for name, (kind, samples) in families.items():
+        if name in HELP:
+            lines.append(f"# HELP {name} {HELP[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+def start_server(port=None, host=None):
+    """
+    Serve /metrics from a daemon thread (once per process). Returns the bound port, or None
+    when off or when the port could not be bound.
+    """
+    global _server, _bind_failed
+    port = PORT if port is None else port
+    if not ENABLED or not port:
+        return None
+    with _lock:
+        if _server is not None:
+            return _server.server_address[1]
+        if _bind_failed:
+            return None
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host or HOST, port), Handler)
+        except OSError as e:
+            _bind_failed = True
+            log.warning("Metrics endpoint disabled: cannot listen on %s:%s (%s)", host or HOST, port, e)
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="appaty-metrics", daemon=True).start()
+        return _server.server_address[1]
+
+# --- Built-in Collectors ---
+
+@register_collector
+def _process_gauges():
+    # Imported here: these modules import metrics themselves.
+    from utils import db, history_writer, jobs
+
+    for key, value in db.pool_stats().items():
+        if isinstance(value, (int, float)):
+            yield f"appaty_db_pool_{key}", {"backend": db.backend_name()}, value, "gauge"
+    writer = history_writer.stats()
+    for key in ("queue_depth", "last_flush_ms", "avg_flush_ms", "max_flush_ms"):
+        yield f"appaty_history_writer_{key}", {}, writer.get(key, 0), "gauge"
+    for key in ("enqueued", "coalesced", "flushed", "batches", "failures", "dropped"):
+        yield f"appaty_history_writer_{key}_total", {}, writer.get(key, 0), "counter"
+    for (pool, status), n in jobs.active_counts().items():
+        yield "appaty_jobs_active", {"pool": pool, "status": status}, n, "gauge"
@@ -0,0 +1,210 @@
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: single replica, the process lock is enough
+    fcntl = None
+
+# --- Schema Migrations ---
+# Each step runs once, in order, inside its own write transaction, and is recorded
+# in schema_version. Steps must be safe on databases created before this table
+# existed (hence the IF NOT EXISTS / column checks). Append new steps; never edit
+# or reorder released ones.
+
+def _create_base_tables(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS users
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  username TEXT UNIQUE,
+                  password TEXT,
+                  is_premium INTEGER DEFAULT 0)''')
+
+    c.execute('''CREATE TABLE IF NOT EXISTS history
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  user_id INTEGER,
+                  calc_name TEXT,
+                  result TEXT,
+                  timestamp TEXT,
+                  FOREIGN KEY (user_id) REFERENCES users (id))''')
+
+def _epoch_timestamps(c):
+    # ts is a UTC epoch in seconds; id breaks ties for keyset pagination.
+    columns = [row[1] for row in c.execute("PRAGMA table_info(history)")]
+    if 'ts' not in columns:
+        c.execute("ALTER TABLE history ADD COLUMN ts INTEGER")
+        c.execute("UPDATE history SET ts = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)")
+        c.execute("ALTER TABLE history DROP COLUMN timestamp")
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_ts ON history (user_id, ts, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_calc ON history (user_id, calc_name, ts, id)")
+
+def _history_archive_index(c):
+    # One row per (user, UTC day) archive partition; see utils/retention.py.
+    c.execute('''CREATE TABLE IF NOT EXISTS history_archive
+                 (user_id INTEGER,
+                  day TEXT,
+                  rows INTEGER,
+                  min_ts INTEGER,
+                  max_ts INTEGER,
+                  PRIMARY KEY (user_id, day))''')
+
+def _typed_results(c):
+    # kind: stable calculator id (e.g. "length"); value/unit: numeric result;
+    # payload: JSON inputs + solution set (utils/history_codec.py).
+    columns = [row[1] for row in c.execute("PRAGMA table_info(history)")]
+    for name, decl in (("kind", "TEXT"), ("value", "REAL"), ("unit", "TEXT"), ("payload", "TEXT")):
+        if name not in columns:
+            c.execute(f"ALTER TABLE history ADD COLUMN {name} {decl}")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_kind ON history (user_id, kind)")
+
+def _sessions(c):
+    # Shared by both backends. id is sha256 of the session id; see utils/sessions.py.
+    c.execute('''CREATE TABLE IF NOT EXISTS sessions
+                 (id TEXT PRIMARY KEY,
+                  user_id BIGINT NOT NULL,
+                  created_at BIGINT NOT NULL,
+                  expires_at BIGINT NOT NULL)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+    c.execute("CREATE TABLE IF NOT EXISTS app_settings (key TEXT PRIMARY KEY, value TEXT)")
+
+def _usage_rollups(c):
+    # Shared by both backends. bucket is the UTC epoch start of the hour / day; see utils/analytics.py.
+    for table in ("usage_hourly", "usage_daily"):
+        c.execute(f'''CREATE TABLE IF NOT EXISTS {table}
+                     (bucket BIGINT NOT NULL,
+                      kind TEXT NOT NULL,
+                      calls BIGINT NOT NULL DEFAULT 0,
+                      errors BIGINT NOT NULL DEFAULT 0,
+                      latency_ms_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                      latency_ms_max DOUBLE PRECISION NOT NULL DEFAULT 0,
+                      PRIMARY KEY (bucket, kind))''')
+
+def _job_results(c):
+    # Shared by both backends. key is a digest of the job's canonical input; see utils/jobs.py.
+    c.execute('''CREATE TABLE IF NOT EXISTS job_results
+                 (key TEXT PRIMARY KEY,
+                  kind TEXT NOT NULL,
+                  payload TEXT,
+                  created_at BIGINT NOT NULL,
+                  elapsed_ms DOUBLE PRECISION)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_job_results_created ON job_results (created_at)")
+
+def _calc_prefix_index(c):
+    # History filters by calc_name prefix with LIKE (utils/db.py). SQLite serves that
+    # from idx_history_user_calc; Postgres only does under the "C" collation, so give
+    # it a text_pattern_ops index. Nothing to do on SQLite: the step keeps versions aligned.
+    pass
+
+def _pg_calc_prefix_index(c):
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_calc_prefix ON history (user_id, calc_name text_pattern_ops)")
+
+MIGRATIONS = [
+    (1, "create users and history", _create_base_tables),
+    (2, "epoch timestamps and history indexes", _epoch_timestamps),
+    (3, "history archive index", _history_archive_index),
+    (4, "typed result columns", _typed_results),
+    (5, "sessions and app settings", _sessions),
+    (6, "usage roll-ups", _usage_rollups),
+    (7, "persisted job results", _job_results),
+    (8, "history calc_name prefix index", _calc_prefix_index),
+]
+
+# Postgres databases start from the current schema; its versions line up with
+# MIGRATIONS so both backends report the same schema_version. New steps must be
+# added to both lists.
+
+def _pg_initial_schema(c):
+    # No FK on history.user_id: SQLite never enforced it, and the history writer
+    # must not wedge on a row for a deleted user.
+    c.execute('''CREATE TABLE IF NOT EXISTS users
+                 (id BIGSERIAL PRIMARY KEY,
+                  username TEXT UNIQUE,
+                  password TEXT,
+                  is_premium INTEGER DEFAULT 0)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS history
+                 (id BIGSERIAL PRIMARY KEY,
+                  user_id BIGINT,
+                  calc_name TEXT,
+                  result TEXT,
+                  ts BIGINT NOT NULL,
+                  kind TEXT,
+                  value DOUBLE PRECISION,
+                  unit TEXT,
+                  payload TEXT)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_ts ON history (user_id, ts, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_calc ON history (user_id, calc_name, ts, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_user_kind ON history (user_id, kind)")
+    _history_archive_index(c)
+
+POSTGRES_MIGRATIONS = [
+    (4, "initial postgres schema", _pg_initial_schema),
+    (5, "sessions and app settings", _sessions),
+    (6, "usage roll-ups", _usage_rollups),
+    (7, "persisted job results", _job_results),
+    (8, "history calc_name prefix index", _pg_calc_prefix_index),
+]
+
+# Arbitrary constant shared by every replica for pg_advisory_xact_lock.
+PG_MIGRATION_LOCK = 7_240_031
+
+@contextmanager
+def _file_lock(path):
+    """Serialize migrations across processes/replicas sharing the database file."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+def current_version(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                    (version INTEGER PRIMARY KEY,
+                     name TEXT,
+                     applied_at INTEGER)''')
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def migrate(conn, lock_path):
+    """Apply every pending migration. Returns the list of versions applied."""
+    applied = []
+    with _file_lock(lock_path):
+        for version, name, step in MIGRATIONS:
+            # Re-check inside the write lock: another replica may have got here first.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if version <= current_version(conn):
+                    conn.rollback()
+                    continue
+                step(conn.cursor())
+                conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                             (version, name, int(time.time())))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(version)
+    return applied
+
+def migrate_postgres(conn):
+    """Postgres counterpart of migrate(): replicas serialize on an advisory lock."""
+    applied = []
+    for version, name, step in POSTGRES_MIGRATIONS:
+        try:
+            conn.execute("SELECT pg_advisory_xact_lock(?)", (PG_MIGRATION_LOCK,))
+            if version <= current_version(conn):
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                         (version, name, int(time.time())))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,165 @@
+import functools
+import os
+import time
+from utils import metrics, profiling
+
+# --- Numeric Solver ---
+# Fallback for systems SymPy cannot solve in reasonable time (transcendental terms,
+# high degrees). The system and its analytic Jacobian are compiled once per system
+# (sympy.lambdify, cached by the canonical srepr form) into NumPy functions that take
+# all starting points as one array. Damped Newton then runs from STARTS seeded
+# starting points at the same time: each iteration is one batched residual/Jacobian
+# evaluation and one batched least-squares step (pseudo-inverse, so singular and
+# non-square systems still step), followed by a backtracking line search done for all
+# starts together. Starts that converge are clustered into distinct solutions, each
+# reported with its residual.
+#
+# Only real solutions are found, and only those some start converges to: the result
+# is a set of verified solutions, not a proof that there are no others. The seed is
+# fixed, so the same system gives the same answer.
+
+STARTS = int(os.environ.get("APPATY_NUMERIC_STARTS", "256"))
+SCALES = (1.0, 10.0, 100.0)  # starts are spread over boxes of these half-widths
+SEED = 2393
+MAX_ITERATIONS = 60
+MAX_HALVINGS = 12
+TOLERANCE = 1e-9          # max residual of a converged start, relative to 1 + |x|
+STEP_TOLERANCE = 1e-12    # a converged start keeps iterating until its step is this small (relative)
+CLUSTER_TOLERANCE = 1e-6  # starts closer than this (relative) are the same solution
+MAX_SOLUTIONS = 50
+DIVERGED = 1e8
+
+@functools.lru_cache(maxsize=128)
+def _compile(equation_sreprs, var_sreprs):
+    """(residuals, jacobian): X (starts, n) -> (starts, m) and (starts, m, n); NaN where undefined or non-real."""
+    import numpy as np
+    import sympy as sp
+    equations = [sp.sympify(e) for e in equation_sreprs]
+    variables = [sp.sympify(v) for v in var_sreprs]
+    m, n = len(equations), len(variables)
+    f = sp.lambdify(variables, equations, "numpy")
+    j = sp.lambdify(variables, list(sp.Matrix(equations).jacobian(variables)), "numpy")
+
+    def stack(values, count):
+        out = np.empty((count, len(values)))
+        for k, value in enumerate(values):
+            value = np.asarray(value)
+            if np.iscomplexobj(value):
+                value = np.where(np.abs(value.imag) < 1e-12, value.real, np.nan)
+            out[:, k] = value  # constants broadcast
+        return out
+
+    def residuals(X):
+        with np.errstate(all="ignore"):
+            return stack(f(*X.T), len(X))
+
+    def jacobian(X):
+        with np.errstate(all="ignore"):
+            return stack(j(*X.T), len(X)).reshape(len(X), m, n)
+    return residuals, jacobian
+
+def _starts(n, count):
+    import numpy as np
+    rng = np.random.default_rng(SEED)
+    scale = np.asarray(SCALES)[np.arange(count) % len(SCALES)]
+    return rng.uniform(-1.0, 1.0, (count, n)) * scale[:, None]
+
+def _norm(R):
+    import numpy as np
+    with np.errstate(all="ignore"):
+        return np.sqrt((R ** 2).sum(axis=1))  # NaN where a residual is undefined
+
+def _converged(X, norm):
+    import numpy as np
+    return np.isfinite(norm) & (norm <= TOLERANCE * (1 + np.abs(X).max(axis=1)))
+
+def _cluster(X, norm):
+    """Indices of distinct points (lowest residual of each cluster first)."""
+    import numpy as np
+    reps = []
+    for i in np.argsort(norm, kind="stable"):
+        if reps:
+            kept = X[reps]
+            close = np.abs(kept - X[i]).max(axis=1) <= CLUSTER_TOLERANCE * (1 + np.abs(kept).max(axis=1))
+            if close.any():
+                continue
+        reps.append(i)
+    return reps
+
+@metrics.timed("appaty_solver_seconds", fn="solve_numeric")
+@profiling.profiled
+def solve(equation_sreprs, var_sreprs, progress=None, deadline=None, starts=None, stop=None):
+    """
+    Real solutions of a system (equations implied = 0) by multi-start damped Newton.
+    deadline: time.monotonic() value after which iterating stops (converged starts are kept).
+    stop: optional callable, checked once per iteration; iterating stops as at the deadline once it returns True.
+    Returns (solutions, residuals): [{symbol: Float}] sorted by value, and the max |f_i| at each.
+    """
+    import numpy as np
+    import sympy as sp
+    progress = progress or (lambda done, total=None, stage=None: None)
+    F, J = _compile(tuple(equation_sreprs), tuple(var_sreprs))
+    X = _starts(len(var_sreprs), starts or STARTS)
+    R = F(X)
+    norm = _norm(R)
+    last_step = np.full(len(X), np.inf)
+    active = np.isfinite(norm)
+
+    for iteration in range(MAX_ITERATIONS):
+        if not active.any() or (deadline is not None and time.monotonic() > deadline) or (stop and stop()):
+            break
+        progress(iteration, MAX_ITERATIONS,
+                 f"Newton iteration {iteration + 1}: {int(_converged(X, norm).sum())} of {len(X)} starts converged")
+        idx = np.flatnonzero(active)
+        jac = J(X[idx])
+        ok = np.isfinite(jac).all(axis=(1, 2))
+        active[idx[~ok]] = False
+        idx, jac = idx[ok], jac[ok]
+        if not idx.size:
+            break
+        step = -(np.linalg.pinv(jac) @ R[idx][..., None])[..., 0]
+
+        # Backtracking: halve each start's step until its residual norm drops enough.
+        t = np.ones(len(idx))
+        accepted = np.zeros(len(idx), dtype=bool)
+        for _ in range(MAX_HALVINGS):
+            todo = np.flatnonzero(~accepted)
+            if not todo.size:
+                break
+            trial = X[idx[todo]] + t[todo, None] * step[todo]
+            trial_R = F(trial)
+            trial_norm = _norm(trial_R)
+            with np.errstate(invalid="ignore"):
+                good = trial_norm < (1 - 1e-4 * t[todo]) * norm[idx[todo]]
+            done = todo[good]
+            X[idx[done]], R[idx[done]], norm[idx[done]] = trial[good], trial_R[good], trial_norm[good]
+            last_step[idx[done]] = np.abs(t[done, None] * step[done]).max(axis=1)
+            accepted[done] = True
+            t[todo[~good]] /= 2
+        # Iterating stops at no descent (a root within rounding, or a local minimum of |f|), at a
+        # root once the steps are negligible (multiple roots converge slowly), and on divergence.
+        active[idx[~accepted]] = False
+        settled = _converged(X, norm) & (last_step <= STEP_TOLERANCE * (1 + np.abs(X).max(axis=1)))
+        active &= ~settled & (np.abs(X).max(axis=1) < DIVERGED)
+
+    found = np.flatnonzero(_converged(X, norm))
+    reps = found[_cluster(X[found], norm[found])] if found.size else found
+    max_residual = np.abs(R[reps]).max(axis=1) if len(reps) else []
+    rows = sorted(zip(X[reps].tolist(), list(max_residual)))[:MAX_SOLUTIONS]
+    progress(MAX_ITERATIONS, MAX_ITERATIONS, "Done")
+
+    variables = [sp.sympify(v) for v in var_sreprs]
+    solutions = [{v: sp.Float(0.0 if abs(value) < 1e-12 else value, 12) for v, value in zip(variables, point)}
+                 for point, _ in rows]
+    return solutions, [float(residual) for _, residual in rows]
+
+def solve_system_job(progress, equation_sreprs, var_sreprs, deadline=None, stop=None):
+    """
+    solve() as a background job (utils/jobs.py), in the shape of algebra.solve_system_job plus
+    "engine", "residuals" and "starts".
+    """
+    import sympy as sp
+    solutions, residuals = solve(equation_sreprs, var_sreprs, progress, deadline, stop=stop)
+    return {"variables": [sp.sympify(v).name for v in var_sreprs],
+            "equations": [sp.sympify(e) for e in equation_sreprs],
+            "solutions": solutions, "residuals": residuals, "engine": "numeric", "starts": STARTS}
@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Password Hashing Service ---
+# Salted, memory-hard KDF (scrypt by default, PBKDF2-SHA256 as an option). Hashes run
+# on a small bounded thread pool (hashlib releases the GIL), so a burst of logins
+# costs at most WORKERS cores and anything beyond MAX_PENDING (or still waiting after
+# TIMEOUT_S) is refused with Busy instead of queueing. Each stored hash carries its
+# own parameters:
+#
+#   scrypt$<n>$<r>$<p>$<salt>$<hash>
+#   pbkdf2_sha256$<iterations>$<salt>$<hash>
+#   <64 hex chars>  legacy unsalted SHA-256 (accepted once, then upgraded)
+#
+# verify_password() reports a replacement hash whenever the stored one was made with
+# other settings than the current ones, so parameters upgrade on the next login.
+# A stored hash that cannot be parsed never matches.
+
+KDF = os.environ.get("APPATY_KDF", "scrypt")
+SCRYPT_N = int(os.environ.get("APPATY_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.environ.get("APPATY_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("APPATY_SCRYPT_P", "1"))
+PBKDF2_ITERATIONS = int(os.environ.get("APPATY_PBKDF2_ITERATIONS", "600000"))
+WORKERS = int(os.environ.get("APPATY_KDF_WORKERS", "2"))
+MAX_PENDING = int(os.environ.get("APPATY_KDF_MAX_PENDING", str(WORKERS * 4)))
+TIMEOUT_S = 10.0
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="appaty-kdf")
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+class Busy(Exception):
+    """Raised when too many hashes are already pending, or one takes longer than TIMEOUT_S."""
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+def _current():
+    if KDF == "pbkdf2":
+        return "pbkdf2_sha256", (PBKDF2_ITERATIONS,)
+    return "scrypt", (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+def _derive(password, scheme, params, salt):
+    secret = password.encode("utf-8")
+    if scheme == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + (1 << 20), dklen=KEY_BYTES)
+    if scheme == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", secret, salt, params[0], dklen=KEY_BYTES)
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+def _encode(password):
+    scheme, params = _current()
+    salt = os.urandom(SALT_BYTES)
+    return "$".join([scheme, *map(str, params), _b64(salt), _b64(_derive(password, scheme, params, salt))])
+
+def _check(password, stored):
+    """Runs on the pool. Returns (matches, replacement hash or None)."""
+    parts = stored.split("$")
+    if len(parts) == 1:
+        ok = hmac.compare_digest(hashlib.sha256(password.encode("utf-8")).hexdigest(), stored)
+        return ok, _encode(password) if ok else None
+
+    try:
+        scheme, params = parts[0], tuple(int(v) for v in parts[1:-2])
+        salt, expected = base64.b64decode(parts[-2], validate=True), base64.b64decode(parts[-1], validate=True)
+        ok = hmac.compare_digest(_derive(password, scheme, params, salt), expected)
+    except (ValueError, IndexError):
+        # Unknown scheme, wrong field count, bad base64 or KDF parameters hashlib rejects.
+        return False, None
+    if not ok:
+        return False, None
+    current_scheme, current_params = _current()
+    if scheme != current_scheme or params != current_params:
+        return True, _encode(password)
+    return True, None
+
+def _run(fn, *args):
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise Busy("Too many password checks in progress")
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=TIMEOUT_S)
+    except TimeoutError:
+        # The hash keeps its slot until it finishes, so a stalled pool turns into Busy.
+        raise Busy("Password check timed out") from None
+
+def hash_password(password):
+    """Hash a new password with the current KDF settings."""
+    return _run(_encode, password)
+
+def verify_password(password, stored):
+    """
+    Check a password against a stored hash.
+    Returns (ok, new_hash); new_hash is set when the stored hash should be upgraded.
+    """
+    if not stored:
+        return False, None
+    return _run(_check, password, stored)
+
+def configure(kdf=None, scrypt_n=None, pbkdf2_iterations=None, workers=None):
+    """Change KDF settings at runtime (benchmarks, tests). New hashes use the new settings."""
+    global KDF, SCRYPT_N, PBKDF2_ITERATIONS, WORKERS, MAX_PENDING, _executor, _slots
+    if kdf:
+        KDF = kdf
+    if scrypt_n:
+        SCRYPT_N = scrypt_n
+    if pbkdf2_iterations:
+        PBKDF2_ITERATIONS = pbkdf2_iterations
+    if workers and workers != WORKERS:
+        _executor.shutdown(wait=True)
+        WORKERS, MAX_PENDING = workers, workers * 4
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="appaty-kdf")
+        _slots = threading.BoundedSemaphore(MAX_PENDING)
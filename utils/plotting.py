@@ -0,0 +1,212 @@
+import functools
+import os
+import streamlit as st
+from utils import metrics
+
+# --- Adaptive Plots ---
+# Graphs of the Equation Solver's results (polynomial roots, curve intersections) as
+# Vega-Lite specs for st.vega_lite_chart. Each curve is compiled once to a NumPy
+# callable (sympy.lambdify, cached by the expression's srepr) and sampled adaptively:
+# a coarse even grid first, then passes that split only the intervals where the curve
+# crosses zero or bends away from its chord, so roots and turns get detail and straight
+# stretches stay sparse. A curve never gets more than APPATY_PLOT_MAX_POINTS points,
+# which keeps the chart payload small.
+#
+# Specs are cached by the canonical form of the curves (SymPy srepr) and the x range,
+# so reruns of the page (and other sessions plotting the same equation) reuse them.
+# Data sits inline in the layers; Streamlit only converts a top-level "data" key to
+# Arrow (pandas), so plotting does not import pandas.
+
+MAX_POINTS = int(os.environ.get("APPATY_PLOT_MAX_POINTS", "400"))
+INITIAL_POINTS = 33
+MAX_PASSES = 10
+BEND_TOLERANCE = 0.002  # chord deviation that earns a split, as a share of the y span
+DIGITS = 6              # significant digits sent to the browser
+
+QUADRATIC = "Quadratic (y = ax^2 + bx + c)"
+LINEAR = "Linear (ax + by = c)"
+
+@functools.lru_cache(maxsize=256)
+def _compile(expr_srepr):
+    """NumPy callable of an expression in x; non-real and undefined values come back as NaN."""
+    import numpy as np
+    import sympy as sp
+    fn = sp.lambdify(sp.Symbol("x"), sp.sympify(expr_srepr), "numpy")
+
+    def evaluate(xs):
+        with np.errstate(all="ignore"):
+            ys = np.asarray(fn(xs))
+        if np.iscomplexobj(ys):
+            ys = np.where(np.abs(ys.imag) < 1e-12, ys.real, np.nan)
+        return np.broadcast_to(ys.astype(float), xs.shape)
+    return evaluate
+
+def sample(f, lo, hi, max_points=MAX_POINTS):
+    """Adaptive samples (xs, ys) of f on [lo, hi]: at most max_points, denser at roots and bends."""
+    import numpy as np
+    xs = np.linspace(lo, hi, min(INITIAL_POINTS, max_points))
+    ys = f(xs)
+    finite = ys[np.isfinite(ys)]
+    span = float(np.percentile(finite, 90) - np.percentile(finite, 10)) if finite.size else 0.0
+    span = span or 1.0
+    min_width = (hi - lo) / (max_points * 64)
+
+    for _ in range(MAX_PASSES):
+        room = max_points - len(xs)
+        if room <= 0:
+            break
+        mids = (xs[:-1] + xs[1:]) / 2
+        y_mids = f(mids)
+        with np.errstate(invalid="ignore"):
+            score = np.abs(y_mids - (ys[:-1] + ys[1:]) / 2) / span
+        score[~np.isfinite(score)] = 0.0
+        score[ys[:-1] * ys[1:] < 0] = np.inf                  # a root inside
+        finite = np.isfinite(ys)
+        score[finite[:-1] != finite[1:]] = np.inf             # an edge of the domain inside
+        split = np.flatnonzero((score > BEND_TOLERANCE) & (xs[1:] - xs[:-1] > min_width))
+        if not split.size:
+            break
+        if split.size > room:
+            split = split[np.argsort(score[split], kind="stable")[-room:]]
+        xs = np.concatenate([xs, mids[split]])
+        ys = np.concatenate([ys, y_mids[split]])
+        order = np.argsort(xs, kind="stable")
+        xs, ys = xs[order], ys[order]
+    return xs, ys
+
+def _round(value):
+    return float(f"{value:.{DIGITS}g}")
+
+def _real(value):
+    """A SymPy/Python number as a float, or None when it is not (numerically) real."""
+    try:
+        number = complex(value)
+    except (TypeError, ValueError):
+        return None
+    if abs(number.imag) > 1e-9 * max(1.0, abs(number.real)):
+        return None
+    return number.real
+
+def _x_range(features, default=(-5.0, 5.0)):
+    """An x range showing all features (roots, extrema, intersections) with some margin."""
+    if not features:
+        return default
+    lo, hi = min(features), max(features)
+    pad = max(1.0, (hi - lo) * 0.25)
+    return _round(lo - pad), _round(hi + pad)
+
+# --- Specs ---
+
+@st.cache_data(show_spinner=False, max_entries=256)
+@metrics.timed("appaty_plot_seconds")
+def _spec(curves, verticals, points, x_range):
+    """
+    Vega-Lite spec of curves [(label, srepr of y(x))], vertical lines [(label, x)] and
+    marked points [(label, x, y)] on x_range. Arguments are tuples so they key the cache.
+    """
+    import numpy as np
+    lo, hi = x_range
+    rows, ys_seen = [], []
+    for label, expr_srepr in curves:
+        xs, ys = sample(_compile(expr_srepr), lo, hi)
+        keep = np.isfinite(ys)
+        ys_seen.append(ys[keep])
+        rows += [{"curve": label, "x": _round(x), "y": _round(y)} for x, y in zip(xs[keep], ys[keep])]
+
+    # y domain: the bulk of each curve plus every marked point, so steep ends don't flatten the view.
+    bulk = np.concatenate([np.percentile(ys, [5, 95]) for ys in ys_seen if ys.size]
+                          + [np.asarray([y for _, _, y in points] + [0.0])])
+    y_lo, y_hi = float(bulk.min()), float(bulk.max())
+    pad = max((y_hi - y_lo) * 0.1, 1e-6)
+    y_lo, y_hi = _round(y_lo - pad), _round(y_hi + pad)
+
+    for label, x in verticals:
+        rows += [{"curve": label, "x": _round(x), "y": y} for y in (y_lo, y_hi)]
+
+    x_enc = {"field": "x", "type": "quantitative", "scale": {"domain": [lo, hi], "nice": False}}
+    y_enc = {"field": "y", "type": "quantitative", "scale": {"domain": [y_lo, y_hi], "nice": False}}
+    layers = [{
+        "data": {"values": rows},
+        "mark": {"type": "line", "clip": True},
+        "encoding": {"x": x_enc, "y": y_enc, "detail": {"field": "curve"},
+                     "color": {"field": "curve", "type": "nominal", "title": None,
+                               "legend": {"orient": "bottom", "labelLimit": 400}}},
+    }]
+    if points:
+        layers.append({
+            "data": {"values": [{"point": label, "x": _round(x), "y": _round(y)} for label, x, y in points]},
+            "mark": {"type": "point", "filled": True, "size": 80, "color": "#e4572e", "clip": True},
+            "encoding": {"x": x_enc, "y": y_enc,
+                         "tooltip": [{"field": "point", "title": "Point"},
+                                     {"field": "x", "type": "quantitative"},
+                                     {"field": "y", "type": "quantitative"}]},
+        })
+    return {"height": 320, "layer": layers}
+
+def polynomial_plot(coeffs_dict, roots):
+    """
+    Spec of y = sum(c_n x^n) with its real roots marked, for the higher-degree solver.
+    coeffs_dict: {degree: coefficient}; roots: the solver's result list. None if it cannot be plotted.
+    """
+    try:
+        import numpy as np
+        import sympy as sp
+        x = sp.Symbol("x")
+        expr = sum((sp.sympify(c) * x ** d for d, c in coeffs_dict.items()), sp.Integer(0))
+        if expr.free_symbols - {x} or expr == 0:
+            return None
+        real_roots = [r for r in (_real(sp.N(root)) for root in roots) if r is not None]
+        coeffs = np.trim_zeros([float(coeffs_dict.get(d, 0)) for d in range(max(coeffs_dict), -1, -1)], "f")
+        extrema = []
+        if len(coeffs) > 2:
+            extrema = [e.real for e in np.roots(np.polyder(coeffs)) if abs(e.imag) < 1e-9]
+        x_range = _x_range(real_roots + extrema)
+        label = f"y = {sp.sstr(expr)}"
+        return _spec(((label, sp.srepr(expr)),), (), tuple((f"x{n}", r, 0.0) for n, r in enumerate(real_roots, start=1)), x_range)
+    except Exception:
+        return None
+
+def intersection_plot(type1, coeffs1, type2, coeffs2, solutions):
+    """
+    Spec of the two curves of the intersection solver with their real intersections marked.
+    Linear equations with b = 0 are drawn as vertical lines. None if they cannot be plotted.
+    """
+    try:
+        import sympy as sp
+        x, y = sp.symbols("x y")
+        curves, verticals, features = [], [], []
+        for n, (etype, coeffs) in enumerate(((type1, coeffs1), (type2, coeffs2)), start=1):
+            a, b, c = [sp.sympify(v) for v in coeffs]
+            if any(v.free_symbols for v in (a, b, c)):
+                return None
+            if etype == QUADRATIC:
+                expr = a * x ** 2 + b * x + c
+                if a != 0:
+                    features.append(float(-b / (2 * a)))
+            elif etype == LINEAR:
+                if b == 0:
+                    if a == 0:
+                        continue
+                    verticals.append((f"Eq {n}: x = {sp.sstr(c / a)}", float(c / a)))
+                    features.append(float(c / a))
+                    continue
+                expr = sp.expand((c - a * x) / b)
+            else:
+                return None
+            curves.append((f"Eq {n}: y = {sp.sstr(expr)}", sp.srepr(expr)))
+
+        points = []
+        for sol in solutions if isinstance(solutions, list) else []:
+            if isinstance(sol, dict):
+                sol = (sol.get(x), sol.get(y))
+            if not isinstance(sol, tuple) or len(sol) != 2 or None in sol:
+                continue
+            px, py = _real(sp.N(sol[0])), _real(sp.N(sol[1]))
+            if px is not None and py is not None:
+                points.append((f"P{len(points) + 1}", px, py))
+                features.append(px)
+        if not curves and not verticals:
+            return None
+        return _spec(tuple(curves), tuple(verticals), tuple(points), _x_range(features))
+    except Exception:
+        return None
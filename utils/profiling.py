@@ -0,0 +1,218 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# --- On-Demand Profiling ---
+# Opt-in cProfile capture of app.py reruns and algebra_solver calls, for reproducing
+# reports like "the solver froze". Off unless APPATY_PROFILE=1, or an admin switches it
+# on from the Profiles page (process-wide, until the server restarts).
+#
+# A run slower than APPATY_PROFILE_THRESHOLD_MS is saved to APPATY_PROFILE_DIR as
+# <id>.prof (pstats format; also opens in snakeviz etc.) and <id>.json: what ran, how
+# long, its inputs in canonical form (SymPy objects as srepr text, so a run can be
+# replayed exactly) and the nested solver calls with their own times and inputs. Only
+# the newest APPATY_PROFILE_KEEP captures are kept.
+#
+# Profiles do not nest: a solver call inside a profiled rerun is recorded as a call of
+# that rerun's capture. Solver jobs run on worker threads and are captured on their own.
+
+DIR = os.environ.get("APPATY_PROFILE_DIR", "profiles")
+THRESHOLD_MS = float(os.environ.get("APPATY_PROFILE_THRESHOLD_MS", "1000"))
+KEEP = int(os.environ.get("APPATY_PROFILE_KEEP", "50"))
+
+_enabled = os.environ.get("APPATY_PROFILE") == "1"
+_local = threading.local()  # .capture: the capture in progress on this thread
+_lock = threading.Lock()
+
+def enabled():
+    return _enabled
+
+def set_enabled(on):
+    """Switch profiling on or off for the whole process."""
+    global _enabled
+    _enabled = bool(on)
+
+def canonical(value, limit=2000):
+    """JSON-safe form of call inputs: SymPy objects as srepr, containers recursively, others as repr."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [canonical(v, limit) for v in value]
+    if isinstance(value, dict):
+        return {str(k): canonical(v, limit) for k, v in value.items()}
+    if type(value).__module__.startswith("sympy"):
+        import sympy as sp
+        return sp.srepr(value)[:limit]
+    if callable(value):
+        return f"<{type(value).__name__}>"
+    return repr(value)[:limit]
+
+@contextmanager
+def profile(kind, label, inputs=None):
+    """
+    Profile the block when profiling is on; save it if it takes THRESHOLD_MS or more.
+    inputs: canonical inputs of the run, or a function returning them (only called when on).
+    """
+    if not _enabled:
+        yield
+        return
+    if callable(inputs):
+        inputs = inputs()
+    outer = getattr(_local, "capture", None)
+    if outer is not None:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            outer["calls"].append({"kind": kind, "label": label, "inputs": inputs,
+                                   "elapsed_ms": (time.perf_counter() - start) * 1000})
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler is active (Python 3.12+ allows one per process)
+        yield
+        return
+    capture = _local.capture = {"kind": kind, "label": label, "inputs": inputs, "calls": [], "error": None,
+                                "created": time.time(), "thread": threading.current_thread().name}
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        capture["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        profiler.disable()
+        _local.capture = None
+        capture["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        if capture["elapsed_ms"] >= THRESHOLD_MS:
+            _save(capture, profiler)
+
+def note(**fields):
+    """Add fields (e.g. the page, once known) to the capture in progress on this thread."""
+    capture = getattr(_local, "capture", None)
+    if capture is not None:
+        capture.update(fields)
+
+def widget_state(state):
+    """Canonical inputs of a rerun: plain values in session state (keyed widgets), minus private keys and secrets."""
+    return {key: canonical(value, 200) for key, value in state.items()
+            if not str(key).startswith("_") and not isinstance(value, (dict, list))
+            and not any(word in str(key).lower() for word in ("password", "token"))}
+
+def profiled(fn):
+    """Decorator: profile calls of fn (kind "solver") with their canonical arguments."""
+    @functools.wraps(fn)
+    def inner(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        with profile("solver", fn.__name__, canonical({"args": args, "kwargs": kwargs})):
+            return fn(*args, **kwargs)
+    return inner
+
+# --- Capture Files ---
+
+def _save(capture, profiler):
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(capture["created"]))
+    capture["id"] = f"{stamp}-{capture['kind']}-{uuid.uuid4().hex[:8]}"
+    try:
+        with _lock:
+            os.makedirs(DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(DIR, capture["id"] + ".prof"))
+            with open(os.path.join(DIR, capture["id"] + ".json"), "w", encoding="utf-8") as f:
+                json.dump(capture, f, default=repr)
+            _rotate()
+    except OSError:
+        pass  # a full or read-only disk must not break the run
+
+def _rotate():
+    # Caller holds _lock.
+    ids = sorted(name[:-5] for name in os.listdir(DIR) if name.endswith(".json"))
+    for old in ids[:max(0, len(ids) - KEEP)]:
+        for ext in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(DIR, old + ext))
+            except FileNotFoundError:
+                pass
+
+def captures():
+    """Metadata of the saved captures, slowest first."""
+    runs = []
+    if not os.path.isdir(DIR):
+        return runs
+    for name in os.listdir(DIR):
+        if name.endswith(".json"):
+            try:
+                with open(os.path.join(DIR, name), encoding="utf-8") as f:
+                    runs.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return sorted(runs, key=lambda run: run.get("elapsed_ms", 0), reverse=True)
+
+def profile_path(capture_id):
+    return os.path.join(DIR, os.path.basename(capture_id) + ".prof")
+
+def clear():
+    """Delete all saved captures."""
+    with _lock:
+        if os.path.isdir(DIR):
+            for name in os.listdir(DIR):
+                if name.endswith((".json", ".prof")):
+                    os.remove(os.path.join(DIR, name))
+
+# --- Flame Summary ---
+# cProfile records caller -> callee edges with the time spent per edge, not full
+# stacks, so the tree below expands each function by its callees' time *from that
+# caller*. Recursive and shared callees make it approximate, like any flame graph
+# built from pstats, but the hot path reads the same.
+
+def _function_name(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-ins, e.g. "<built-in method time.sleep>"
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def flame(capture_id, max_depth=14, min_fraction=0.01):
+    """Rows {"depth", "function", "ms", "self_ms", "fraction"} of the call tree, hottest branch first."""
+    stats = pstats.Stats(profile_path(capture_id)).stats
+    children = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, tt, ct) in callers.items():
+            children.setdefault(caller, []).append((func, tt, ct))
+    # Roots: entered from frames that were already running when the profiler started.
+    roots = []
+    for func, (_, _, tt, ct, callers) in stats.items():
+        outside = [edge for caller, edge in callers.items() if caller not in stats]
+        if not callers:
+            roots.append((func, tt, ct))
+        elif outside:
+            roots.append((func, sum(edge[2] for edge in outside), sum(edge[3] for edge in outside)))
+    total = sum(ct for _, _, ct in roots) or 1e-9
+    rows = []
+
+    def walk(nodes, depth, path):
+        for func, tt, ct in sorted(nodes, key=lambda node: node[2], reverse=True):
+            if ct / total < min_fraction:
+                break
+            rows.append({"depth": depth, "function": _function_name(func), "ms": ct * 1000,
+                         "self_ms": tt * 1000, "fraction": ct / total})
+            if depth + 1 < max_depth and func not in path:
+                walk(children.get(func, []), depth + 1, path | {func})
+
+    walk(roots, 0, frozenset())
+    return rows
+
+def top_functions(capture_id, limit=25):
+    """The functions with the most own (self) time."""
+    stats = pstats.Stats(profile_path(capture_id)).stats
+    rows = [{"function": _function_name(func), "calls": nc, "self_ms": tt * 1000, "ms": ct * 1000}
+            for func, (_, nc, tt, ct, _) in stats.items()]
+    return sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:limit]
@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# --- Token Bucket Rate Limiter ---
+# In-memory, per process. Each key (e.g. "user:alice", "ip:10.0.0.7") gets a bucket
+# of CAPACITY tokens that refills at REFILL_PER_S; a login attempt spends one token.
+# Buckets are kept in a bounded LRU so a flood of distinct keys cannot grow memory.
+
+CAPACITY = float(os.environ.get("APPATY_LOGIN_BURST", "5"))
+REFILL_PER_S = float(os.environ.get("APPATY_LOGIN_PER_MINUTE", "5")) / 60.0
+MAX_KEYS = 100_000
+
+_buckets = OrderedDict()  # key -> [tokens, last_refill]
+_lock = threading.Lock()
+
+def _bucket(key, now):
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _buckets[key] = [CAPACITY, now]
+        if len(_buckets) > MAX_KEYS:
+            _buckets.popitem(last=False)
+    else:
+        bucket[0] = min(CAPACITY, bucket[0] + (now - bucket[1]) * REFILL_PER_S)
+        bucket[1] = now
+        _buckets.move_to_end(key)
+    return bucket
+
+def acquire(*keys):
+    """
+    Spend one token from every bucket in `keys`, all or nothing.
+    Returns 0.0 when allowed, otherwise the seconds to wait before retrying.
+    """
+    keys = [k for k in keys if k]
+    now = time.monotonic()
+    with _lock:
+        buckets = [_bucket(k, now) for k in keys]
+        short = [b for b in buckets if b[0] < 1.0]
+        if short:
+            return max((1.0 - b[0]) / REFILL_PER_S for b in short)
+        for b in buckets:
+            b[0] -= 1.0
+    return 0.0
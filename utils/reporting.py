@@ -1,6 +1,9 @@
-
-import pandas as pd
 import io
+import csv
+import itertools
+import tempfile
+from datetime import datetime
+from utils import db, retention
 
 def generate_csv_report(history):
     """
@@ -9,9 +12,10 @@ def generate_csv_report(history):
     """
     if not history:
         return ""
-    
-    df = pd.DataFrame(history)
-    return df.to_csv(index=False)
+
+    out = io.StringIO()
+    write_csv_report(history, out)
+    return out.getvalue()
 
 def generate_txt_report(history):
     """
@@ -19,8 +23,70 @@ def generate_txt_report(history):
     """
     if not history:
         return "No calculations performed."
-        
-    report = "APPATY Session Report\n=====================\n\n"
-    for item in history:
-        report += f"[{item['timestamp']}] {item['calculation']} = {item['result']}\n"
-    return report
+
+    out = io.StringIO()
+    write_txt_report(history, out, title="APPATY Session Report")
+    return out.getvalue()
+
+# --- Database & Archived History ---
+
+def _report_item(row):
+    return {
+        'timestamp': datetime.fromtimestamp(row['ts']).strftime("%Y-%m-%d %H:%M:%S"),
+        'calculation': row['calc_name'],
+        'result': row['result'],
+    }
+
+def iter_db_history(user_id, calc_name=None, since=None, until=None, include_archive=False):
+    """
+    Stream a user's history from the database as report items, newest first, in chunks.
+    include_archive: follow with the rows already moved to the archive files (oldest first).
+    """
+    items = (_report_item(row) for row in db.iter_history(user_id, calc_name=calc_name, since=since, until=until))
+    if include_archive:
+        items = itertools.chain(items, iter_archived_history(user_id, calc_name=calc_name, since=since, until=until))
+    return items
+
+def iter_archived_history(user_id, calc_name=None, since=None, until=None):
+    """
+    Stream archived history rows as report items, reading the archive files lazily.
+    Yields dictionaries shaped like the session history entries.
+    """
+    for row in retention.iter_archive(user_id, since=since, until=until, calc_name=calc_name):
+        yield _report_item(row)
+
+def write_csv_report(items, out):
+    """Write report items to a text file object one row at a time."""
+    writer = csv.DictWriter(out, fieldnames=['timestamp', 'calculation', 'result'], extrasaction='ignore')
+    writer.writeheader()
+    for item in items:
+        writer.writerow(item)
+
+def write_txt_report(items, out, title="APPATY History Report"):
+    """Write report items to a text file object one line at a time."""
+    out.write(f"{title}\n{'=' * len(title)}\n\n")
+    for item in items:
+        out.write(f"[{item['timestamp']}] {item['calculation']} = {item['result']}\n")
+
+def export_report(items, fmt="csv", title="APPATY History Report"):
+    """
+    Write report items through a temporary file and return the report as bytes for st.download_button.
+    Peak memory grows with the size of the finished report: the button keeps the whole file in memory
+    (file objects are read into bytes too). Streaming only avoids holding every row as Python objects
+    while the report is written; the text spills to disk past a few MB and is read back once.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as spool:
+        out = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        if fmt == "csv":
+            write_csv_report(items, out)
+        else:
+            write_txt_report(items, out, title=title)
+        out.flush()
+        out.detach()
+        spool.seek(0)
+        return spool.read()
+
+def history_download(user_id, fmt, calc_name=None, since=None, until=None, include_archive=False):
+    """Deferred download callable of the History page: the user's filtered history as a CSV/TXT report."""
+    return export_report(iter_db_history(user_id, calc_name=calc_name, since=since, until=until,
+                                         include_archive=include_archive), fmt)
@@ -0,0 +1,165 @@
+import argparse
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timezone
+from utils import db
+
+# --- History Retention ---
+# Rows older than RETENTION_DAYS move out of SQLite into gzip JSONL files, one per
+# user and UTC day (archive/history/YYYY-MM-DD/<user_id>.jsonl.gz), so reading one
+# user's archive never decompresses anyone else's rows. The history_archive table is
+# the lookup index: which days hold rows for which user, how many and their ts range.
+# A batch is merged into its partitions (rewritten to a temporary file, fsynced and
+# renamed over the old one) before its rows are deleted. Rows already in a partition
+# are not added again and the index stores each partition's totals, so re-running
+# after a crash between the two steps neither loses nor duplicates rows.
+#
+# Archives written before partitions were per user (one shared YYYY-MM-DD.jsonl.gz
+# per day) are still read.
+#
+# Run from cron / a sidecar:  python -m utils.retention --days 90
+
+ARCHIVE_DIR = os.environ.get("APPATY_ARCHIVE_DIR", "archive")
+RETENTION_DAYS = int(os.environ.get("APPATY_HISTORY_RETENTION_DAYS", "90"))
+JOB_RESULT_DAYS = int(os.environ.get("APPATY_JOB_RESULT_DAYS", "30"))
+BATCH_SIZE = 5000
+VACUUM_PAGES = 2000
+ARCHIVE_COLUMNS = ("id", "user_id", "calc_name", "result", "ts", "kind", "value", "unit", "payload")
+
+def _day_of(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+def partition_path(day, user_id):
+    return os.path.join(ARCHIVE_DIR, "history", day, f"{user_id}.jsonl.gz")
+
+def _shared_partition_path(day):
+    """One file for all users' rows of a day: the layout before partitions were per user."""
+    return os.path.join(ARCHIVE_DIR, "history", f"{day}.jsonl.gz")
+
+def _read_partition(path):
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            yield json.loads(line)
+
+def _merge_partition(day, user_id, rows):
+    """
+    Add rows to a user's partition for day, skipping ids it already holds, and replace the
+    file atomically. Returns (rows, min_ts, max_ts) of the whole partition.
+    """
+    path = partition_path(day, user_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    merged = list(_read_partition(path))
+    have = {r["id"] for r in merged}
+    merged += [dict(zip(ARCHIVE_COLUMNS, r)) for r in rows if r[0] not in have]
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            for r in merged:
+                gz.write((json.dumps(r, separators=(",", ":")) + "\n").encode("utf-8"))
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return len(merged), min(r["ts"] for r in merged), max(r["ts"] for r in merged)
+
+def archive_history(max_age_days=None, batch_size=BATCH_SIZE, now=None):
+    """Move history rows older than max_age_days into the archive. Returns rows moved."""
+    if max_age_days is None:
+        max_age_days = RETENTION_DAYS
+    cutoff = int((now if now is not None else time.time()) - max_age_days * 86400)
+    moved = 0
+    while True:
+        # ids grow with time, so walking the rowid finds the old rows first.
+        with db.connection() as conn:
+            rows = conn.execute(f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM history "
+                                "WHERE ts < ? ORDER BY id LIMIT ?", (cutoff, batch_size)).fetchall()
+        if not rows:
+            return moved
+
+        partitions = {}
+        for r in rows:
+            partitions.setdefault((r[1], _day_of(r[4])), []).append(r)
+        # rows is the partition's total; the ts range only widens, so it still covers rows
+        # of that day in a shared file of the older layout.
+        index = [(user_id, day) + _merge_partition(day, user_id, part_rows)
+                 for (user_id, day), part_rows in partitions.items()]
+
+        with db.connection() as conn, conn:
+            conn.executemany("DELETE FROM history WHERE id = ?", [(r[0],) for r in rows])
+            conn.executemany('''INSERT INTO history_archive (user_id, day, rows, min_ts, max_ts)
+                                VALUES (?, ?, ?, ?, ?)
+                                ON CONFLICT (user_id, day) DO UPDATE SET
+                                    rows = excluded.rows,
+                                    min_ts = CASE WHEN excluded.min_ts < history_archive.min_ts
+                                                  THEN excluded.min_ts ELSE history_archive.min_ts END,
+                                    max_ts = CASE WHEN excluded.max_ts > history_archive.max_ts
+                                                  THEN excluded.max_ts ELSE history_archive.max_ts END''',
+                             index)
+        moved += len(rows)
+
+def iter_archive(user_id, since=None, until=None, calc_name=None):
+    """
+    Stream a user's archived rows (oldest day first) straight from the partition files.
+    calc_name: only rows whose calc_name starts with this text (as db.iter_history).
+    """
+    sql = "SELECT day FROM history_archive WHERE user_id = ?"
+    params = [user_id]
+    if since is not None:
+        sql += " AND max_ts >= ?"
+        params.append(since)
+    if until is not None:
+        sql += " AND min_ts < ?"
+        params.append(until)
+    with db.connection() as conn:
+        days = [r[0] for r in conn.execute(sql + " ORDER BY day", params)]
+
+    for day in days:
+        seen = set()
+        for path in (partition_path(day, user_id), _shared_partition_path(day)):
+            for row in _read_partition(path):
+                if row["user_id"] != user_id or row["id"] in seen:
+                    continue
+                if (since is not None and row["ts"] < since) or (until is not None and row["ts"] >= until):
+                    continue
+                if calc_name and not row["calc_name"].startswith(calc_name):
+                    continue
+                seen.add(row["id"])
+                yield row
+
+def vacuum(pages=VACUUM_PAGES):
+    """
+    Return up to `pages` free pages to the OS. Switches to incremental mode on first use.
+    SQLite only; Postgres reclaims space through autovacuum. Returns the remaining free pages.
+    """
+    if db.backend_name() != "sqlite":
+        return None
+    with db.connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # auto_vacuum only changes through a full rebuild; this happens once.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old APPATY history and reclaim space.")
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS, help="keep this many days in the database")
+    parser.add_argument("--job-result-days", type=int, default=JOB_RESULT_DAYS,
+                        help="keep persisted solver results (job_results) this many days")
+    parser.add_argument("--vacuum-pages", type=int, default=VACUUM_PAGES)
+    args = parser.parse_args()
+
+    db.init_db()
+    moved = archive_history(args.days)
+    dropped = db.purge_job_results(int(time.time()) - args.job_result_days * 86400)
+    free = vacuum(args.vacuum_pages)
+    print(f"Archived {moved} rows older than {args.days} days.")
+    print(f"Dropped {dropped} job results older than {args.job_result_days} days.")
+    if free is not None:
+        print(f"{free} free pages left after incremental vacuum.")
+
+if __name__ == "__main__":
+    main()
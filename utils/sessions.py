@@ -0,0 +1,168 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from utils import db
+
+# --- Server-Side Sessions ---
+# A session token is "<sid>.<sig>": a random id plus an HMAC of it, so forged or
+# mangled tokens are rejected before touching the database. The sessions table
+# stores sha256(sid), never the sid itself. Live sessions sit in a bounded LRU and
+# are re-validated against the database every RECHECK_S, so a revocation made on
+# another replica takes effect within that window.
+#
+# The token is kept in an HttpOnly, SameSite=Strict cookie (never in the URL) and
+# read back from st.context.cookies when the browser reloads. A Streamlit script
+# cannot set cookies, so the page hands the token over through a one-time nonce:
+# handoff() parks it server-side for HANDOFF_TTL_S, the page POSTs the nonce to
+# server.py's /auth/session route, and redeem() gives the route the cookie to set
+# (or clear, after logout). Under `streamlit run app.py` there is no such route, so
+# a login lasts for the browser session only.
+
+COOKIE_NAME = "appaty_session"
+HANDOFF_TTL_S = 60
+# Set by server.py, the only entry point that can set the cookie.
+COOKIE_ROUTE = os.environ.get("APPATY_SESSION_COOKIE") == "1"
+
+SESSION_TTL_S = int(os.environ.get("APPATY_SESSION_TTL_S", str(12 * 3600)))
+REMEMBER_TTL_S = int(os.environ.get("APPATY_REMEMBER_TTL_S", str(30 * 86400)))
+LRU_SIZE = 10_000
+RECHECK_S = 60
+PURGE_EVERY_S = 600
+
+_lru = OrderedDict()  # sha256(sid) -> (user_id, expires_at, recheck_at)
+_handoffs = {}  # nonce -> (token or None to clear, cookie max-age or None, expires_at)
+_lock = threading.Lock()
+_secret = None
+_last_purge = 0.0
+
+def _get_secret():
+    """APPATY_SESSION_SECRET, or a random secret generated once and shared through the database."""
+    global _secret
+    if _secret is None:
+        value = os.environ.get("APPATY_SESSION_SECRET")
+        if not value:
+            with db.connection() as conn, conn:
+                conn.execute("INSERT INTO app_settings (key, value) VALUES (?, ?) ON CONFLICT (key) DO NOTHING",
+                             ("session_secret", secrets.token_hex(32)))
+                value = conn.execute("SELECT value FROM app_settings WHERE key = ?", ("session_secret",)).fetchone()[0]
+        _secret = value.encode("utf-8")
+    return _secret
+
+def _sign(sid):
+    digest = hmac.new(_get_secret(), sid.encode("utf-8"), hashlib.sha256).digest()[:18]
+    return base64.urlsafe_b64encode(digest).decode("ascii")
+
+def _verify(token):
+    """Return the sid if the token's signature checks out, else None."""
+    sid, _, sig = (token or "").partition(".")
+    if not sid or not sig or not hmac.compare_digest(_sign(sid), sig):
+        return None
+    return sid
+
+def _key(sid):
+    return hashlib.sha256(sid.encode("utf-8")).hexdigest()
+
+def _remember(key, user_id, expires_at, now):
+    with _lock:
+        _lru[key] = (user_id, expires_at, now + RECHECK_S)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+def create(user_id, remember=False):
+    """Start a session for user_id and return its signed token."""
+    now = int(time.time())
+    expires_at = now + (REMEMBER_TTL_S if remember else SESSION_TTL_S)
+    sid = secrets.token_urlsafe(24)
+    with db.connection() as conn, conn:
+        conn.execute("INSERT INTO sessions (id, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                     (_key(sid), user_id, now, expires_at))
+    _remember(_key(sid), user_id, expires_at, now)
+    _maybe_purge(now)
+    return f"{sid}.{_sign(sid)}"
+
+def restore(token):
+    """Return the user record for a valid, unexpired token, or None."""
+    sid = _verify(token)
+    if sid is None:
+        return None
+    key = _key(sid)
+    now = time.time()
+    with _lock:
+        entry = _lru.get(key)
+    if entry is None or entry[2] <= now:
+        with db.connection() as conn:
+            row = conn.execute("SELECT user_id, expires_at FROM sessions WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            with _lock:
+                _lru.pop(key, None)
+            return None
+        _remember(key, row[0], row[1], now)
+        entry = (row[0], row[1])
+    if entry[1] <= now:
+        revoke(token)
+        return None
+    return db.get_user_by_id(entry[0])
+
+def revoke(token):
+    """End one session (logout)."""
+    sid = _verify(token)
+    if sid is None:
+        return
+    key = _key(sid)
+    with _lock:
+        _lru.pop(key, None)
+    with db.connection() as conn, conn:
+        conn.execute("DELETE FROM sessions WHERE id = ?", (key,))
+
+def revoke_user(user_id):
+    """End every session of a user at once. Returns the number of sessions removed."""
+    with _lock:
+        for key in [k for k, v in _lru.items() if v[0] == user_id]:
+            del _lru[key]
+    with db.connection() as conn, conn:
+        return conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,)).rowcount
+
+def purge_expired(now=None):
+    """Delete every expired session in one statement. Returns the number removed."""
+    now = int(now if now is not None else time.time())
+    with _lock:
+        for key in [k for k, v in _lru.items() if v[1] <= now]:
+            del _lru[key]
+    with db.connection() as conn, conn:
+        return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,)).rowcount
+
+def _maybe_purge(now):
+    global _last_purge
+    if now - _last_purge < PURGE_EVERY_S:
+        return
+    _last_purge = now
+    purge_expired(now)
+
+# --- Cookie Handoff ---
+
+def handoff(token, max_age=None):
+    """
+    Park a token (None: clear the cookie) for the /auth/session route and return its one-time nonce.
+    max_age: cookie lifetime in seconds; None for a browser-session cookie.
+    """
+    nonce = secrets.token_urlsafe(24)
+    now = time.time()
+    with _lock:
+        for stale in [n for n, entry in _handoffs.items() if entry[2] <= now]:
+            del _handoffs[stale]
+        _handoffs[nonce] = (token, max_age, now + HANDOFF_TTL_S)
+    return nonce
+
+def redeem(nonce):
+    """The (token, max_age) parked under nonce, once; None if unknown, used or expired."""
+    with _lock:
+        entry = _handoffs.pop(nonce or "", None)
+    if entry is None or entry[2] <= time.time():
+        return None
+    return entry[0], entry[1]
@@ -1,161 +1,112 @@
+import functools
+import hashlib
+import json
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 
-def inject_custom_css():
-    """Inject CSS for mobile responsiveness and touch-friendly targets."""
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600&family=Roboto:wght@400;500&display=swap');
+# --- Static Assets ---
+# The theme CSS and the client helpers live in static/ (served at /app/static, see
+# .streamlit/config.toml) and are added to the page <head> by one small bootstrap
+# script, once per session: the browser keeps them across reruns, so later reruns
+# send nothing. URLs carry a content hash, so an edited file is fetched again while an
+# unchanged one is served from the browser cache (revalidated by ETag). Each tag has an
+# id and is only added if missing, and static/appaty.js binds its listeners once on
+# the document, so a repeated bootstrap (e.g. a reloaded tab) adds nothing.
+#
+# Without static serving (server.enableStaticServing = false) the same files are
+# inlined into the bootstrap instead, and the theme falls back to system fonts.
+#
+# Under server.py the page also registers the service worker (static/sw.js, served at
+# /sw.js), which precaches the shell assets, icons and fonts and keeps the app shell
+# available offline.
 
-        /* Global Theme: Deep Midnight Blue */
-        .stApp {
-            background-color: #0A0E1A;
-            font-family: 'Inter', sans-serif;
-        }
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "app/static/"
+CSS_FILE = "appaty.css"
+JS_FILE = "appaty.js"
+MANIFEST_FILE = "manifest.json"
+APPLE_ICON_FILE = "icons/apple-touch-icon.png"
+SW_FILE = "sw.js"
+PRECACHE = [CSS_FILE, JS_FILE, MANIFEST_FILE, "icons/icon-192.png", "icons/icon-512.png", APPLE_ICON_FILE]
+FONTS = ["fonts/inter-400.woff2", "fonts/inter-600.woff2"]  # requested by appaty.css and the converter, unversioned
 
-        /* Typography */
-        h1, h2, h3, h4, h5, h6, p, div, span, label {
-            color: #E2E8F0 !important;
-        }
+# Set by server.py, the only entry point that can serve the worker from the app root.
+SERVICE_WORKER = os.environ.get("APPATY_SERVICE_WORKER") == "1"
 
-        /* Primary Buttons */
-        .stButton > button {
-            background-color: #1D63FF !important;
-            color: white !important;
-            border: none;
-            border-radius: 8px;
-            min-height: 48px; /* Touch target */
-            font-weight: 600;
-            transition: all 0.2s ease;
-        }
-        .stButton > button:hover {
-            background-color: #3B75FF !important;
-            transform: translateY(-1px);
-            box-shadow: 0 4px 12px rgba(29, 99, 255, 0.3);
-        }
-        .stButton > button:active {
-            transform: translateY(0);
-        }
+META_TAGS = {
+    "apple-mobile-web-app-capable": "yes",
+    "mobile-web-app-capable": "yes",
+    "apple-mobile-web-app-status-bar-style": "black-translucent",
+    "theme-color": "#0E1117",
+    "apple-mobile-web-app-title": "APPATY",
+}
 
-        /* Input Fields */
-        .stTextInput input, .stNumberInput input, .stSelectbox div[data-baseweb="select"] {
-            background-color: #171F2E !important;
-            border: 1px solid #1F2937 !important;
-            border-radius: 12px !important;
-            color: #E2E8F0 !important;
-            min-height: 48px; /* Touch target */
-        }
-        .stTextInput input:focus, .stNumberInput input:focus {
-            border-color: #1D63FF !important;
-            box-shadow: 0 0 0 2px rgba(29, 99, 255, 0.2) !important;
-        }
+_BOOTSTRAP = """
+<script>
+(function () {
+  const doc = window.parent.document;
+  const add = (tag, id, attrs, text) => {
+    if (doc.getElementById(id)) return;
+    const el = doc.createElement(tag);
+    el.id = id;
+    Object.entries(attrs).forEach(([k, v]) => el.setAttribute(k, v));
+    if (text) el.textContent = text;
+    doc.head.appendChild(el);
+  };
+  const assets = %s;
+  Object.entries(assets.meta).forEach(([name, content]) =>
+    add("meta", "appaty-meta-" + name, {name: name, content: content}));
+  if (assets.manifest) add("link", "appaty-manifest", {rel: "manifest", href: assets.manifest});
+  if (assets.icon) add("link", "appaty-icon", {rel: "apple-touch-icon", href: assets.icon});
+  if (assets.css) add("link", "appaty-css", {rel: "stylesheet", href: assets.css});
+  else add("style", "appaty-css", {}, assets.css_text);
+  if (assets.js) add("script", "appaty-js", {src: assets.js});
+  else add("script", "appaty-js", {}, assets.js_text);
+  const nav = window.parent.navigator;
+  if (assets.sw && "serviceWorker" in nav) {
+    nav.serviceWorker.register(new URL(assets.sw, doc.baseURI).href).catch(() => {});
+  }
+})();
+</script>
+"""
 
-        /* Mobile Layout Optimizations */
-        @media (max-width: 600px) {
-            [data-testid="column"] {
-                width: 100% !important;
-                flex: 1 1 auto !important;
-                min-width: 100% !important;
-            }
-            .stButton > button {
-                width: 100% !important;
-            }
-        }
-        
-        /* Sidebar Navigation Drawer Feel */
-        [data-testid="stSidebar"] {
-            background-color: #0F1423;
-            border-right: 1px solid #1F2937;
-        }
+def _read(name, mode="r"):
+    with open(os.path.join(STATIC_DIR, name), mode, **({} if "b" in mode else {"encoding": "utf-8"})) as fh:
+        return fh.read()
 
-        /* --- VISIBILITY FIXES --- */
-        /* Global Text and Headers */
-        html, body, [data-testid="stWidgetLabel"], .stMarkdown, p, label {
-            color: #E0E0E0 !important;
-        }
-        h1, h2, h3, h4, h5, h6 {
-            color: #FFFFFF !important;
-        }
+@functools.lru_cache(maxsize=None)
+def asset_url(name):
+    """URL of a static file, relative to the app root, with a content-hash version."""
+    version = hashlib.sha256(_read(name, "rb")).hexdigest()[:12]
+    return f"{STATIC_URL}{name}?v={version}"
 
-        /* Selectbox Styling - Main View */
-        div[data-baseweb="select"] > div {
-            color: white !important; 
-            background-color: #171F2E !important;
-        }
+def precache_urls():
+    """URLs the service worker caches on install, exactly as the page requests them."""
+    return [asset_url(name) for name in PRECACHE] + [STATIC_URL + name for name in FONTS]
 
-        /* Dropdown menu options visibility */
-        div[data-baseweb="popover"] li, div[data-baseweb="popover"] div {
-            color: #111827 !important; /* Dark text for light dropdown background provided by browser/streamlit defaults */
-        }
-        
-        /* Ensure specific widget labels are visible */
-        .stNumberInput label, .stSelectbox label, .stTextInput label {
-            color: #E2E8F0 !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+def asset_version():
+    """One hash over all precached files; changes whenever any of them does."""
+    return hashlib.sha256("".join(asset_url(name) for name in PRECACHE + FONTS).encode("utf-8")).hexdigest()[:12]
 
-def inject_pwa_meta():
-    """Inject Meta tags for PWA support."""
-    meta_tags = """
-    <!-- Mobile Web App Capable -->
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-    <meta name="theme-color" content="#0E1117">
-    <meta name="viewport" content="width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no">
-    
-    <!-- Title -->
-    <meta name="apple-mobile-web-app-title" content="APPATY">
-    
-    <!-- Link to Manifest -->
-    <link rel="manifest" href="static/manifest.json">
-    """
-    st.markdown(meta_tags, unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def _assets(static_serving):
+    """Bootstrap payload: versioned URLs when static serving is on, inline text otherwise."""
+    assets = {"meta": META_TAGS, "manifest": None, "icon": None, "css": None, "js": None, "sw": None}
+    for key, name in (("css", CSS_FILE), ("js", JS_FILE)):
+        if static_serving:
+            assets[key] = asset_url(name)
+        else:
+            assets[f"{key}_text"] = _read(name)
+    if static_serving:
+        assets["manifest"] = asset_url(MANIFEST_FILE)
+        assets["icon"] = asset_url(APPLE_ICON_FILE)
+        assets["sw"] = SW_FILE if SERVICE_WORKER else None
+    return _BOOTSTRAP % json.dumps(assets)
 
-def inject_haptics():
-    """Inject JS for haptic feedback mockup."""
-    js = """
-    <script>
-        // Haptic Feedback Mockup
-        const vibrate = () => {
-            if (navigator.vibrate) {
-                navigator.vibrate(50); // 50ms vibration
-            }
-        };
-        
-        // Attach to all buttons once loaded
-        document.addEventListener('DOMContentLoaded', () => {
-            const buttons = document.querySelectorAll('button');
-            buttons.forEach(btn => {
-                btn.addEventListener('click', vibrate);
-            });
-        });
-    </script>
-    """
-    # Streamlit html component might be needed for script execution if markdown doesn't persist
-    # But for simple p.o.c markdown often works or st.components.v1.html
-    st.components.v1.html(js, height=0, width=0)
-
-def inject_auto_select_js():
-    """Inject JS to auto-select input text on focus."""
-    js = """
-    <script>
-    // Auto-select text in number inputs on focus
-    const observeInputs = () => {
-        const inputs = window.parent.document.querySelectorAll('input[type="number"]');
-        inputs.forEach(input => {
-            input.addEventListener('focus', () => {
-                input.select();
-            });
-        });
-    };
-    
-    // Initial run
-    observeInputs();
-    
-    // Re-run on DOM changes (Streamlit updates)
-    const observer = new MutationObserver(observeInputs);
-    observer.observe(window.parent.document.body, { childList: true, subtree: true });
-    </script>
-    """
-    st.components.v1.html(js, height=0, width=0)
+def inject_assets():
+    """Add the theme CSS, PWA meta tags and client JS to the page, once per session."""
+    if st.session_state.get("_ux_assets"):
+        return
+    st.session_state._ux_assets = True
+    components.html(_assets(bool(st.get_option("server.enableStaticServing"))), height=0, width=0)
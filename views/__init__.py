@@ -0,0 +1,38 @@
+import importlib
+import time
+from utils import metrics
+
+# --- Page Registry ---
+# Each page is a module in views/ exposing render(). app.py only renders the shell
+# (sidebar, navigation); the selected page module, and whatever it imports (e.g. SymPy
+# for the solvers, pandas for the dashboard), is imported the first time it is opened.
+
+PAGES = {
+    "📐 Dimensions": "dimensions",
+    "⚡ Power": "power",
+    "🌡️ Temperature": "temperature",
+    "🎈 Pressure": "pressure",
+    "💡 Electricity": "electricity",
+    "💰 Energy Cost": "energy_cost",
+    "🔥 Thermodynamics": "thermodynamics",
+    "🧮 Equation Solver": "equation_solver",
+    "🌌 Universal Solver": "universal_solver",
+    "🗂️ History": "history",
+}
+
+ADMIN_PAGES = {
+    "📈 Usage Analytics": "usage",
+    "🔬 Profiles": "profiles",
+}
+
+def labels(admin=False):
+    """Navigation entries, in menu order."""
+    return list(PAGES) + (list(ADMIN_PAGES) if admin else [])
+
+def render(label):
+    """Import (on first use) and render a page. Returns the time taken in ms."""
+    start = time.perf_counter()
+    name = PAGES.get(label) or ADMIN_PAGES[label]
+    with metrics.timer("appaty_page_render_seconds", page=name):
+        importlib.import_module(f"views.{name}").render()
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,72 @@
+import streamlit as st
+import utils.history_writer as history_writer
+
+# Helpers shared by the pages in views/.
+
+# Helper to save history if logged in
+# kind/value/unit/inputs/solution are stored as typed columns (see utils/history_codec.py)
+def save_log(calc_name, result, kind=None, value=None, unit=None, inputs=None, solution=None):
+    if st.session_state.user:
+        history_writer.enqueue(st.session_state.user['id'], calc_name, result,
+                               kind=kind, value=value, unit=unit, inputs=inputs, solution=solution)
+    else:
+        st.toast("🔐 Login to Save History")
+
+def save_conversion(calc_name, result, kind, saved, inputs=None):
+    """Log a conversion saved from the in-browser converter (see utils/converter.py)."""
+    save_log(calc_name, result, kind=kind, value=saved["result"], unit=saved["to"],
+             inputs=inputs or {"value": saved["value"], "from": saved["from"], "to": saved["to"]})
+    if st.session_state.user:
+        st.toast("✅ Saved to History")
+
+def render_ad_slot(position='top'):
+    """Renders a consistent advertisement slot."""
+    is_premium = False
+    if st.session_state.user and st.session_state.user.get('is_premium'):
+        is_premium = True
+    
+    if not is_premium:
+        if position == 'top':
+            height = "60px"
+            content = "<strong>📢 ADVERTISEMENT</strong> - Support APPATY"
+        else: # bottom
+            height = "100px"
+            content = "<strong>🚀 Upgrade to Premium</strong><br><span style='font-size:0.8em'>for an Ad-Free Experience and Advanced Tools!</span>"
+
+        st.markdown(
+            f"""
+            <div style="border: 1px solid #ddd; background-color: #f9f9f9; padding: 10px; 
+                        text-align: center; margin: 20px 0; border-radius: 5px; height: {height}; 
+                        display: flex; align-items: center; justify-content: center; color: #555;">
+                <div>
+                    {content}
+                </div>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+
+# Helper for smart formatting
+smart_fmt = lambda x: f"{x:.8f}".rstrip('0').rstrip('.')
+
+def format_res(val):
+    import sympy as sp
+    """Helper to format symbolic value with decimal approx."""
+    try:
+        # Calculate decimal
+        dec = val.evalf(3)
+
+        # Check if complex
+        if dec.is_complex and not dec.is_real:
+             # Format complex: a +/- bi
+             re = float(sp.re(dec))
+             im = float(sp.im(dec))
+             sign = "+" if im >= 0 else "-"
+             im_abs = abs(im)
+             dec_str = f"{re:.3f} {sign} {im_abs:.3f}i"
+        else:
+             dec_str = f"{float(dec):.3f}"
+
+        return f"{sp.latex(val)} \\approx {dec_str}"
+    except:
+        return str(val)
@@ -0,0 +1,21 @@
+import streamlit as st
+import utils.analytics as analytics
+from utils.converter import unit_converter
+from views.common import save_conversion, render_ad_slot, smart_fmt
+
+def render():
+    """Length, area and volume conversions (converted in the browser; see utils/converter.py)."""
+    render_ad_slot()
+    st.header("Unit Conversions")
+    subtabs = st.tabs(["Length", "Area", "Volume"])
+
+    for tab, (kind, label) in zip(subtabs, [("length", "Length"), ("area", "Area"), ("volume", "Volume")]):
+        with tab:
+            saved = unit_converter(kind, key=f"{kind}_conv")
+            if saved:
+                with analytics.track(kind):
+                    res_str = f"{smart_fmt(saved['result'])} {saved['to']}"
+                    save_conversion(f"{label}: {saved['value']}{saved['from']} -> {saved['to']}", res_str, kind, saved)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
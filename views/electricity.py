@@ -0,0 +1,32 @@
+import streamlit as st
+import utils.calculators as calc
+import utils.analytics as analytics
+from views.common import save_log, render_ad_slot, smart_fmt
+
+def render():
+    """Ohm's law calculator."""
+    render_ad_slot()
+    st.header("Electrical Engineering")
+    st.subheader("Ohm's Law")
+    st.latex(r'V = I \cdot R')
+    
+    col1, col2 = st.columns(2)
+    target = col1.selectbox("Target", ["V", "I", "R"], key="ohm_target")
+    
+    inputs = {}
+    if target != 'V': inputs['V'] = col2.number_input("Voltage (V)", value=0.0, key="ohm_v", format="%.4f")
+    if target != 'I': inputs['I'] = col2.number_input("Current (I)", value=0.0, key="ohm_i", format="%.4f")
+    if target != 'R': inputs['R'] = col2.number_input("Resistance (Ω)", value=0.0, key="ohm_r", format="%.4f")
+    
+    if st.button("Calculate Ohm", key="ohm_btn", use_container_width=True):
+        with analytics.track("ohm"):
+            res = calc.calculate_ohm_general(target, **inputs)
+            unit_map = {'V': 'V', 'I': 'A', 'R': 'Ω'}
+            if res is not None:
+                res_str = smart_fmt(res)
+                st.markdown(f"### Result: {res_str} {unit_map[target]}")
+                save_log(f"Ohm {target}", f"{res_str} {unit_map[target]}",
+                         kind="ohm", value=res, unit=unit_map[target], inputs=dict(inputs, target=target))
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,37 @@
+import streamlit as st
+import utils.calculators as calc
+import utils.analytics as analytics
+from views.common import save_log, render_ad_slot, smart_fmt
+
+def render():
+    """Monthly appliance energy cost."""
+    render_ad_slot()
+    st.header("Appliance Energy Cost")
+    st.caption("Calculate monthly cost based on usage.")
+    
+    # Currency Selection
+    curr_map = {"TL": "₺", "USD": "$", "EUR": "€", "GBP": "£"}
+    col1, col2 = st.columns(2)
+    currency = col1.selectbox("Currency", list(curr_map.keys()), key="cost_curr")
+    sym = curr_map[currency]
+    
+    watts = col2.number_input("Power Rating (Watts)", 0.0, key="cost_watts", format="%.4f")
+    hours = col1.number_input("Hours used per day", 0.0, key="cost_hours", format="%.4f")
+    price = col2.number_input(f"Unit Price ({currency}/kWh)", 0.0, format="%.4f", key="cost_price")
+    
+    if st.button("Calculate Cost", key="cost_btn", use_container_width=True):
+        with analytics.track("appliance_cost"):
+            dkwh, dcost, mcost = calc.calculate_appliance_cost(watts, hours, price)
+            if dkwh:
+                dkwh_str = smart_fmt(dkwh)
+                dcost_str = smart_fmt(dcost)
+                mcost_str = smart_fmt(mcost)
+            
+                st.success(f"Daily Usage: {dkwh_str} kWh")
+                st.info(f"Daily Cost: {dcost_str} {sym}")
+                st.markdown(f"### Total Monthly Cost: {mcost_str} {sym}")
+                save_log("Appliance Cost", f"{mcost_str} {sym}/mo", kind="appliance_cost", value=mcost, unit=f"{currency}/mo",
+                         inputs={"watts": watts, "hours": hours, "price": price, "currency": currency})
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,188 @@
+import streamlit as st
+import utils.algebra_solver as algebra
+import utils.analytics as analytics
+import utils.plotting as plotting
+from views.common import save_log, render_ad_slot, format_res
+
+def render():
+    """Coefficient-based algebraic solvers."""
+    render_ad_slot()
+    st.header("Algebraic Solver (Coefficient Method)")
+    
+    eq_type = st.selectbox("Equation Type", [
+        "1st Degree (1 Variable)",
+        "1st Degree (System of 2)",
+        "2nd Degree (1 Variable)",
+        "Quadratic System (Intersection)"
+    ])
+    
+    st.markdown("---")
+    
+    if eq_type == "1st Degree (1 Variable)":
+        st.latex("ax + b = 0")
+        c1, c2 = st.columns(2)
+        a = c1.text_input("Coefficient a", "1")
+        b = c2.text_input("Coefficient b", "0")
+        
+        if st.button("Solve 1st Deg", key="solve_1d", use_container_width=True):
+            with analytics.track("linear_1var"):
+                res = algebra.solve_linear_1var(a, b)
+                st.success("Solution Found:")
+                st.latex(f"x = {format_res(res)}")
+                save_log(f"1st Deg: {a}x + {b} = 0", f"x={res}", kind="linear_1var", inputs={"a": a, "b": b}, solution=res)
+
+    elif eq_type == "1st Degree (System of 2)":
+        st.markdown("System:")
+        st.latex(r"\\begin{cases} a_1x + b_1y = c_1 \\\\ a_2x + b_2y = c_2 \\end{cases}")
+        
+        c1, c2, c3 = st.columns(3)
+        a1 = c1.text_input("a1", "1")
+        b1 = c2.text_input("b1", "1")
+        c1_val = c3.text_input("c1", "10")
+        
+        c4, c5, c6 = st.columns(3)
+        a2 = c4.text_input("a2", "1")
+        b2 = c5.text_input("b2", "-1")
+        c2_val = c6.text_input("c2", "2")
+        
+        if st.button("Solve System", key="solve_sys_1d", use_container_width=True):
+            with analytics.track("linear_2vars") as run:
+                import sympy as sp
+                res = algebra.solve_linear_2vars([a1, b1, c1_val], [a2, b2, c2_val])
+                if isinstance(res, dict):
+                    st.success("Solution Found:")
+                    for k, v in res.items():
+                        st.latex(f"{sp.latex(k)} = {format_res(v)}")
+                else:
+                    run.error()
+                    st.error(res)
+                save_log("Linear System", str(res), kind="linear_2vars",
+                         inputs={"eq1": [a1, b1, c1_val], "eq2": [a2, b2, c2_val]}, solution=res)
+
+    elif eq_type == "2nd Degree (1 Variable)":
+        st.latex("ax^2 + bx + c = 0")
+        c1, c2, c3 = st.columns(3)
+        a = c1.text_input("a", "1")
+        b = c2.text_input("b", "0")
+        c = c3.text_input("c", "-4")
+        
+        if st.button("Solve Quadratic", key="solve_quad", use_container_width=True):
+            with analytics.track("quadratic") as run:
+                res = algebra.solve_quadratic_1var(a, b, c)
+                if isinstance(res, list):
+                    st.success("Solution Found:")
+                    for i, r in enumerate(res):
+                        st.latex(f"x_{{{i+1}}} = {format_res(r)}")
+                else:
+                    run.error()
+                    st.error(res)
+                save_log(f"Quad: {a}x^2+{b}x+{c}=0", str(res), kind="quadratic", inputs={"a": a, "b": b, "c": c}, solution=res)
+
+    elif eq_type == "Quadratic System (Intersection)":
+        st.info("Find intersection of two curves.")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Equation 1")
+            t1 = st.selectbox("Type 1", ["Quadratic (y = ax^2 + bx + c)", "Linear (ax + by = c)"])
+            coeffs1 = []
+            if "Quadratic" in t1:
+                coeffs1 = [st.text_input("a (Eq1)", "1"), st.text_input("b (Eq1)", "0"), st.text_input("c (Eq1)", "0")]
+            else:
+                coeffs1 = [st.text_input("a (Eq1)", "1", key="l1a"), st.text_input("b (Eq1)", "-1", key="l1b"), st.text_input("c (Eq1)", "0", key="l1c")]
+        
+        with col2:
+            st.subheader("Equation 2")
+            t2 = st.selectbox("Type 2", ["Linear (ax + by = c)", "Quadratic (y = ax^2 + bx + c)"])
+            coeffs2 = []
+            if "Quadratic" in t2:
+                coeffs2 = [st.text_input("a (Eq2)", "1", key="q2a"), st.text_input("b (Eq2)", "0", key="q2b"), st.text_input("c (Eq2)", "1", key="q2c")]
+            else:
+                coeffs2 = [st.text_input("a (Eq2)", "0", key="l2a"), st.text_input("b (Eq2)", "1", key="l2b"), st.text_input("c (Eq2)", "2", key="l2c")]
+
+        if st.button("Find Intersection", key="solve_inter", use_container_width=True):
+            with analytics.track("curve_intersection") as run:
+                import sympy as sp
+                res = algebra.solve_quadratic_system(t1, coeffs1, t2, coeffs2)
+            
+                if isinstance(res, list) and len(res) > 0:
+                     st.success(f"Solutions Found ({len(res)}):")
+                     x_sym, y_sym = sp.symbols('x y')
+                 
+                     for i, sol in enumerate(res):
+                         x_val, y_val = None, None
+                     
+                         if isinstance(sol, dict):
+                             x_val = sol.get(x_sym)
+                             y_val = sol.get(y_sym)
+                         elif isinstance(sol, tuple) and len(sol) == 2:
+                             x_val, y_val = sol
+                     
+                         if x_val is not None and y_val is not None:
+                             # Format
+                             st.latex(f"P_{{{i+1}}}: x = {format_res(x_val)}, \\quad y = {format_res(y_val)}")
+                         else:
+                             st.warning(f"Could not parse solution {i+1}: {sol}")
+                elif isinstance(res, list) and len(res) == 0:
+                    st.info("No Real Intersection Points Found.")
+                else:
+                    run.error()
+                    st.error(f"Error: {res}")
+
+                spec = plotting.intersection_plot(t1, coeffs1, t2, coeffs2, res)
+                if spec:
+                    st.vega_lite_chart(spec, use_container_width=True)
+                
+                save_log("Curve Intersection", str(res), kind="curve_intersection",
+                         inputs={"type1": t1, "coeffs1": coeffs1, "type2": t2, "coeffs2": coeffs2}, solution=res)
+            
+    # Advanced Higher-Degree Solver
+    st.markdown("### Advanced Options")
+    with st.expander("Solve Higher Degrees (3rd - 10th)"):
+        st.caption("Solves equations of form: $c_n x^n + \dots + c_1 x + c_0 = 0$")
+        
+        # Degree Selection
+        degree = st.number_input("Equation Degree", min_value=3, max_value=10, value=3)
+        
+        # Generic Equation Display
+        latex_eq = ""
+        for d in range(degree, -1, -1):
+            sign = "+" if d != degree else ""
+            if d > 1: latex_eq += f"{sign} c_{{{d}}} x^{{{d}}} "
+            elif d == 1: latex_eq += f"{sign} c_1 x "
+            else: latex_eq += f"{sign} c_0 "
+        latex_eq += "= 0"
+        st.latex(latex_eq)
+        
+        # Responsive Coefficient Inputs
+        coeffs_dict = {}
+        cols = st.columns(2)  # Pairs for better mobile layout
+        
+        for i in range(degree, -1, -1):
+            col_idx = (degree - i) % 2
+            with cols[col_idx]:
+                 coeffs_dict[i] = st.number_input(f"c_{i} (x^{i})", value=0.0, key=f"high_deg_c_{i}", format="%.4f")
+
+        if st.button("Calculate", key="solve_high_deg", use_container_width=True):
+            with analytics.track("polynomial") as run:
+                res = algebra.solve_poly_high_deg(coeffs_dict)
+            
+                if isinstance(res, list):
+                    if not res:
+                        st.warning("No solutions found.")
+                    else:
+                        st.success(f"Solutions Found ({len(res)}):")
+                        # Scrollable container for many results
+                        with st.container(height=200):
+                            for i, r in enumerate(res):
+                                st.latex(f"x_{{{i+1}}} = {format_res(r)}")
+                        spec = plotting.polynomial_plot(coeffs_dict, res)
+                        if spec:
+                            st.vega_lite_chart(spec, use_container_width=True)
+                else:
+                     run.error()
+                     st.error(res)
+                save_log(f"Poly Deg {degree}", str(res), kind="polynomial", inputs={"coeffs": coeffs_dict}, solution=res)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,143 @@
+import streamlit as st
+import utils.db as db
+import utils.history_writer as history_writer
+import utils.reporting as reporting
+import utils.exports as exports
+import utils.jobs as jobs
+import functools
+from datetime import datetime, time as dt_time
+from views.common import render_ad_slot
+
+@st.fragment(run_every=1.0)
+def poll_export_job(job_id):
+    """Progress bar for a background export; reruns the page once the job has finished."""
+    job = jobs.get(job_id)
+    if job and job["status"] in (jobs.QUEUED, jobs.RUNNING):
+        done = f"{job['done']:,} / {job['total']:,} rows" if job["total"] is not None else "queued"
+        st.progress(jobs.fraction(job), text=f"Preparing {exports.label(job['key'][2])}... {done}")
+    else:
+        st.rerun()
+
+def render():
+    """Saved calculations: filters, keyset paging, inspection and exports."""
+    render_ad_slot()
+    st.header("Calculation History")
+
+    if not st.session_state.user:
+        st.info("🔐 Login to view your saved calculations.")
+    else:
+        # Make sure this user's pending entries are visible before paging; the writer
+        # thread retries them if the database is busy, so the page still renders.
+        try:
+            history_writer.flush_user(st.session_state.user['id'])
+        except Exception:
+            st.warning("Your most recent calculations are still being saved and may not be listed yet.")
+
+        c1, c2 = st.columns(2)
+        name_filter = c1.text_input("Calculation starts with", key="hist_name").strip()
+        date_range = c2.date_input("Date range", value=(), key="hist_dates")
+        page_size = 25
+
+        since = until = None
+        if len(date_range) == 2:
+            since = int(datetime.combine(date_range[0], dt_time.min).timestamp())
+            until = int(datetime.combine(date_range[1], dt_time.max).timestamp()) + 1
+
+        # Keyset pagination: keep the cursor of every page visited so "Previous" works.
+        filters = (name_filter, since, until)
+        if st.session_state.get("hist_filters") != filters:
+            st.session_state.hist_filters = filters
+            st.session_state.hist_cursors = [None]
+
+        cursors = st.session_state.hist_cursors
+        rows, next_cursor = db.get_history_page(
+            st.session_state.user['id'], limit=page_size, cursor=cursors[-1],
+            calc_name=name_filter or None, since=since, until=until
+        )
+
+        if rows:
+            st.dataframe(
+                [{"Time": datetime.fromtimestamp(r["ts"]).strftime("%Y-%m-%d %H:%M:%S"),
+                  "Calculation": r["calc_name"], "Result": r["result"]} for r in rows],
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("No calculations found.")
+
+        if rows:
+            with st.expander("🔍 Inspect a calculation"):
+                labels = {r["id"]: f'{datetime.fromtimestamp(r["ts"]).strftime("%Y-%m-%d %H:%M")} · {r["calc_name"]}' for r in rows}
+                picked = st.selectbox("Calculation", list(labels), format_func=labels.get, key="hist_pick")
+                item = db.get_history_item(st.session_state.user['id'], picked)
+                if item and item["inputs"] is not None:
+                    st.caption("Inputs")
+                    st.json(item["inputs"])
+                if item and item["solution"] is not None:
+                    import sympy as sp
+                    st.caption("Solution")
+                    st.latex(sp.latex(item["solution"]))
+                elif item:
+                    st.markdown(f"**Result:** {item['result']}")
+
+        with st.expander("📊 Averages by calculator"):
+            stats = db.get_result_stats(st.session_state.user['id'])
+            if stats:
+                st.dataframe(stats, use_container_width=True, hide_index=True)
+            else:
+                st.caption("No numeric results yet.")
+
+        with st.expander("⬇️ Export"):
+            # Deferred downloads: the report is only streamed from the database when clicked.
+            include_archive = st.checkbox("Include archived history", key="hist_export_archive")
+            export_args = dict(calc_name=name_filter or None, since=since, until=until, include_archive=include_archive)
+            user_id = st.session_state.user['id']
+            e1, e2 = st.columns(2)
+            e1.download_button(
+                "CSV", functools.partial(reporting.history_download, user_id, "csv", **export_args),
+                file_name="appaty_history.csv", mime="text/csv", key="hist_export_csv",
+                on_click="ignore", use_container_width=True
+            )
+            e2.download_button(
+                "TXT", functools.partial(reporting.history_download, user_id, "txt", **export_args),
+                file_name="appaty_history.txt", mime="text/plain", key="hist_export_txt",
+                on_click="ignore", use_container_width=True
+            )
+
+            # Parquet / XLSX / PDF render on the job pool; identical requests reuse the cached file.
+            formats = exports.available_formats()
+            if formats:
+                r1, r2 = st.columns([2, 1])
+                fmt = r1.selectbox("Format", formats, format_func=exports.label, key="hist_export_fmt",
+                                   label_visibility="collapsed")
+                if r2.button("Prepare", key="hist_export_go", use_container_width=True):
+                    try:
+                        st.session_state.hist_export_job = exports.start_export(
+                            user_id, fmt, calc_name=name_filter or None, since=since, until=until
+                        )
+                    except jobs.Busy as e:
+                        st.warning(str(e))
+                job = jobs.get(st.session_state.get("hist_export_job"))
+                if job and job["owner"] == user_id:
+                    if job["status"] == jobs.DONE:
+                        job_fmt = job["key"][2]
+                        st.download_button(
+                            f"⬇️ Download {exports.label(job_fmt)}", functools.partial(exports.read_artifact, job["result"]),
+                            file_name=f"appaty_history{exports.FORMATS[job_fmt][1]}", mime=exports.mime(job_fmt),
+                            key="hist_export_dl", on_click="ignore", type="primary", use_container_width=True
+                        )
+                    elif job["status"] == jobs.FAILED:
+                        st.error(f"Export failed: {job['error']}")
+                    else:
+                        poll_export_job(job["id"])
+
+        p1, p2, p3 = st.columns([1, 1, 1])
+        if p1.button("◀ Previous", key="hist_prev", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+        p2.markdown(f"<div style='text-align: center; padding-top: 12px;'>Page {len(cursors)}</div>", unsafe_allow_html=True)
+        if p3.button("Next ▶", key="hist_next", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,21 @@
+import streamlit as st
+import utils.analytics as analytics
+from utils.converter import unit_converter
+from views.common import save_conversion, render_ad_slot, smart_fmt
+
+def render():
+    """kW / HP converter."""
+    render_ad_slot()
+    st.header("Power Converter")
+    st.latex(r"P_{HP} \approx P_{kW} \times 1.341")
+    
+    saved = unit_converter("power", key="power_conv", from_unit="kW", to_unit="HP")
+    if saved:
+        with analytics.track("power"):
+            direct = f"{saved['from']} to {saved['to']}"
+            res_str = smart_fmt(saved["result"])
+            save_conversion(f"Power {direct}", f"{res_str} {saved['to']}", "power", saved,
+                            inputs={"value": saved["value"], "direction": direct})
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,59 @@
+import streamlit as st
+import utils.calculators as calc
+import utils.analytics as analytics
+from utils.converter import unit_converter
+from views.common import save_log, save_conversion, render_ad_slot
+
+def render():
+    """Pressure solver (P = F/A) and unit converter."""
+    render_ad_slot()
+    st.header("💨 Pressure Suite")
+
+    # Tab 1: Physics Calculation
+    tab1, tab2 = st.tabs(["🔢 Pressure Solver (P=F/A)", "🔄 Unit Converter"])
+
+    with tab1:
+        st.latex(r"P = \frac{F}{A}")
+        col1, col2 = st.columns(2)
+        with col1:
+            f = st.number_input("Force", value=0.0, format="%.4f", key="p_f")
+            f_unit = st.selectbox("Unit", ["N", "kN", "lbf"], key="p_f_u")
+        with col2:
+            a = st.number_input("Area", value=0.0, format="%.4f", key="p_a")
+            a_unit = st.selectbox("Unit", ["m²", "mm²", "in²"], key="p_a_u")
+        
+        if st.button("Calculate Pressure", use_container_width=True):
+            with analytics.track("pressure") as run:
+                # Normalization logic
+                try:
+                    # Normalize Force to N
+                    f_norm = calc.convert_force(f, f_unit, "N")
+                    # Normalize Area to m²
+                    a_norm = calc.convert_area(a, a_unit, "m²")
+                
+                    if a == 0 or a_norm == 0:
+                         run.error()
+                         st.error("Mathematical limit reached: Divisor cannot be zero.")
+                    elif a_norm > 0:
+                        p_pa = f_norm / a_norm
+                        st.success(f"Calculated Pressure: {p_pa:.4f} Pa")
+                        save_log(f"Pressure P=F/A", f"{p_pa:.4f} Pa", kind="pressure", value=p_pa, unit="Pa",
+                                 inputs={"force": f, "force_unit": f_unit, "area": a, "area_unit": a_unit})
+                    else:
+                        run.error()
+                        st.error("Area must be positive")
+                except Exception as e:
+                    run.error()
+                    st.error(f"Error: {e}")
+
+    with tab2:
+        st.subheader("Pressure Unit Converter")
+        saved = unit_converter("pressure", key="pressure_conv", from_unit="Bar", to_unit="PSI")
+        if saved:
+            with analytics.track("pressure_conversion"):
+                res = saved["result"]
+                st.success(f"{saved['value']} {saved['from']} = {res:.4f} {saved['to']}")
+                save_conversion(f"Pressure Conv {saved['from']}->{saved['to']}", f"{res:.4f}", "pressure_conversion", saved)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
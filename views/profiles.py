@@ -0,0 +1,65 @@
+import os
+import time
+import streamlit as st
+import utils.profiling as profiling
+
+def render():
+    """Slow reruns and solver calls captured by utils/profiling.py (admins only)."""
+    st.header("Profiles")
+
+    on = st.toggle("Profile reruns and solver calls", value=profiling.enabled(),
+                   help="Applies to every session of this server until it restarts. Adds overhead while on.")
+    if on != profiling.enabled():
+        profiling.set_enabled(on)
+    st.caption(f"Runs taking {profiling.THRESHOLD_MS:.0f} ms or more are saved to `{profiling.DIR}/` "
+               f"(newest {profiling.KEEP} kept).")
+
+    runs = profiling.captures()
+    if not runs:
+        st.info("No slow runs captured yet.")
+        return
+
+    st.subheader("Slowest runs")
+    st.dataframe(
+        [{"Time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["created"])), "Kind": r["kind"],
+          "What": r["label"], "ms": round(r["elapsed_ms"]), "Solver calls": len(r["calls"]), "Error": r["error"] or ""}
+         for r in runs],
+        use_container_width=True, hide_index=True
+    )
+
+    by_id = {r["id"]: r for r in runs}
+    capture_id = st.selectbox("Run", list(by_id), key="profile_run",
+                              format_func=lambda i: f"{by_id[i]['elapsed_ms']:,.0f} ms · {by_id[i]['label']} · {i}")
+    run = by_id[capture_id]
+    if not os.path.exists(profiling.profile_path(capture_id)):
+        st.warning("The profile file of this run was removed.")
+        return
+
+    st.subheader("Call tree")
+    st.caption("Share of the run's time per call path (from cProfile caller/callee times).")
+    st.dataframe(
+        [{"Function": " " * row["depth"] + row["function"], "ms": round(row["ms"], 1),
+          "Self ms": round(row["self_ms"], 1), "Share": row["fraction"] * 100}
+         for row in profiling.flame(capture_id)],
+        column_config={"Share": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%")},
+        use_container_width=True, hide_index=True
+    )
+
+    with st.expander("Top functions by own time"):
+        st.dataframe(
+            [{"Function": row["function"], "Calls": row["calls"], "Self ms": round(row["self_ms"], 1),
+              "Cumulative ms": round(row["ms"], 1)} for row in profiling.top_functions(capture_id)],
+            use_container_width=True, hide_index=True
+        )
+
+    with st.expander("Inputs"):
+        st.caption("Canonical form (SymPy objects as srepr) for replaying the run.")
+        st.json({"inputs": run["inputs"], "calls": run["calls"]}, expanded=False)
+
+    c1, c2 = st.columns(2)
+    with open(profiling.profile_path(capture_id), "rb") as f:
+        c1.download_button("⬇️ Download .prof", f.read(), file_name=f"{capture_id}.prof",
+                           use_container_width=True)
+    if c2.button("🗑️ Delete all captures", use_container_width=True):
+        profiling.clear()
+        st.rerun()
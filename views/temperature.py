@@ -0,0 +1,27 @@
+import streamlit as st
+import utils.analytics as analytics
+from utils.converter import unit_converter
+from views.common import save_conversion, render_ad_slot
+
+C, K, F = "Celsius (°C)", "Kelvin (K)", "Fahrenheit (°F)"
+FORMULAS = {
+    (C, K): "T_K = T_C + 273.15",
+    (K, C): "T_C = T_K - 273.15",
+    (C, F): "T_F = T_C × 9/5 + 32",
+    (F, C): "T_C = (T_F - 32) × 5/9",
+    (K, F): "T_F = (T_K - 273.15) × 9/5 + 32",
+    (F, K): "T_K = (T_F - 32) × 5/9 + 273.15",
+}
+
+def render():
+    """Temperature converter."""
+    render_ad_slot()
+    st.header("🌡️ Temperature Converter")
+    saved = unit_converter("temperature", key="temp_conv", formulas=FORMULAS)
+    if saved:
+        with analytics.track("temperature"):
+            res_str = f"{saved['result']:g}"
+            save_conversion(f"Temp: {saved['value']}{saved['from']} to {saved['to']}", res_str, "temperature", saved)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
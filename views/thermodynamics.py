@@ -0,0 +1,62 @@
+import streamlit as st
+import utils.calculators as calc
+import utils.analytics as analytics
+from views.common import save_log, render_ad_slot, smart_fmt
+
+def render():
+    """Heat transfer (Q = m·c·ΔT) with material presets."""
+    render_ad_slot()
+    st.header("Thermodynamics")
+    st.subheader("Heat Transfer")
+    st.latex(r'Q = m \cdot c \cdot \Delta T')
+    
+    presets = {
+        "Aluminium": 0.887, "Asphalt": 0.915, "Bone": 0.44, "Boron": 1.106, 
+        "Brass": 0.92, "Brick": 0.841, "Cast Iron": 0.554, "Clay": 0.878, 
+        "Coal": 1.262, "Cobalt": 0.42, "Concrete": 0.879, "Copper": 0.385, 
+        "Glass": 0.792, "Gold": 0.13, "Granite": 0.774, "Gypsum": 1.09, 
+        "Helium": 5.192, "Hydrogen": 14.3, "Ice": 2.09, "Iron": 0.462, 
+        "Lead": 0.13, "Limestone": 0.806, "Lithium": 3.58, "Magnesium": 1.024, 
+        "Marble": 0.832, "Mercury": 0.126, "Nitrogen": 1.04, "Oak Wood": 2.38, 
+        "Oxygen": 0.919, "Platinum": 0.15, "Plutonium": 0.14, "Quartzite": 1.1, 
+        "Rubber": 2.005, "Salt": 0.881, "Sand": 0.78, "Sandstone": 0.74, 
+        "Silicon": 0.71, "Silver": 0.236, "Soil": 1.81, "Stainless Steel 316": 0.468, 
+        "Steam": 2.094, "Sulfur": 0.706, "Thorium": 0.118, "Tin": 0.226, 
+        "Titanium": 0.521, "Tungsten": 0.133, "Uranium": 0.115, "Vanadium": 0.49, 
+        "Water": 4.187, "Zinc": 0.389
+    }
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        mat = st.selectbox("Material Preset", ["Manual"] + sorted(list(presets.keys())))
+        c_val = 1.0
+        if mat != "Manual":
+            c_val = presets[mat]
+            st.info(f"Specific Heat: {c_val}")
+        
+    with col1:
+        c_input = st.number_input("Specific Heat c (kJ/kg·K)", value=0.0 if mat == "Manual" else c_val, disabled=(mat != "Manual"), format="%.4f", step=0.0001)
+        
+    with col2:
+        # High precision mass input
+        m = st.number_input("Mass (kg)", min_value=0.001, value=0.0, step=0.01, format="%.4f")
+        
+    with col3:
+        t1 = st.number_input("Initial Temp T1 (K)", 0.0, format="%.4f")
+        t2 = st.number_input("Final Temp T2 (K)", 0.0, format="%.4f")
+        
+    if st.button("Calculate", key="thermo_btn", use_container_width=True):
+        with analytics.track("heat_transfer"):
+            if m <= 0:
+                st.warning("⚠️ Mass must be a positive value.")
+            else:
+                dt = t2 - t1
+                res = calc.calculate_heat_transfer(m, c_input, dt)
+                res_str = smart_fmt(res)
+                st.markdown(f"### Result: {res_str} kJ")
+                save_log("Thermo Q", f"{res_str} kJ", kind="heat_transfer", value=res, unit="kJ",
+                         inputs={"m": m, "c": c_input, "t1": t1, "t2": t2})
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
@@ -0,0 +1,227 @@
+import streamlit as st
+import utils.algebra_solver as algebra
+import utils.analytics as analytics
+import utils.jobs as jobs
+import utils.numeric_solver as numeric
+import time
+from views.common import save_log, render_ad_slot, format_res
+
+def render():
+    """Symbolic solver for systems entered as coefficients or as text."""
+    render_ad_slot()
+    st.header("Universal Equation Solver")
+    st.info("Dynamically generate and solve systems of equations.")
+    
+    mode = st.radio("Input Mode", ["Coefficients", "Text"], horizontal=True, key="univ_mode")
+    engine = st.radio("Engine", ["Auto", "Symbolic", "Numeric"], horizontal=True, key="univ_engine",
+                      help="Symbolic: exact solutions (SymPy), can be slow or fail on hard systems. "
+                           "Numeric: real solutions found by Newton's method from many starting points. "
+                           f"Auto: exact if found within {algebra.RACE_BUDGET_S:g}s, numeric otherwise.")
+    if mode == "Text":
+        submitted, equations, sym_vars, vars_str = _text_form()
+    else:
+        submitted, equations, sym_vars, vars_str = _coefficient_form()
+
+    if submitted:
+        # Solve on the solver pool (utils/jobs.py): the page stays responsive, the job survives
+        # a reload or reconnect (its key is kept in the URL), and a system solved before is
+        # served from job_results without solving it again.
+        # Auto races both engines on every Calculate (the symbolic half is persisted under its own key).
+        eq_sreprs, var_sreprs = algebra.system_sreprs(equations, sym_vars)
+        digest = jobs.digest(eq_sreprs, var_sreprs)
+        if engine == "Symbolic":
+            key, fn, args = "universal_system:" + digest, algebra.solve_system_job, (eq_sreprs, var_sreprs)
+        elif engine == "Numeric":
+            key, fn, args = "universal_numeric:" + digest, numeric.solve_system_job, (eq_sreprs, var_sreprs)
+        else:
+            key, fn = "universal_auto:" + digest, algebra.solve_system_race_job
+            args = ("universal_system:" + digest, eq_sreprs, var_sreprs)
+            jobs.forget(key)
+        persist = {"Symbolic": "universal_system", "Numeric": "universal_numeric"}.get(engine)
+        try:
+            jobs.submit(key, fn, *args, owner=_owner(), pool="solver", persist=persist)
+            st.session_state.univ_job = key
+            st.session_state.pop("univ_logged", None)  # a new Calculate is logged again, even for the same system
+            st.query_params["solve"] = key
+        except jobs.Busy as e:
+            st.warning(str(e))
+
+    key = st.session_state.get("univ_job") or st.query_params.get("solve")
+    if key:
+        _show_job(key)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    render_ad_slot(position='bottom')
+
+def _coefficient_form():
+    """Polynomial systems from per-term coefficient inputs (num_vars x degree + constants)."""
+    # Dynamic Settings
+    c1, c2 = st.columns(2)
+    num_vars = c1.slider("Number of Unknowns", 2, 5, 2)
+    degree = c2.slider("Max Degree", 1, 10, 1)
+    
+    # Generate Variables
+    import sympy as sp
+    vars_str = ["x", "y", "z", "w", "v"][:num_vars]
+    sym_vars = sp.symbols(' '.join(vars_str))
+    if not isinstance(sym_vars, (list, tuple)):
+        sym_vars = [sym_vars]
+        
+    st.write(f"Variables: {', '.join(vars_str)}")
+    
+    # Form to prevent re-runs
+    with st.form("univ_solver_form"):
+        # Dynamic Input Fields
+        st.subheader("System Definitions")
+        equations = []
+        
+        for i in range(num_vars):
+            with st.expander(f"Equation {i+1}", expanded=(i==0)): # Collapse others by default for mobile
+                st.caption("Enter coefficients:")
+                eq_expr = 0
+                
+                # Stacked Layout (Simpler than grid for mobile speed)
+                for j, var_sym in enumerate(sym_vars):
+                    st.markdown(f"**{vars_str[j]} Terms**")
+                    # Reduce columns -> Faster rendering
+                    cols = st.columns(2) 
+                    
+                    for d in range(degree, 0, -1):
+                        with cols[(degree - d) % 2]:
+                            coeff = st.number_input(f"Coeff ${vars_str[j]}^{d}$", value=0.0, key=f"univ_c_{i}_{j}_{d}", format="%.4f")
+                            if coeff != 0:
+                                eq_expr += coeff * (var_sym**d)
+                
+                # Constant
+                st.markdown("---")
+                const = st.number_input(f"Constant (Eq {i+1})", value=0.0, key=f"univ_const_{i}", format="%.4f")
+                eq_expr += const
+                equations.append(eq_expr)
+                
+        # Submit Button
+        submitted = st.form_submit_button("Calculate System", use_container_width=True)
+
+    return submitted, equations, list(sym_vars), vars_str
+
+def _text_form():
+    """Systems typed as text, parsed by algebra.parse_system (one text area instead of up to 55 inputs)."""
+    with st.form("univ_text_form"):
+        text = st.text_area("Equations", key="univ_text", height=150, placeholder="x*y = 6\nx + y = 5")
+        st.caption("One equation per line (or separated by ;). Operators + - * / ^, parentheses, "
+                   "sin cos tan exp log sqrt, pi, E. Variables are letters with an optional number (x, y, k2).")
+        submitted = st.form_submit_button("Calculate System", use_container_width=True)
+    if not submitted:
+        return False, [], [], []
+    try:
+        equations, sym_vars = algebra.parse_system(text.strip())
+    except ValueError as e:
+        st.error(str(e))
+        return False, [], [], []
+    return True, list(equations), list(sym_vars), [v.name for v in sym_vars]
+
+def _owner():
+    """Job owner for the concurrency limit: the user, or this browser session when logged out."""
+    if st.session_state.user:
+        return st.session_state.user["id"]
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return f"session:{ctx.session_id if ctx else ''}"
+
+@st.fragment(run_every=1.0)
+def poll_solve_job(key):
+    """Progress of a running solve; reruns the page once the job has finished."""
+    job = jobs.find(key)
+    if job and job["status"] in (jobs.QUEUED, jobs.RUNNING):
+        stage = job["stage"] or ("Queued" if job["status"] == jobs.QUEUED else "Solving")
+        st.progress(jobs.fraction(job), text=f"{stage}... ({time.time() - job['created']:.0f}s)")
+        st.caption("You can leave this page; the result is kept and shown when you come back.")
+    else:
+        st.rerun()
+
+def _show_job(key):
+    import sympy as sp
+    job = jobs.find(key, persisted=True)
+    if job is None:
+        return
+    if job["status"] in (jobs.QUEUED, jobs.RUNNING):
+        poll_solve_job(key)
+        return
+    if job["status"] == jobs.FAILED:
+        st.error(f"Solver failed: {job['error']}")
+        return
+
+    output = job["result"]
+    sym_vars = [sp.Symbol(name) for name in output["variables"]]
+    results = output["solutions"]
+    engine = output.get("engine", "symbolic")
+    residuals = output.get("residuals") or []
+
+    # Show Equations Preview
+    with st.expander("Review Equations"):
+        for i, eq in enumerate(output["equations"]):
+            if eq != 0: st.latex(f"{sp.latex(eq)} = 0")
+            else: st.caption(f"Eq {i+1}: 0 = 0")
+
+    if output.get("fallback"):
+        st.info(f"{output['fallback']} Showing numeric solutions.")
+
+    failed = False
+    if isinstance(results, list) and results:
+        st.success(f"Solutions Found ({len(results)}):")
+        if engine == "numeric":
+            st.caption(f"Numeric: real solutions reached from {output['starts']} starting points, to about 10 digits. "
+                       "Other solutions may exist." + (f" Showing the first {numeric.MAX_SOLUTIONS}; the system may "
+                       "have infinitely many." if len(results) >= numeric.MAX_SOLUTIONS else ""))
+
+        # Mobile-Optimized Result List
+        with st.container(height=400):
+            for idx, sol in enumerate(results):
+                # Shaded Box for each solution set
+                st.markdown(f"""
+                <div style='background-color: #f1f3f6; padding: 10px; border-radius: 8px; margin-bottom: 8px; border-left: 5px solid #00E5FF;'>
+                    <strong>Solution #{idx+1}</strong>
+                </div>
+                """, unsafe_allow_html=True)
+
+                cols = st.columns(len(sol)) if len(sol) <= 3 else st.columns(3)
+
+                i = 0
+                for v_sym in sym_vars:
+                     if v_sym in sol:
+                         # Determine value
+                         val = sol[v_sym]
+
+                         # Format
+                         val_disp = format_res(val)
+
+                         # Display in grid
+                         with cols[i % 3]:
+                             st.markdown(f"${sp.latex(v_sym)} = {val_disp}$")
+                         i += 1
+                if idx < len(residuals):
+                    st.caption(f"Residual: {residuals[idx]:.1e}")
+
+    elif isinstance(results, str):
+         if "System is too complex" in results:
+             st.warning(results)
+         else:
+             failed = True
+             st.error(results)
+    elif not results and engine == "numeric":
+         st.warning("No real solution found numerically. The system may have only complex solutions, or none.")
+    elif not results:
+         st.warning("No solution found or system is inconsistent.")
+
+    elapsed_ms = job.get("elapsed_ms")
+    if elapsed_ms is None:
+        elapsed_ms = (job["finished"] - job["started"]) * 1000
+    st.caption(f"Calculation time: {elapsed_ms / 1000:.3f}s" + (" (stored result)" if "elapsed_ms" in job else ""))
+
+    # Log each finished job once; drop it from the URL so a reload does not log it again.
+    if st.session_state.get("univ_logged") != key:
+        st.session_state.univ_logged = key
+        analytics.record("universal_system", elapsed_ms, error=failed)
+        save_log(f"Universal ({engine.title()})", str(results), kind="universal_system",
+                 inputs={"variables": output["variables"], "equations": output["equations"]}, solution=results)
+        if "solve" in st.query_params:
+            del st.query_params["solve"]
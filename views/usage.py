@@ -0,0 +1,52 @@
+import streamlit as st
+import utils.analytics as analytics
+import utils.history_writer as history_writer
+import time
+
+def render():
+    """Usage roll-up dashboard (admins only)."""
+    st.header("Usage Analytics")
+    # Only the usage counters feed this page; the writer thread retries them if this fails.
+    try:
+        history_writer.flush_usage()
+    except Exception:
+        st.warning("The last few minutes of activity are still being recorded and may be missing.")
+
+    days = st.select_slider("Period", options=[1, 2, 7, 30, 90, 365], value=7, format_func=lambda d: f"{d} day{'s' if d > 1 else ''}",
+                            key="usage_days")
+    since = int(time.time()) - days * 86400
+
+    rows = analytics.summary(since)
+    calcs = [r for r in rows if not r["kind"].startswith("module:")]
+    modules_used = [r for r in rows if r["kind"].startswith("module:")]
+
+    m1, m2, m3 = st.columns(3)
+    total_calls = sum(r["calls"] for r in calcs)
+    total_errors = sum(r["errors"] for r in calcs)
+    m1.metric("Calculations", f"{total_calls:,}")
+    m2.metric("Error rate", f"{(total_errors / total_calls if total_calls else 0):.1%}")
+    m3.metric("Module views", f"{sum(r['calls'] for r in modules_used):,}")
+
+    st.subheader("Calculators")
+    if calcs:
+        st.dataframe(
+            [{"Calculator": r["kind"], "Calls": r["calls"], "Errors": r["errors"], "Error rate": f"{r['error_rate']:.1%}",
+              "Avg ms": round(r["avg_ms"], 1), "Max ms": round(r["latency_ms_max"], 1)} for r in calcs],
+            use_container_width=True, hide_index=True
+        )
+        granularity, points = analytics.series(since)
+        points = [p for p in points if not p["kind"].startswith("module:")]
+        if points:
+            import pandas as pd
+            chart = pd.DataFrame(points)
+            chart["time"] = pd.to_datetime(chart["bucket"], unit="s")
+            st.caption(f"Calls per {granularity}")
+            st.line_chart(chart.pivot_table(index="time", columns="kind", values="calls", aggfunc="sum").fillna(0))
+    else:
+        st.info("No calculator usage recorded in this period.")
+
+    st.subheader("Modules")
+    if modules_used:
+        import pandas as pd
+        st.bar_chart(pd.DataFrame({"calls": [r["calls"] for r in modules_used]},
+                                  index=[r["kind"].removeprefix("module:") for r in modules_used]))